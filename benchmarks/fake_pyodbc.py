@@ -0,0 +1,146 @@
+"""Stand-in for the pyodbc module backed by an in-memory SQLite database
+
+Install it with ``sys.modules["pyodbc"] = fake_pyodbc`` before creating a
+PyodbcBackend. The stored procedures in dbQueries/procedures.sql are
+emulated with equivalent SQLite queries. ``configure()`` injects driver
+behaviour into every execute():
+
+    latency          simulated network round-trip in seconds
+    jitter           extra uniformly random delay of up to this many seconds
+    failure_rate     fraction of calls failing with a query error (SQLSTATE 42000)
+    disconnect_rate  fraction of calls failing with a dropped connection (08S01),
+                     which the pool replaces and retries once
+"""
+import random
+import re
+import sqlite3
+import threading
+import time
+
+from backends import CHANGES_QUERY, ELEMENT_COLUMNS, SQLITE_UPSERT, SQLiteBackend
+
+settings = {
+    "latency": 0.0,
+    "jitter": 0.0,
+    "failure_rate": 0.0,
+    "disconnect_rate": 0.0,
+}
+
+_SELECT = f"SELECT {ELEMENT_COLUMNS} FROM Elements"
+
+PROCEDURES = {
+    "GetElementByNumber": f"{_SELECT} WHERE AtomicNumber = ?",
+    "GetElementBySymbol": f"{_SELECT} WHERE Symbol = ? COLLATE NOCASE",
+    "GetElementsByBlock": f"{_SELECT} WHERE Block = ? COLLATE NOCASE ORDER BY AtomicNumber",
+    "GetElementsByPeriod": f"{_SELECT} WHERE Period = ? ORDER BY AtomicNumber",
+    "GetElementsByGroup": f"{_SELECT} WHERE GroupNumber = ? ORDER BY Period",
+    "GetElementsByNumberRange": (
+        f"{_SELECT} WHERE AtomicNumber BETWEEN ? AND ? ORDER BY AtomicNumber"),
+    "GetElementChanges": CHANGES_QUERY,
+}
+
+_EXEC = re.compile(r"^\s*EXEC\s+(\w+)\s*(.*)$", re.IGNORECASE | re.DOTALL)
+
+_database = None
+_database_lock = threading.Lock()
+
+
+class Error(Exception):
+    """Mirrors pyodbc.Error; args[0] is an SQLSTATE code"""
+
+
+def configure(**options):
+    """Change the simulated driver behaviour, e.g. configure(latency=0.002)"""
+    unknown = set(options) - set(settings)
+    if unknown:
+        raise TypeError(f"Unknown fake_pyodbc settings: {', '.join(sorted(unknown))}")
+    settings.update(options)
+
+
+def _shared_database() -> SQLiteBackend:
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = SQLiteBackend(pool_size=1)
+        return _database
+
+
+def connect(conn_str: str, **kwargs) -> "Connection":
+    return Connection(_shared_database())
+
+
+class Connection:
+    def __init__(self, database: SQLiteBackend):
+        self._conn = database._connect()
+
+    def cursor(self) -> "Cursor":
+        return Cursor(self._conn)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+class Cursor:
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._rows = []
+
+    def execute(self, sql: str, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = tuple(params[0])
+        delay = settings["latency"]
+        if settings["jitter"]:
+            delay += random.uniform(0.0, settings["jitter"])
+        if delay:
+            time.sleep(delay)
+        if settings["failure_rate"] or settings["disconnect_rate"]:
+            roll = random.random()
+            if roll < settings["disconnect_rate"]:
+                raise Error("08S01", "Communication link failure (injected)")
+            if roll < settings["disconnect_rate"] + settings["failure_rate"]:
+                raise Error("42000", "Query failed (injected)")
+        try:
+            self._rows = self._run(sql, params)
+        except sqlite3.Error as e:
+            state = "42S02" if str(e).startswith("no such table") else "42000"
+            raise Error(state, str(e)) from e
+        return self
+
+    def _run(self, sql: str, params):
+        match = _EXEC.match(sql)
+        if not match:
+            return self._conn.execute(sql, params).fetchall()
+        name = match.group(1)
+        if name in PROCEDURES:
+            return self._conn.execute(PROCEDURES[name], params).fetchall()
+        if name in ("GetElementsByNumbers", "GetElementsBySymbols"):
+            # Table-valued parameter: a list of one-column tuples
+            keys = [key for (key,) in params[0]]
+            column = "AtomicNumber" if name == "GetElementsByNumbers" else "Symbol COLLATE NOCASE"
+            placeholders = ", ".join("?" * len(keys))
+            return self._conn.execute(
+                f"{_SELECT} WHERE {column} IN ({placeholders}) ORDER BY AtomicNumber", keys
+            ).fetchall()
+        if name == "UpsertElements":
+            rows = params[0]
+            self._conn.executemany(SQLITE_UPSERT, rows)
+            return [(len(rows),)]
+        if name == "GetElementStatistics":
+            return _shared_database().fetch_statistics()
+        raise sqlite3.OperationalError(f"Could not find stored procedure '{name}'. (2812)")
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self._rows = []
@@ -0,0 +1,238 @@
+"""Query plans and timings for the block/period/group queries on a scaled-up table
+
+Usage:
+    python benchmarks/index_plans.py [--backend sqlite|sqlserver] [--rows N]
+                                     [--iterations N] [--connection-string STR]
+
+Builds a scratch copy of the Elements table with N synthetic rows (standing
+in for isotope and compound data), then runs the queries behind the
+GetElementsBy* procedures twice: without the covering indexes and with the
+indexes from dbQueries/schema.sql. For each query it reports whether the
+plan seeks or scans and the mean latency. The scratch table is dropped
+afterwards.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "interfaces"))
+
+from backends import DEFAULT_CONNECTION_STRING, ELEMENT_COLUMNS  # noqa: E402
+
+TABLE = "ElementsPlanBenchmark"
+
+# (name, WHERE/ORDER BY clause, parameters) mirroring dbQueries/procedures.sql
+QUERIES = [
+    ("GetElementsByBlock", "WHERE Block = ? ORDER BY AtomicNumber", ("f",)),
+    ("GetElementsByPeriod", "WHERE Period = ? ORDER BY AtomicNumber", (6,)),
+    ("GetElementsByGroup", "WHERE GroupNumber = ? ORDER BY Period", (14,)),
+    ("GetElementsByNumberRange",
+     "WHERE AtomicNumber BETWEEN ? AND ? ORDER BY AtomicNumber", (1000, 1100)),
+    ("GetElementsByPeriodRange",
+     "WHERE Period BETWEEN ? AND ? ORDER BY Period, AtomicNumber", (1, 2)),
+]
+
+BLOCK_WEIGHTS = {"s": 14, "p": 36, "d": 40, "f": 28}
+BLOCK_GROUPS = {"s": [1, 2], "p": list(range(13, 19)), "d": list(range(3, 13)), "f": [None]}
+BLOCK_FIRST_PERIOD = {"s": 1, "p": 2, "d": 4, "f": 6}
+
+
+def synthetic_rows(count: int, seed: int = 42) -> List[Tuple]:
+    """Element-shaped rows with realistic block/period/group proportions"""
+    rng = random.Random(seed)
+    blocks = list(BLOCK_WEIGHTS)
+    weights = list(BLOCK_WEIGHTS.values())
+    rows = []
+    for number in range(1, count + 1):
+        block = rng.choices(blocks, weights)[0]
+        period = rng.randint(BLOCK_FIRST_PERIOD[block], 7)
+        rows.append((number, f"X{number}", f"Synthetic {number}", round(rng.uniform(1, 300), 4),
+                     block, rng.choice(BLOCK_GROUPS[block]), period, "[Xe] 6s2"))
+    return rows
+
+
+class SQLiteDialect:
+    name = "sqlite"
+    include_supported = False
+
+    def __init__(self, args):
+        import sqlite3
+        self.conn = sqlite3.connect(":memory:")
+
+    def execute(self, sql: str, params: Sequence = ()):
+        return self.conn.execute(sql, params).fetchall()
+
+    def executemany(self, sql: str, rows: List[Tuple]):
+        self.conn.executemany(sql, rows)
+        self.conn.commit()
+
+    def create_table(self):
+        self.execute(
+            f"CREATE TABLE {TABLE} (AtomicNumber INT PRIMARY KEY, Symbol TEXT NOT NULL, "
+            "Name TEXT NOT NULL, AtomicMass REAL NOT NULL, Block TEXT NOT NULL, "
+            "GroupNumber INT, Period INT NOT NULL, ElectronConfiguration TEXT NOT NULL)")
+
+    def create_index(self, name: str, key: str, include: str):
+        # SQLite has no INCLUDE; the index still gives the seek and the order
+        self.execute(f"CREATE INDEX {name} ON {TABLE} ({key})")
+        self.execute(f"ANALYZE {TABLE}")
+
+    def plan(self, sql: str, params: Sequence) -> List[str]:
+        return [row[-1] for row in self.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    @staticmethod
+    def classify(plan: List[str]) -> str:
+        text = " ".join(plan).upper()
+        return "seek" if "SEARCH" in text else "scan"
+
+    def drop_table(self):
+        self.conn.close()
+
+
+class SqlServerDialect:
+    name = "sqlserver"
+    include_supported = True
+
+    def __init__(self, args):
+        import pyodbc
+        self.conn = pyodbc.connect(args.connection_string, autocommit=True)
+
+    def execute(self, sql: str, params: Sequence = ()):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, *params)
+            return cursor.fetchall() if cursor.description else []
+        finally:
+            cursor.close()
+
+    def executemany(self, sql: str, rows: List[Tuple]):
+        cursor = self.conn.cursor()
+        try:
+            cursor.fast_executemany = True
+            cursor.executemany(sql, rows)
+        finally:
+            cursor.close()
+
+    def create_table(self):
+        self.execute(f"IF OBJECT_ID('{TABLE}') IS NOT NULL DROP TABLE {TABLE}")
+        self.execute(
+            f"CREATE TABLE {TABLE} (AtomicNumber INT PRIMARY KEY, Symbol NVARCHAR(16) NOT NULL, "
+            "Name NVARCHAR(50) NOT NULL, AtomicMass DECIMAL(10,4) NOT NULL, "
+            "Block CHAR(1) NOT NULL, GroupNumber INT, Period INT NOT NULL, "
+            "ElectronConfiguration NVARCHAR(100) NOT NULL)")
+
+    def create_index(self, name: str, key: str, include: str):
+        self.execute(f"CREATE NONCLUSTERED INDEX {name} ON {TABLE} ({key}) INCLUDE ({include})")
+        self.execute(f"UPDATE STATISTICS {TABLE}")
+
+    def plan(self, sql: str, params: Sequence) -> List[str]:
+        # SHOWPLAN_TEXT returns the estimated plan instead of running the query;
+        # parameters are inlined because showplan cannot bind them
+        literal = sql
+        for param in params:
+            value = f"'{param}'" if isinstance(param, str) else str(param)
+            literal = literal.replace("?", value, 1)
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SET SHOWPLAN_TEXT ON")
+            cursor.execute(literal)
+            lines = []
+            while True:
+                if cursor.description:
+                    lines.extend(row[0] for row in cursor.fetchall())
+                if not cursor.nextset():
+                    break
+            return [line.strip() for line in lines]
+        finally:
+            cursor.execute("SET SHOWPLAN_TEXT OFF")
+            cursor.close()
+
+    @staticmethod
+    def classify(plan: List[str]) -> str:
+        operators = " ".join(line for line in plan if "|--" in line)
+        if "Scan(" in operators:
+            return "scan"
+        return "seek" if "Seek(" in operators else "other"
+
+    def drop_table(self):
+        self.execute(f"DROP TABLE {TABLE}")
+        self.conn.close()
+
+
+DIALECTS = {dialect.name: dialect for dialect in (SQLiteDialect, SqlServerDialect)}
+
+# Same keys as the covering indexes in dbQueries/schema.sql
+INDEXES = [
+    ("IX_Bench_Block", "Block, AtomicNumber",
+     "Symbol, Name, AtomicMass, GroupNumber, Period, ElectronConfiguration"),
+    ("IX_Bench_Period", "Period, AtomicNumber",
+     "Symbol, Name, AtomicMass, Block, GroupNumber, ElectronConfiguration"),
+    ("IX_Bench_Group", "GroupNumber, Period",
+     "Symbol, Name, AtomicMass, Block, ElectronConfiguration"),
+]
+
+
+def mean_ms(fn: Callable[[], object], iterations: int) -> float:
+    fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.fmean(samples) * 1000
+
+
+def run_queries(dialect, iterations: int) -> Dict[str, Tuple[str, float, int]]:
+    results = {}
+    for name, clause, params in QUERIES:
+        sql = f"SELECT {ELEMENT_COLUMNS} FROM {TABLE} {clause}"
+        kind = dialect.classify(dialect.plan(sql, params))
+        rows = len(dialect.execute(sql, params))
+        results[name] = (kind, mean_ms(lambda: dialect.execute(sql, params), iterations), rows)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=sorted(DIALECTS), default="sqlite")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--connection-string", default=DEFAULT_CONNECTION_STRING)
+    args = parser.parse_args(argv)
+
+    dialect = DIALECTS[args.backend](args)
+    try:
+        dialect.create_table()
+        start = time.perf_counter()
+        dialect.executemany(
+            f"INSERT INTO {TABLE} ({ELEMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            synthetic_rows(args.rows))
+        print(f"Loaded {args.rows:,} rows in {time.perf_counter() - start:.1f}s "
+              f"({args.backend})\n")
+
+        before = run_queries(dialect, args.iterations)
+        for name, key, include in INDEXES:
+            dialect.create_index(name, key, include)
+        after = run_queries(dialect, args.iterations)
+    finally:
+        dialect.drop_table()
+
+    header = (f"{'query':<28}{'rows':>9}{'plan before':>13}{'plan after':>12}"
+              f"{'ms before':>11}{'ms after':>10}{'speedup':>9}")
+    print(header)
+    print("-" * len(header))
+    for name, _, _ in QUERIES:
+        kind_before, ms_before, rows = before[name]
+        kind_after, ms_after, _ = after[name]
+        speedup = ms_before / ms_after if ms_after else float("inf")
+        print(f"{name:<28}{rows:>9,}{kind_before:>13}{kind_after:>12}"
+              f"{ms_before:>11.2f}{ms_after:>10.2f}{speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
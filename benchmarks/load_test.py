@@ -0,0 +1,324 @@
+"""Concurrent load generator comparing data layer configurations
+
+Usage:
+    python benchmarks/load_test.py [--workers 8] [--mode thread|process] [--duration 5]
+                                   [--mix number=40,symbol=30,block=10,period=10,statistics=10]
+                                   [--backends sqlite,fake-pyodbc] [--pool-sizes 1,4,8]
+                                   [--cache on,off] [--system console|gui]
+                                   [--latency SECONDS] [--jitter SECONDS]
+                                   [--failure-rate F] [--disconnect-rate F] [--no-save]
+
+Every combination of backend, pool size and cache setting is run in turn.
+For each, N workers issue a weighted random mix of lookups for the given
+duration. Threads share one PeriodicTableSystem (or DatabaseManager), as
+a single service process would. Processes each build their own, like
+http_service.py --workers. The fake-pyodbc backend runs PyodbcBackend over
+benchmarks/fake_pyodbc.py with the given latency and injected failures.
+The report lists throughput, latency percentiles and error rate per
+configuration, and throughput relative to the first configuration.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "interfaces"))
+sys.path.insert(0, HERE)
+
+from backends import BackendError, create_backend  # noqa: E402
+from run import RESULTS_DIR, git_revision, percentile  # noqa: E402
+
+OPERATIONS = ("number", "symbol", "block", "period", "statistics")
+DEFAULT_MIX = "number=40,symbol=30,block=10,period=10,statistics=10"
+BACKEND_NAMES = ("sqlite", "fake-pyodbc")
+
+
+class LoadConfig(NamedTuple):
+    backend: str
+    pool_size: int
+    cache: bool
+
+    @property
+    def label(self) -> str:
+        return f"{self.backend} pool={self.pool_size} cache={'on' if self.cache else 'off'}"
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'number=40,symbol=30' into operation weights"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown operation '{name}', expected one of: {', '.join(OPERATIONS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight for {name}: {weight!r}") from None
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("The mix needs at least one positive weight")
+    return mix
+
+
+def _csv(convert: Callable) -> Callable[[str], List]:
+    return lambda text: [convert(part.strip()) for part in text.split(",") if part.strip()]
+
+
+def _cache_setting(text: str) -> bool:
+    if text not in ("on", "off"):
+        raise argparse.ArgumentTypeError(f"Cache must be 'on' or 'off', not {text!r}")
+    return text == "on"
+
+
+def make_system(config: LoadConfig, args):
+    """Build the system under test for one configuration"""
+    if config.backend == "fake-pyodbc":
+        import fake_pyodbc
+        sys.modules["pyodbc"] = fake_pyodbc
+        fake_pyodbc.configure(latency=args.latency, jitter=args.jitter,
+                              failure_rate=0.0, disconnect_rate=0.0)
+        backend = create_backend("sqlserver", pool_size=config.pool_size)
+    else:
+        backend = create_backend(config.backend, pool_size=config.pool_size)
+
+    if args.system == "gui":
+        from gui import DatabaseManager
+
+        system = DatabaseManager(backend, use_index=config.cache)
+        # DatabaseManager reports failures instead of raising; count them
+        system.failures = []
+        system.error_handler = lambda title, message: system.failures.append(message)
+    else:
+        from console import PeriodicTableSystem
+
+        system = PeriodicTableSystem(backend, use_index=config.cache)
+    if config.backend == "fake-pyodbc":
+        # Only after the index has loaded, so start-up itself never fails
+        import fake_pyodbc
+        fake_pyodbc.configure(failure_rate=args.failure_rate,
+                              disconnect_rate=args.disconnect_rate)
+    return system
+
+
+def make_operations(system, cache: bool) -> Dict[str, Callable[[random.Random], object]]:
+    elements = system.get_all_elements()
+    numbers = [element.atomic_number for element in elements] or [1]
+    symbols = [element.symbol for element in elements] or ["H"]
+    blocks = sorted({element.block for element in elements}) or ["s"]
+    periods = sorted({element.period for element in elements}) or [1]
+
+    def statistics(rng):
+        if not cache:
+            system._statistics = None
+        return system.get_statistics()
+
+    return {
+        "number": lambda rng: system.get_element_by_number(rng.choice(numbers)),
+        "symbol": lambda rng: system.get_element_by_symbol(rng.choice(symbols)),
+        "block": lambda rng: system.get_elements_by_block(rng.choice(blocks)),
+        "period": lambda rng: system.get_elements_by_period(rng.choice(periods)),
+        "statistics": statistics,
+    }
+
+
+def error_kind(error: BackendError) -> str:
+    """Short label for a failure: the driver exception and its SQLSTATE, if any"""
+    cause = error.__cause__ or error
+    if len(cause.args) > 1 and isinstance(cause.args[0], str):
+        return f"{type(cause).__name__} {cause.args[0]}"
+    return type(cause).__name__
+
+
+def run_worker(system, operations: Dict[str, Callable], mix: Dict[str, float],
+               duration: float, seed: int, start: Optional[threading.Barrier] = None) -> Dict:
+    """Issue random operations for duration seconds; returns latencies and error counts"""
+    rng = random.Random(seed)
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {}
+    failures = getattr(system, "failures", None)
+    clock = time.perf_counter
+    if start is not None:
+        start.wait()
+    began = clock()
+    deadline = began + duration
+    while True:
+        name = rng.choices(names, weights)[0]
+        seen = len(failures) if failures is not None else 0
+        t0 = clock()
+        try:
+            operations[name](rng)
+            failed = None
+        except BackendError as e:
+            failed = error_kind(e)
+        t1 = clock()
+        if failed is None and failures is not None and len(failures) > seen:
+            failed = "reported"
+        if failed is None:
+            latencies[name].append(t1 - t0)
+        else:
+            errors[failed] = errors.get(failed, 0) + 1
+        if t1 >= deadline:
+            break
+    return {"latencies": latencies, "errors": errors, "elapsed": clock() - began}
+
+
+def _process_worker(config: LoadConfig, args, mix, seed: int) -> Dict:
+    system = make_system(config, args)
+    try:
+        return run_worker(system, make_operations(system, config.cache), mix, args.duration, seed)
+    finally:
+        system.close()
+
+
+def run_config(config: LoadConfig, args, mix: Dict[str, float]) -> Dict:
+    """Run one configuration with every worker and merge their results"""
+    if args.mode == "process":
+        with multiprocessing.Pool(args.workers) as pool:
+            parts = pool.starmap(_process_worker, [(config, args, mix, args.seed + slot)
+                                                   for slot in range(args.workers)])
+    else:
+        system = make_system(config, args)
+        try:
+            operations = make_operations(system, config.cache)
+            start = threading.Barrier(args.workers)
+            parts: List[Dict] = [{} for _ in range(args.workers)]
+
+            def work(slot: int):
+                parts[slot] = run_worker(system, operations, mix, args.duration,
+                                         args.seed + slot, start)
+
+            threads = [threading.Thread(target=work, args=(slot,), name=f"load-{slot}")
+                       for slot in range(args.workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            system.close()
+    return summarize(parts)
+
+
+def summarize(parts: List[Dict]) -> Dict:
+    """Throughput, latency percentiles (ms) and error rate over all workers"""
+    per_operation: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for part in parts:
+        for name, samples in part["latencies"].items():
+            per_operation.setdefault(name, []).extend(samples)
+        for kind, count in part["errors"].items():
+            errors[kind] = errors.get(kind, 0) + count
+    samples = sorted(itertools.chain.from_iterable(per_operation.values()))
+    failed = sum(errors.values())
+    total = len(samples) + failed
+    # Workers run concurrently, so rates add up
+    throughput = sum((sum(map(len, part["latencies"].values())) + sum(part["errors"].values()))
+                     / part["elapsed"] for part in parts if part["elapsed"])
+
+    def quantiles(values: List[float]) -> Dict:
+        if not values:
+            return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+        return {"p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+                "max_ms": values[-1] * 1000}
+
+    return {
+        "requests": total,
+        "ops_per_sec": throughput,
+        "error_rate": failed / total if total else 0.0,
+        "errors": errors,
+        **quantiles(samples),
+        "operations": {name: dict(count=len(values), **quantiles(sorted(values)))
+                       for name, values in sorted(per_operation.items())},
+    }
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def print_report(results: List[Tuple[LoadConfig, Dict]]):
+    header = (f"{'configuration':<34}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'errors':>9}{'vs first':>10}")
+    print(header)
+    print("-" * len(header))
+    baseline = results[0][1]["ops_per_sec"] if results else 0
+    for config, summary in results:
+        relative = summary["ops_per_sec"] / baseline if baseline else float("nan")
+        print(f"{config.label:<34}{summary['ops_per_sec']:>12,.0f}{_ms(summary['p50_ms']):>10}"
+              f"{_ms(summary['p95_ms']):>10}{_ms(summary['p99_ms']):>10}"
+              f"{summary['error_rate']:>9.2%}{relative:>9.2f}x")
+    for config, summary in results:
+        if summary["errors"]:
+            kinds = ", ".join(f"{kind}: {count}" for kind, count in summary["errors"].items())
+            print(f"  {config.label}: {kinds}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mode", choices=("thread", "process"), default="thread")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per configuration")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--backends", type=_csv(str), default=["sqlite", "fake-pyodbc"])
+    parser.add_argument("--pool-sizes", type=_csv(int), default=[1, 4, 8])
+    parser.add_argument("--cache", type=_csv(_cache_setting), default=[True, False],
+                        help="on, off or on,off: serve lookups from the element index")
+    parser.add_argument("--system", choices=("console", "gui"), default="console",
+                        help="drive PeriodicTableSystem or the GUI's DatabaseManager")
+    parser.add_argument("--latency", type=float, default=0.001,
+                        help="simulated round-trip in seconds for fake-pyodbc")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-save", action="store_true", help="do not write a results file")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.backends if name not in BACKEND_NAMES]
+    if unknown:
+        parser.error(f"Unknown backend '{unknown[0]}', expected: {', '.join(BACKEND_NAMES)}")
+
+    configs = [LoadConfig(*combination) for combination in
+               itertools.product(args.backends, args.pool_sizes, args.cache)]
+    print(f"{len(configs)} configuration(s), {args.workers} {args.mode} worker(s), "
+          f"{args.duration:g}s each\n")
+    results = []
+    for config in configs:
+        try:
+            summary = run_config(config, args, args.mix)
+        except (BackendError, ImportError) as e:
+            print(f"{config.label}: setup failed: {str(e)}", file=sys.stderr)
+            continue
+        results.append((config, summary))
+    if results:
+        print_report(results)
+
+    if not args.no_save and results:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        revision = git_revision()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"load-{stamp}-{revision}.json")
+        options = {key: value for key, value in vars(args).items() if key != "no_save"}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"revision": revision, "timestamp": stamp, "options": options,
+                       "python": sys.version.split()[0],
+                       "results": [dict(config._asdict(), **summary)
+                                   for config, summary in results]}, f, indent=2)
+        print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Benchmark runner for the data access and rendering hot paths
+
+Usage:
+    python benchmarks/run.py [--backend sqlite|fake-pyodbc] [--latency SECONDS]
+                             [--iterations N] [--metrics] [--no-save]
+
+Every case is timed call by call; the report shows latency percentiles and
+throughput. Results are written to benchmarks/results/ and compared with the
+most recent earlier run for the same configuration, so regressions between
+commits show up as a percentage change.
+"""
+import argparse
+import atexit
+import gc
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "interfaces"))
+sys.path.insert(0, HERE)
+
+import metrics  # noqa: E402
+from backends import StorageBackend, create_backend  # noqa: E402
+from console import PeriodicTableSystem  # noqa: E402
+from element import Element  # noqa: E402
+
+RESULTS_DIR = os.path.join(HERE, "results")
+
+# Regressions larger than this fraction are flagged in the comparison
+REGRESSION_THRESHOLD = 0.10
+
+
+def make_backend(name: str, latency: float = 0.0) -> StorageBackend:
+    """Create a benchmark backend: embedded SQLite or PyodbcBackend over fake_pyodbc"""
+    if name == "sqlite":
+        return create_backend("sqlite")
+    if name == "fake-pyodbc":
+        import fake_pyodbc
+        sys.modules["pyodbc"] = fake_pyodbc
+        fake_pyodbc.configure(latency=latency)
+        return create_backend("sqlserver")
+    raise SystemExit(f"Unknown benchmark backend '{name}'")
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 20) -> Dict:
+    """Time fn once per iteration and summarise the samples in microseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            start = clock()
+            fn()
+            samples.append(clock() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    samples.sort()
+    total = sum(samples)
+    return {
+        "iterations": iterations,
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p90_us": percentile(samples, 0.90) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+        "max_us": samples[-1] * 1e6,
+        "ops_per_sec": iterations / total if total else float("inf"),
+    }
+
+
+def data_access_cases(system: PeriodicTableSystem) -> Dict[str, Callable[[], object]]:
+    """Cases exercising the PeriodicTableSystem query methods"""
+    elements = Element.from_rows(system.backend.fetch_all())
+    numbers = [element.atomic_number for element in elements]
+    symbols = [element.symbol for element in elements]
+    state = {"i": 0}
+
+    def next_index(size: int) -> int:
+        state["i"] = (state["i"] + 1) % size
+        return state["i"]
+
+    def uncached_statistics():
+        system._statistics = None
+        return system.get_statistics()
+
+    return {
+        "get_element_by_number": lambda: system.get_element_by_number(
+            numbers[next_index(len(numbers))]),
+        "get_element_by_symbol": lambda: system.get_element_by_symbol(
+            symbols[next_index(len(symbols))]),
+        "get_elements_by_block": lambda: system.get_elements_by_block("p"),
+        "get_elements_by_period": lambda: system.get_elements_by_period(2),
+        "get_all_elements": system.get_all_elements,
+        "get_elements_by_symbols[100]": lambda: system.get_elements_by_symbols(
+            (symbols * (100 // len(symbols) + 1))[:100]),
+        "get_statistics": system.get_statistics,
+        "get_statistics (uncached)": uncached_statistics,
+    }
+
+
+def row_conversion_cases(backend: StorageBackend) -> Dict[str, Callable[[], object]]:
+    """Cases for turning driver rows into records (formerly _row_to_dict)"""
+    rows = backend.fetch_all()
+    changed = [row[:2] + (row[2] + "*",) + tuple(row[3:]) for row in rows]
+
+    return {
+        "Element.from_row (interned)": lambda: [Element.from_row(row) for row in rows],
+        "Element.from_row (changed rows)": lambda: (
+            [Element.from_row(row) for row in changed],
+            [Element.from_row(row) for row in rows],
+        ),
+    }
+
+
+def gui_cases(backend_name: str) -> Dict[str, Callable[[], object]]:
+    """Headless periodic table tab construction and grid drawing, if a display is available"""
+    try:
+        import gui
+    except ImportError as e:
+        print(f"Skipping GUI cases: {e}")
+        return {}
+
+    os.environ.setdefault(
+        "PERIODIC_TABLE_BACKEND", "sqlite" if backend_name == "sqlite" else "sqlserver")
+    # Keep the GUI's start-up snapshot and search history out of ~/.cache
+    scratch = tempfile.mkdtemp(prefix="periodic-table-bench-")
+    atexit.register(shutil.rmtree, scratch, ignore_errors=True)
+    os.environ["PERIODIC_TABLE_CACHE"] = os.path.join(scratch, "elements.json")
+    os.environ["PERIODIC_TABLE_HISTORY"] = os.path.join(scratch, "history.ndjson")
+    try:
+        app = gui.PeriodicTableGUI()
+    except Exception as e:  # tkinter.TclError when there is no display
+        print(f"Skipping GUI cases: {e}")
+        return {}
+    atexit.register(app.history.close)
+    app.root.withdraw()
+    app.db.connect()
+    app.ensure_tab("Periodic Table")
+    elements = app.db.get_all_elements()
+
+    def setup_table_tab():
+        # The elements arrive from a query worker, so pump the Tk loop until
+        # the new grid has been drawn
+        for child in app.table_tab.winfo_children():
+            child.destroy()
+        app.setup_table_tab()
+        deadline = time.perf_counter() + 30
+        while len(app.element_grid.elements) < len(elements):
+            if time.perf_counter() > deadline:
+                raise RuntimeError("The periodic table grid was not drawn within 30s")
+            app.root.update()
+        app.root.update_idletasks()
+
+    def set_elements():
+        app.element_grid.set_elements(elements)
+        app.root.update_idletasks()
+
+    return {
+        "PeriodicTableGUI.setup_table_tab (until drawn)": setup_table_tab,
+        "ElementGrid.set_elements": set_elements,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def previous_result(config: Dict) -> Optional[Dict]:
+    """Most recent saved run with the same configuration"""
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    for name in sorted(os.listdir(RESULTS_DIR), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(RESULTS_DIR, name), encoding="utf-8") as f:
+            result = json.load(f)
+        if result.get("config") == config:
+            return result
+    return None
+
+
+def print_report(results: Dict[str, Dict], baseline: Optional[Dict]):
+    header = f"{'case':<44}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'ops/s':>13}"
+    if baseline:
+        header += f"{'vs ' + baseline['revision']:>14}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results.items():
+        line = (f"{name:<44}{stats['p50_us']:>10.1f}{stats['p90_us']:>10.1f}"
+                f"{stats['p99_us']:>10.1f}{stats['ops_per_sec']:>13,.0f}")
+        old = baseline["results"].get(name) if baseline else None
+        if old:
+            change = (stats["p50_us"] - old["p50_us"]) / old["p50_us"] if old["p50_us"] else 0.0
+            flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ""
+            line += f"{change:>+13.0%}{flag}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["sqlite", "fake-pyodbc"], default="sqlite")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated round-trip in seconds for fake-pyodbc")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--no-gui", action="store_true", help="skip the GUI rendering case")
+    parser.add_argument("--metrics", action="store_true",
+                        help="run with data layer instrumentation enabled")
+    parser.add_argument("--no-save", action="store_true", help="do not write a results file")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        metrics.enable()
+    backend = make_backend(args.backend, args.latency)
+    results: Dict[str, Dict] = {}
+    for use_index in (True, False):
+        system = PeriodicTableSystem(backend, use_index=use_index)
+        label = "index" if use_index else "direct"
+        for name, fn in data_access_cases(system).items():
+            results[f"{name} [{label}]"] = measure(fn, args.iterations)
+    for name, fn in row_conversion_cases(backend).items():
+        results[name] = measure(fn, args.iterations)
+    if not args.no_gui:
+        for name, fn in gui_cases(args.backend).items():
+            results[name] = measure(fn, max(args.iterations // 100, 5), warmup=2)
+
+    config = {"backend": args.backend, "latency": args.latency, "iterations": args.iterations}
+    if args.metrics:
+        config["metrics"] = True
+    baseline = previous_result(config)
+    print_report(results, baseline)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        revision = git_revision()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"{stamp}-{revision}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"revision": revision, "timestamp": stamp, "config": config,
+                       "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    main()
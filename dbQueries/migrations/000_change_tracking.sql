@@ -0,0 +1,46 @@
+-- Migration 000: the ElementChanges log, the trigger that fills it and the
+-- GetElementChanges procedure, for databases created before change
+-- tracking. Safe to run more than once (SQL Server 2016 SP1 or later).
+USE PeriodicTableDB;
+GO
+
+-- Change log: one row per insert, update or delete of an element. Clients
+-- remember the highest ChangeVersion they have applied and fetch only the
+-- elements changed after it.
+IF OBJECT_ID('ElementChanges', 'U') IS NULL
+    CREATE TABLE ElementChanges (
+        ChangeVersion BIGINT IDENTITY(1,1) PRIMARY KEY,
+        AtomicNumber INT NOT NULL
+    );
+GO
+
+CREATE OR ALTER TRIGGER TrackElementChanges ON Elements
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO ElementChanges (AtomicNumber)
+    SELECT AtomicNumber FROM inserted
+    UNION
+    SELECT AtomicNumber FROM deleted;
+END;
+GO
+
+-- Elements changed after a version, one row per element with the latest
+-- version that touched it; deleted elements come back with NULL columns
+CREATE OR ALTER PROCEDURE GetElementChanges
+    @SinceVersion BIGINT
+AS
+BEGIN
+    SELECT c.ChangeVersion, c.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block,
+           e.GroupNumber, e.Period, e.ElectronConfiguration
+    FROM (
+        SELECT AtomicNumber, MAX(ChangeVersion) AS ChangeVersion
+        FROM ElementChanges
+        WHERE ChangeVersion > @SinceVersion
+        GROUP BY AtomicNumber
+    ) c
+    LEFT JOIN Elements e ON e.AtomicNumber = c.AtomicNumber
+    ORDER BY c.ChangeVersion;
+END;
+GO
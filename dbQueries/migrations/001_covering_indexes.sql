@@ -0,0 +1,191 @@
+-- Migration 001: covering indexes for the block, period and group queries,
+-- procedures that project explicit columns, the group and range procedures,
+-- and the table types and procedures for batch lookups, statistics and
+-- upserts. Run 000_change_tracking.sql first. Safe to run more than once
+-- (SQL Server 2016 SP1 or later).
+USE PeriodicTableDB;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_Elements_Block' AND object_id = OBJECT_ID('Elements'))
+    CREATE NONCLUSTERED INDEX IX_Elements_Block
+        ON Elements (Block, AtomicNumber)
+        INCLUDE (Symbol, Name, AtomicMass, GroupNumber, Period, ElectronConfiguration);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_Elements_Period' AND object_id = OBJECT_ID('Elements'))
+    CREATE NONCLUSTERED INDEX IX_Elements_Period
+        ON Elements (Period, AtomicNumber)
+        INCLUDE (Symbol, Name, AtomicMass, Block, GroupNumber, ElectronConfiguration);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_Elements_Group' AND object_id = OBJECT_ID('Elements'))
+    CREATE NONCLUSTERED INDEX IX_Elements_Group
+        ON Elements (GroupNumber, Period)
+        INCLUDE (Symbol, Name, AtomicMass, Block, ElectronConfiguration);
+GO
+
+CREATE OR ALTER PROCEDURE GetElementByNumber
+    @AtomicNumber INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE AtomicNumber = @AtomicNumber;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementBySymbol
+    @Symbol NVARCHAR(2)
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Symbol = @Symbol;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsByBlock
+    @Block CHAR(1)
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Block = @Block ORDER BY AtomicNumber;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsByPeriod
+    @Period INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Period = @Period ORDER BY AtomicNumber;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsByGroup
+    @GroupNumber INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE GroupNumber = @GroupNumber ORDER BY Period;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsByNumberRange
+    @FromNumber INT,
+    @ToNumber INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE AtomicNumber BETWEEN @FromNumber AND @ToNumber ORDER BY AtomicNumber;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsByPeriodRange
+    @FromPeriod INT,
+    @ToPeriod INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Period BETWEEN @FromPeriod AND @ToPeriod ORDER BY Period, AtomicNumber;
+END;
+GO
+
+-- Table types for set-based lookups; callers pass distinct keys
+IF TYPE_ID('AtomicNumberList') IS NULL
+    CREATE TYPE AtomicNumberList AS TABLE (
+        AtomicNumber INT PRIMARY KEY
+    );
+
+IF TYPE_ID('SymbolList') IS NULL
+    CREATE TYPE SymbolList AS TABLE (
+        Symbol NVARCHAR(2) PRIMARY KEY
+    );
+
+IF TYPE_ID('ElementRowList') IS NULL
+    CREATE TYPE ElementRowList AS TABLE (
+        AtomicNumber INT PRIMARY KEY,
+        Symbol NVARCHAR(2) NOT NULL,
+        Name NVARCHAR(50) NOT NULL,
+        AtomicMass DECIMAL(10,4) NOT NULL,
+        Block CHAR(1) NOT NULL,
+        GroupNumber INT,
+        Period INT NOT NULL,
+        ElectronConfiguration NVARCHAR(100) NOT NULL
+    );
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsByNumbers
+    @AtomicNumbers AtomicNumberList READONLY
+AS
+BEGIN
+    SELECT e.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block, e.GroupNumber, e.Period,
+           e.ElectronConfiguration
+    FROM Elements e
+    INNER JOIN @AtomicNumbers n ON n.AtomicNumber = e.AtomicNumber
+    ORDER BY e.AtomicNumber;
+END;
+GO
+
+CREATE OR ALTER PROCEDURE GetElementsBySymbols
+    @Symbols SymbolList READONLY
+AS
+BEGIN
+    SELECT e.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block, e.GroupNumber, e.Period,
+           e.ElectronConfiguration
+    FROM Elements e
+    INNER JOIN @Symbols s ON s.Symbol = e.Symbol
+    ORDER BY e.AtomicNumber;
+END;
+GO
+
+-- Mass aggregates per block, period and group plus a grand total, in one pass
+CREATE OR ALTER PROCEDURE GetElementStatistics
+AS
+BEGIN
+    SELECT
+        CASE
+            WHEN GROUPING(Block) = 0 THEN 'block'
+            WHEN GROUPING(Period) = 0 THEN 'period'
+            WHEN GROUPING(GroupNumber) = 0 THEN 'group'
+            ELSE 'all'
+        END AS Dimension,
+        CASE
+            WHEN GROUPING(Block) = 0 THEN CAST(Block AS NVARCHAR(10))
+            WHEN GROUPING(Period) = 0 THEN CAST(Period AS NVARCHAR(10))
+            WHEN GROUPING(GroupNumber) = 0 THEN CAST(GroupNumber AS NVARCHAR(10))
+        END AS GroupKey,
+        COUNT(*) AS ElementCount,
+        MIN(AtomicMass) AS MinAtomicMass,
+        MAX(AtomicMass) AS MaxAtomicMass,
+        AVG(CAST(AtomicMass AS FLOAT)) AS AvgAtomicMass,
+        STDEV(AtomicMass) AS StdevAtomicMass
+    FROM Elements
+    GROUP BY GROUPING SETS ((Block), (Period), (GroupNumber), ());
+END;
+GO
+
+-- Batched upsert: callers pass a chunk of rows as one table-valued parameter
+CREATE OR ALTER PROCEDURE UpsertElements
+    @Elements ElementRowList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    MERGE Elements WITH (HOLDLOCK) AS target
+    USING @Elements AS source
+        ON target.AtomicNumber = source.AtomicNumber
+    WHEN MATCHED THEN UPDATE SET
+        Symbol = source.Symbol,
+        Name = source.Name,
+        AtomicMass = source.AtomicMass,
+        Block = source.Block,
+        GroupNumber = source.GroupNumber,
+        Period = source.Period,
+        ElectronConfiguration = source.ElectronConfiguration
+    WHEN NOT MATCHED THEN
+        INSERT (AtomicNumber, Symbol, Name, AtomicMass, Block,
+                GroupNumber, Period, ElectronConfiguration)
+        VALUES (source.AtomicNumber, source.Symbol, source.Name, source.AtomicMass,
+                source.Block, source.GroupNumber, source.Period, source.ElectronConfiguration);
+    SELECT @@ROWCOUNT;
+END;
+GO
@@ -1,9 +1,12 @@
--- Stored procedures for common queries
+-- Stored procedures for common queries. Each one projects the Elements
+-- columns explicitly so the covering indexes in schema.sql can answer it
+-- without key lookups.
 CREATE PROCEDURE GetElementByNumber
     @AtomicNumber INT
 AS
 BEGIN
-    SELECT * FROM Elements WHERE AtomicNumber = @AtomicNumber;
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE AtomicNumber = @AtomicNumber;
 END;
 GO
 
@@ -11,7 +14,8 @@ CREATE PROCEDURE GetElementBySymbol
     @Symbol NVARCHAR(2)
 AS
 BEGIN
-    SELECT * FROM Elements WHERE Symbol = @Symbol;
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Symbol = @Symbol;
 END;
 GO
 
@@ -19,7 +23,8 @@ CREATE PROCEDURE GetElementsByBlock
     @Block CHAR(1)
 AS
 BEGIN
-    SELECT * FROM Elements WHERE Block = @Block ORDER BY AtomicNumber;
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Block = @Block ORDER BY AtomicNumber;
 END;
 GO
 
@@ -27,6 +32,154 @@ CREATE PROCEDURE GetElementsByPeriod
     @Period INT
 AS
 BEGIN
-    SELECT * FROM Elements WHERE Period = @Period ORDER BY AtomicNumber;
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Period = @Period ORDER BY AtomicNumber;
 END;
-G
\ No newline at end of file
+GO
+
+CREATE PROCEDURE GetElementsByGroup
+    @GroupNumber INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE GroupNumber = @GroupNumber ORDER BY Period;
+END;
+GO
+
+CREATE PROCEDURE GetElementsByNumberRange
+    @FromNumber INT,
+    @ToNumber INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE AtomicNumber BETWEEN @FromNumber AND @ToNumber ORDER BY AtomicNumber;
+END;
+GO
+
+CREATE PROCEDURE GetElementsByPeriodRange
+    @FromPeriod INT,
+    @ToPeriod INT
+AS
+BEGIN
+    SELECT AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period, ElectronConfiguration
+    FROM Elements WHERE Period BETWEEN @FromPeriod AND @ToPeriod ORDER BY Period, AtomicNumber;
+END;
+GO
+
+-- Table types for set-based lookups; callers pass distinct keys
+CREATE TYPE AtomicNumberList AS TABLE (
+    AtomicNumber INT PRIMARY KEY
+);
+GO
+
+CREATE TYPE SymbolList AS TABLE (
+    Symbol NVARCHAR(2) PRIMARY KEY
+);
+GO
+
+CREATE PROCEDURE GetElementsByNumbers
+    @AtomicNumbers AtomicNumberList READONLY
+AS
+BEGIN
+    SELECT e.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block, e.GroupNumber, e.Period,
+           e.ElectronConfiguration
+    FROM Elements e
+    INNER JOIN @AtomicNumbers n ON n.AtomicNumber = e.AtomicNumber
+    ORDER BY e.AtomicNumber;
+END;
+GO
+
+CREATE PROCEDURE GetElementsBySymbols
+    @Symbols SymbolList READONLY
+AS
+BEGIN
+    SELECT e.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block, e.GroupNumber, e.Period,
+           e.ElectronConfiguration
+    FROM Elements e
+    INNER JOIN @Symbols s ON s.Symbol = e.Symbol
+    ORDER BY e.AtomicNumber;
+END;
+GO
+
+-- Mass aggregates per block, period and group plus a grand total, in one pass
+CREATE PROCEDURE GetElementStatistics
+AS
+BEGIN
+    SELECT
+        CASE
+            WHEN GROUPING(Block) = 0 THEN 'block'
+            WHEN GROUPING(Period) = 0 THEN 'period'
+            WHEN GROUPING(GroupNumber) = 0 THEN 'group'
+            ELSE 'all'
+        END AS Dimension,
+        CASE
+            WHEN GROUPING(Block) = 0 THEN CAST(Block AS NVARCHAR(10))
+            WHEN GROUPING(Period) = 0 THEN CAST(Period AS NVARCHAR(10))
+            WHEN GROUPING(GroupNumber) = 0 THEN CAST(GroupNumber AS NVARCHAR(10))
+        END AS GroupKey,
+        COUNT(*) AS ElementCount,
+        MIN(AtomicMass) AS MinAtomicMass,
+        MAX(AtomicMass) AS MaxAtomicMass,
+        AVG(CAST(AtomicMass AS FLOAT)) AS AvgAtomicMass,
+        STDEV(AtomicMass) AS StdevAtomicMass
+    FROM Elements
+    GROUP BY GROUPING SETS ((Block), (Period), (GroupNumber), ());
+END;
+GO
+
+-- Batched upsert: callers pass a chunk of rows as one table-valued parameter
+CREATE TYPE ElementRowList AS TABLE (
+    AtomicNumber INT PRIMARY KEY,
+    Symbol NVARCHAR(2) NOT NULL,
+    Name NVARCHAR(50) NOT NULL,
+    AtomicMass DECIMAL(10,4) NOT NULL,
+    Block CHAR(1) NOT NULL,
+    GroupNumber INT,
+    Period INT NOT NULL,
+    ElectronConfiguration NVARCHAR(100) NOT NULL
+);
+GO
+
+CREATE PROCEDURE UpsertElements
+    @Elements ElementRowList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    MERGE Elements WITH (HOLDLOCK) AS target
+    USING @Elements AS source
+        ON target.AtomicNumber = source.AtomicNumber
+    WHEN MATCHED THEN UPDATE SET
+        Symbol = source.Symbol,
+        Name = source.Name,
+        AtomicMass = source.AtomicMass,
+        Block = source.Block,
+        GroupNumber = source.GroupNumber,
+        Period = source.Period,
+        ElectronConfiguration = source.ElectronConfiguration
+    WHEN NOT MATCHED THEN
+        INSERT (AtomicNumber, Symbol, Name, AtomicMass, Block,
+                GroupNumber, Period, ElectronConfiguration)
+        VALUES (source.AtomicNumber, source.Symbol, source.Name, source.AtomicMass,
+                source.Block, source.GroupNumber, source.Period, source.ElectronConfiguration);
+    SELECT @@ROWCOUNT;
+END;
+GO
+
+-- Elements changed after a version, one row per element with the latest
+-- version that touched it; deleted elements come back with NULL columns
+CREATE PROCEDURE GetElementChanges
+    @SinceVersion BIGINT
+AS
+BEGIN
+    SELECT c.ChangeVersion, c.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block,
+           e.GroupNumber, e.Period, e.ElectronConfiguration
+    FROM (
+        SELECT AtomicNumber, MAX(ChangeVersion) AS ChangeVersion
+        FROM ElementChanges
+        WHERE ChangeVersion > @SinceVersion
+        GROUP BY AtomicNumber
+    ) c
+    LEFT JOIN Elements e ON e.AtomicNumber = c.AtomicNumber
+    ORDER BY c.ChangeVersion;
+END;
+GO
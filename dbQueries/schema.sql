@@ -18,6 +18,22 @@ CREATE TABLE Elements (
 );
 GO
 
+-- Covering indexes for the block, period and group procedures: the key
+-- gives the seek and the sort order, INCLUDE carries the other columns so
+-- no key lookups are needed
+CREATE NONCLUSTERED INDEX IX_Elements_Block
+    ON Elements (Block, AtomicNumber)
+    INCLUDE (Symbol, Name, AtomicMass, GroupNumber, Period, ElectronConfiguration);
+
+CREATE NONCLUSTERED INDEX IX_Elements_Period
+    ON Elements (Period, AtomicNumber)
+    INCLUDE (Symbol, Name, AtomicMass, Block, GroupNumber, ElectronConfiguration);
+
+CREATE NONCLUSTERED INDEX IX_Elements_Group
+    ON Elements (GroupNumber, Period)
+    INCLUDE (Symbol, Name, AtomicMass, Block, ElectronConfiguration);
+GO
+
 -- Insert S and P block elements
 INSERT INTO Elements VALUES
 -- S-block elements
@@ -37,4 +53,25 @@ INSERT INTO Elements VALUES
 (8, 'O', 'Oxygen', 15.9994, 'p', 16, 2, '1s2 2s2 2p4'),
 (9, 'F', 'Fluorine', 18.9984, 'p', 17, 2, '1s2 2s2 2p5'),
 (10, 'Ne', 'Neon', 20.1797, 'p', 18, 2, '1s2 2s2 2p6');
+GO
 
+-- Change log: one row per insert, update or delete of an element. Clients
+-- remember the highest ChangeVersion they have applied and fetch only the
+-- elements changed after it.
+CREATE TABLE ElementChanges (
+    ChangeVersion BIGINT IDENTITY(1,1) PRIMARY KEY,
+    AtomicNumber INT NOT NULL
+);
+GO
+
+CREATE TRIGGER TrackElementChanges ON Elements
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO ElementChanges (AtomicNumber)
+    SELECT AtomicNumber FROM inserted
+    UNION
+    SELECT AtomicNumber FROM deleted;
+END;
+GO
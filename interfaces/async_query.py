@@ -0,0 +1,227 @@
+import asyncio
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class TkQueryRunner:
+    """Run blocking data-access calls on worker threads for a Tk application
+
+    Tk widgets may only be touched from the thread running mainloop(), so
+    workers never call back directly: completed futures are queued and a
+    poller scheduled with ``root.after`` delivers their results on the Tk
+    thread. Submitting with a ``key`` supersedes any earlier request under
+    the same key, whose result is then discarded even if it already ran.
+    """
+
+    def __init__(self, root, max_workers: int = 4, poll_interval_ms: int = 15,
+                 on_busy: Optional[Callable[[bool], None]] = None):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="db-query")
+        self._callbacks = queue.SimpleQueue()
+        self._latest: Dict[str, Future] = {}
+        self._pending = 0
+        self._closed = False
+        self._poll()
+
+    @property
+    def busy(self) -> bool:
+        """Whether any submitted query has not been delivered yet"""
+        return self._pending > 0
+
+    def submit(self, fn: Callable, *args, key: Optional[str] = None,
+               on_success: Optional[Callable] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Run fn(*args) on a worker and pass its result to on_success on the Tk thread"""
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+
+        future = self._executor.submit(fn, *args)
+        if key is not None:
+            self._latest[key] = future
+        self._set_pending(self._pending + 1)
+        future.add_done_callback(
+            lambda done: self._callbacks.put(
+                lambda: self._deliver(done, key, on_success, on_error)
+            )
+        )
+        return future
+
+    def cancel(self, key: str):
+        """Cancel the outstanding request for a key, if any"""
+        future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def call_soon(self, fn: Callable, *args):
+        """Schedule fn(*args) on the Tk thread; safe to call from any thread"""
+        self._callbacks.put(lambda: fn(*args))
+
+    def shutdown(self):
+        """Stop polling and abandon queued work"""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver(self, future: Future, key: Optional[str], on_success, on_error):
+        self._set_pending(self._pending - 1)
+        if key is not None:
+            if self._latest.get(key) is not future:
+                return  # superseded by a newer request
+            del self._latest[key]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is None:
+                raise error
+            on_error(error)
+        elif on_success is not None:
+            on_success(future.result())
+
+    def _set_pending(self, count: int):
+        was_busy = self._pending > 0
+        self._pending = count
+        if self.on_busy is not None and was_busy != (count > 0):
+            self.on_busy(count > 0)
+
+    def _poll(self):
+        if self._closed:
+            return
+        try:
+            while True:
+                callback = self._callbacks.get_nowait()
+                try:
+                    callback()
+                except Exception as e:
+                    # Keep polling even if one callback fails
+                    self.root.report_callback_exception(type(e), e, e.__traceback__)
+        except queue.Empty:
+            pass
+        self.root.after(self.poll_interval_ms, self._poll)
+
+
+class AsyncPeriodicTableSystem:
+    """Awaitable front end to PeriodicTableSystem for asyncio applications
+
+    Calls that may reach the database run on a bounded thread pool, so a
+    slow query never blocks the event loop and at most ``max_workers``
+    queries (by default the backend pool size) run at once. Concurrent awaits
+    for the same method and arguments are coalesced: the first starts the
+    query and the others await its result. Lookups the warm element index
+    can answer are served inline, since handing them to a thread would cost
+    more than the lookup itself.
+    """
+
+    # Methods answered from the in-memory index when it is loaded
+    INDEXED = frozenset({
+        "get_all_elements", "get_element_by_number", "get_element_by_symbol",
+        "get_elements_by_numbers", "get_elements_by_symbols", "get_elements_by_block",
+        "get_elements_by_period", "get_elements_by_group", "get_elements_by_number_range",
+        "search", "get_similar_elements", "get_similar_elements_many",
+    })
+
+    def __init__(self, system, max_workers: Optional[int] = None):
+        self.system = system
+        if max_workers is None:
+            # One thread per pooled connection, so no worker waits on the pool
+            pool = getattr(system.backend, "pool", None)
+            max_workers = pool.size if pool is not None else 4
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="db-query")
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    @classmethod
+    async def create(cls, backend=None, use_index: Optional[bool] = None,
+                     max_workers: Optional[int] = None):
+        """Build the PeriodicTableSystem (and warm its index) without blocking the loop"""
+        from console import PeriodicTableSystem
+
+        loop = asyncio.get_running_loop()
+        system = await loop.run_in_executor(
+            None, lambda: PeriodicTableSystem(backend, use_index=use_index))
+        return cls(system, max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct queries currently running or queued"""
+        return len(self._inflight)
+
+    async def _call(self, method: str, *args):
+        if (method in self.INDEXED and self.system.use_index
+                and self.system.index.loaded):
+            return getattr(self.system, method)(*args)
+
+        key = (method,) + args
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, getattr(self.system, method), *args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one cancelled caller does not cancel the query the others share
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Tuple, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def get_all_elements(self):
+        return await self._call("get_all_elements")
+
+    async def get_element_by_number(self, atomic_number: int):
+        return await self._call("get_element_by_number", atomic_number)
+
+    async def get_element_by_symbol(self, symbol: str):
+        return await self._call("get_element_by_symbol", symbol.strip().lower())
+
+    async def get_elements_by_numbers(self, atomic_numbers: List[int]):
+        return await self._call("get_elements_by_numbers", tuple(atomic_numbers))
+
+    async def get_elements_by_symbols(self, symbols: List[str]):
+        return await self._call("get_elements_by_symbols", tuple(symbols))
+
+    async def get_elements_by_block(self, block: str):
+        return await self._call("get_elements_by_block", block.strip().lower())
+
+    async def get_elements_by_period(self, period: int):
+        return await self._call("get_elements_by_period", period)
+
+    async def get_elements_by_group(self, group_number: int):
+        return await self._call("get_elements_by_group", group_number)
+
+    async def get_elements_by_number_range(self, low: int, high: int):
+        return await self._call("get_elements_by_number_range", low, high)
+
+    async def search(self, query: str, limit: int = 10):
+        return await self._call("search", query, limit)
+
+    async def get_similar_elements(self, atomic_number: int, limit: int = 5,
+                                   max_distance: Optional[float] = None):
+        return await self._call("get_similar_elements", atomic_number, limit, max_distance)
+
+    async def get_similar_elements_many(self, atomic_numbers: List[int], limit: int = 5):
+        return await self._call("get_similar_elements_many", tuple(atomic_numbers), limit)
+
+    async def get_statistics(self) -> Dict:
+        return await self._call("get_statistics")
+
+    async def poll_changes(self):
+        return await self._call("poll_changes")
+
+    async def refresh(self):
+        return await self._call("refresh")
+
+    async def close(self):
+        """Wait for running queries, then close the backend"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        await loop.run_in_executor(None, self.system.close)
@@ -0,0 +1,546 @@
+import importlib
+import itertools
+import math
+import os
+import sqlite3
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from pool import ConnectionPool, PoolClosed, PoolTimeout
+
+DEFAULT_CONNECTION_STRING = (
+    "Driver={SQL Server};"
+    "Server=localhost;"
+    "Database=PeriodicTableDB;"
+    "Trusted_Connection=yes;"
+)
+
+DEFAULT_SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "dbQueries", "schema.sql"
+)
+
+ELEMENT_COLUMNS = (
+    "AtomicNumber, Symbol, Name, AtomicMass, Block, "
+    "GroupNumber, Period, ElectronConfiguration"
+)
+
+
+# Same shape as the GetElementChanges procedure, for backends without it
+CHANGES_QUERY = (
+    "SELECT c.ChangeVersion, c.AtomicNumber, e.Symbol, e.Name, e.AtomicMass, e.Block, "
+    "e.GroupNumber, e.Period, e.ElectronConfiguration "
+    "FROM (SELECT AtomicNumber, MAX(ChangeVersion) AS ChangeVersion FROM ElementChanges "
+    "WHERE ChangeVersion > ? GROUP BY AtomicNumber) c "
+    "LEFT JOIN Elements e ON e.AtomicNumber = c.AtomicNumber "
+    "ORDER BY c.ChangeVersion"
+)
+
+CHANGE_VERSION_QUERY = "SELECT COALESCE(MAX(ChangeVersion), 0) FROM ElementChanges"
+
+
+class BackendError(Exception):
+    """Raised when a storage backend fails to connect or run a query"""
+
+
+class MissingObjectError(BackendError):
+    """Raised when a query names a table or procedure the database does not have,
+    e.g. ElementChanges on a database created before change tracking"""
+
+
+class StorageBackend:
+    """Storage interface shared by the console and GUI data classes
+
+    Every fetch method returns raw rows in Elements column order:
+    (AtomicNumber, Symbol, Name, AtomicMass, Block, GroupNumber, Period,
+    ElectronConfiguration).
+    """
+
+    name = "abstract"
+    # True when lookups already run against memory (a mapped snapshot), so an
+    # element index would only add a full decode at start-up
+    serves_from_memory = False
+
+    def fetch_all(self) -> List[Tuple]:
+        """Fetch every element ordered by atomic number"""
+        raise NotImplementedError
+
+    def fetch_by_number(self, atomic_number: int) -> Optional[Tuple]:
+        """Fetch one element by atomic number"""
+        raise NotImplementedError
+
+    def fetch_by_symbol(self, symbol: str) -> Optional[Tuple]:
+        """Fetch one element by symbol"""
+        raise NotImplementedError
+
+    def fetch_by_block(self, block: str) -> List[Tuple]:
+        """Fetch the elements in a block ordered by atomic number"""
+        raise NotImplementedError
+
+    def fetch_by_period(self, period: int) -> List[Tuple]:
+        """Fetch the elements in a period ordered by atomic number"""
+        raise NotImplementedError
+
+    def fetch_by_group(self, group_number: int) -> List[Tuple]:
+        """Fetch the elements in a group ordered by period"""
+        raise NotImplementedError
+
+    def fetch_by_number_range(self, low: int, high: int) -> List[Tuple]:
+        """Fetch the elements with atomic numbers in [low, high] ordered by atomic number"""
+        raise NotImplementedError
+
+    def fetch_by_numbers(self, atomic_numbers: Sequence[int]) -> List[Tuple]:
+        """Fetch the elements whose atomic numbers are given, in any order"""
+        rows = (self.fetch_by_number(number) for number in atomic_numbers)
+        return [row for row in rows if row]
+
+    def fetch_by_symbols(self, symbols: Sequence[str]) -> List[Tuple]:
+        """Fetch the elements whose symbols are given, in any order"""
+        rows = (self.fetch_by_symbol(symbol) for symbol in symbols)
+        return [row for row in rows if row]
+
+    def fetch_statistics(self) -> List[Tuple]:
+        """Fetch atomic-mass aggregates per block, period and group in one query
+
+        Rows are (dimension, key, count, min, max, mean, sample stddev) with
+        dimension one of 'block', 'period', 'group' or 'all'.
+        """
+        raise NotImplementedError
+
+    def fetch_change_version(self) -> int:
+        """Return the latest version in the ElementChanges log (0 when empty)"""
+        raise NotImplementedError
+
+    def fetch_changes(self, since_version: int) -> List[Tuple]:
+        """Fetch the elements changed after a version, oldest change first
+
+        Rows are (version, atomic number, Symbol, ..., ElectronConfiguration);
+        every column after the atomic number is NULL for deleted elements.
+        """
+        raise NotImplementedError
+
+    def upsert_elements(self, rows: Sequence[Tuple]) -> int:
+        """Insert or update a batch of rows in Elements column order in one transaction
+
+        Returns the number of rows written.
+        """
+        raise NotImplementedError
+
+    def query(self, sql: str, *params) -> List[Tuple]:
+        """Run an ad-hoc query that both SQL dialects understand"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release the underlying connection"""
+
+
+class PooledBackend(StorageBackend):
+    """Backend that runs every query on its own cursor from a connection pool
+
+    Subclasses set ``self.pool`` and ``self._driver_error`` and may override
+    _is_disconnect() so that dropped connections are replaced and the query
+    retried once on a fresh one.
+    """
+
+    pool: ConnectionPool
+    _driver_error = Exception
+
+    def _is_disconnect(self, error: Exception) -> bool:
+        """Whether a driver error means the connection itself is unusable"""
+        return False
+
+    def _is_missing_object(self, error: Exception) -> bool:
+        """Whether a driver error means a table or procedure does not exist"""
+        return False
+
+    def _call(self, work: Callable, commit: bool = False):
+        """Run work(cursor) on a pooled connection, retrying once after a disconnect"""
+        for attempt in range(2):
+            try:
+                conn = self.pool.acquire()
+            except (PoolTimeout, PoolClosed) as e:
+                raise BackendError(str(e)) from e
+            except self._driver_error as e:
+                raise BackendError(f"Failed to connect to database: {str(e)}") from e
+
+            try:
+                cursor = conn.cursor()
+                try:
+                    result = work(cursor)
+                finally:
+                    cursor.close()
+                if commit:
+                    conn.commit()
+            except self._driver_error as e:
+                broken = self._is_disconnect(e)
+                if commit and not broken:
+                    conn.rollback()
+                self.pool.release(conn, broken=broken)
+                if broken and attempt == 0:
+                    continue
+                if self._is_missing_object(e):
+                    raise MissingObjectError(str(e)) from e
+                raise BackendError(str(e)) from e
+            except BaseException:
+                if commit:
+                    conn.rollback()
+                self.pool.release(conn)
+                raise
+            self.pool.release(conn)
+            return result
+
+    def _run(self, sql: str, params: Sequence, fetch: Callable, commit: bool = False):
+        def work(cursor):
+            cursor.execute(sql, *params)
+            return fetch(cursor)
+        return self._call(work, commit)
+
+    def fetch_change_version(self) -> int:
+        return self._fetch_one(CHANGE_VERSION_QUERY)[0]
+
+    def _fetch_one(self, sql: str, *params) -> Optional[Tuple]:
+        return self._run(sql, params, lambda cursor: cursor.fetchone())
+
+    def query(self, sql: str, *params) -> List[Tuple]:
+        return self._run(sql, params, lambda cursor: cursor.fetchall())
+
+    def close(self):
+        self.pool.close()
+
+
+class PyodbcBackend(PooledBackend):
+    """SQL Server backend that goes through the stored procedures"""
+
+    name = "sqlserver"
+
+    # SQLSTATE classes pyodbc reports when the link to the server is gone
+    DISCONNECT_STATES = ("08S01", "08001", "08003", "08004", "08007", "HYT00", "HYT01")
+
+    def __init__(self, conn_str: str = DEFAULT_CONNECTION_STRING, pool_size: int = 5,
+                 pool_timeout: float = 30.0):
+        """Initialize the connection pool and verify the server is reachable"""
+        try:
+            import pyodbc
+        except ImportError as e:
+            raise BackendError("The sqlserver backend requires the pyodbc package") from e
+        self._driver_error = pyodbc.Error
+        self.conn_str = conn_str
+        self.pool = ConnectionPool(
+            lambda: pyodbc.connect(self.conn_str),
+            size=pool_size,
+            timeout=pool_timeout,
+            health_check=lambda conn: conn.cursor().execute("SELECT 1").fetchall(),
+        )
+        # Fail fast like the old single-connection constructor did
+        self.query("SELECT 1")
+
+    def _is_disconnect(self, error: Exception) -> bool:
+        return bool(error.args) and error.args[0] in self.DISCONNECT_STATES
+
+    def _is_missing_object(self, error: Exception) -> bool:
+        # 42S02: invalid object name; 2812: could not find stored procedure
+        return bool(error.args) and (
+            error.args[0] == "42S02" or "(2812)" in str(error.args[-1]))
+
+    def fetch_all(self) -> List[Tuple]:
+        return self.query(f"SELECT {ELEMENT_COLUMNS} FROM Elements ORDER BY AtomicNumber")
+
+    def fetch_by_number(self, atomic_number: int) -> Optional[Tuple]:
+        return self._fetch_one("EXEC GetElementByNumber ?", atomic_number)
+
+    def fetch_by_symbol(self, symbol: str) -> Optional[Tuple]:
+        return self._fetch_one("EXEC GetElementBySymbol ?", symbol)
+
+    def fetch_by_block(self, block: str) -> List[Tuple]:
+        return self.query("EXEC GetElementsByBlock ?", block)
+
+    def fetch_by_period(self, period: int) -> List[Tuple]:
+        return self.query("EXEC GetElementsByPeriod ?", period)
+
+    def fetch_by_group(self, group_number: int) -> List[Tuple]:
+        return self.query("EXEC GetElementsByGroup ?", group_number)
+
+    def fetch_by_number_range(self, low: int, high: int) -> List[Tuple]:
+        return self.query("EXEC GetElementsByNumberRange ?, ?", low, high)
+
+    def fetch_by_numbers(self, atomic_numbers: Sequence[int]) -> List[Tuple]:
+        # Table-valued parameter: one round-trip whatever the batch size
+        keys = [(number,) for number in set(atomic_numbers)]
+        if not keys:
+            return []
+        return self.query("EXEC GetElementsByNumbers ?", (keys,))
+
+    def fetch_by_symbols(self, symbols: Sequence[str]) -> List[Tuple]:
+        # SymbolList's key uses the server's case-insensitive collation
+        keys = {symbol.strip().lower(): symbol.strip() for symbol in symbols}
+        if not keys:
+            return []
+        return self.query("EXEC GetElementsBySymbols ?", ([(s,) for s in keys.values()],))
+
+    def fetch_statistics(self) -> List[Tuple]:
+        return self.query("EXEC GetElementStatistics")
+
+    def fetch_changes(self, since_version: int) -> List[Tuple]:
+        return self.query("EXEC GetElementChanges ?", since_version)
+
+    def upsert_elements(self, rows: Sequence[Tuple]) -> int:
+        # The whole batch travels as one ElementRowList parameter and is
+        # applied by a single set-based MERGE
+        if not rows:
+            return 0
+        table = [tuple(row) for row in rows]
+        result = self._run("EXEC UpsertElements ?", ((table,),),
+                           lambda cursor: cursor.fetchone(), commit=True)
+        return result[0] if result else len(rows)
+
+
+def _sample_stddev(count: int, mean: Optional[float],
+                   sum_of_squares: Optional[float]) -> Optional[float]:
+    """Sample standard deviation from a count, mean and sum of squares"""
+    if count < 2 or mean is None:
+        return None
+    variance = (sum_of_squares - count * mean * mean) / (count - 1)
+    return math.sqrt(max(variance, 0.0))
+
+
+def _schema_batches(schema_path: str) -> List[str]:
+    """Split a T-SQL script into GO-separated batches"""
+    with open(schema_path, encoding="utf-8") as f:
+        script = f.read()
+
+    batches, current = [], []
+    for line in script.splitlines():
+        if line.strip().upper() == "GO":
+            batches.append("\n".join(current))
+            current = []
+        else:
+            current.append(line)
+    batches.append("\n".join(current))
+    return [batch for batch in batches if batch.strip()]
+
+
+def _leading_statement(batch: str) -> str:
+    """Return the first non-comment line of a batch in upper case"""
+    for line in batch.splitlines():
+        line = line.strip()
+        if line and not line.startswith("--"):
+            return line.upper()
+    return ""
+
+
+SQLITE_UPSERT = (
+    f"INSERT INTO Elements ({ELEMENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (AtomicNumber) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}"
+                for column in ELEMENT_COLUMNS.split(", ")[1:])
+)
+
+
+# SQLite equivalents of the covering indexes in schema.sql. SQLite has no
+# INCLUDE, and the block key needs NOCASE to serve "Block = ? COLLATE NOCASE".
+SQLITE_INDEXES = """
+CREATE INDEX IF NOT EXISTS IX_Elements_Block ON Elements (Block COLLATE NOCASE, AtomicNumber);
+CREATE INDEX IF NOT EXISTS IX_Elements_Period ON Elements (Period, AtomicNumber);
+CREATE INDEX IF NOT EXISTS IX_Elements_Group ON Elements (GroupNumber, Period);
+"""
+
+# The T-SQL trigger in schema.sql cannot run on SQLite, and SQLite only
+# auto-numbers INTEGER PRIMARY KEY columns, so versions are assigned here
+SQLITE_CHANGE_TRACKING = """
+CREATE TABLE IF NOT EXISTS ElementChanges (
+    ChangeVersion INTEGER PRIMARY KEY,
+    AtomicNumber INT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS ElementsInserted AFTER INSERT ON Elements BEGIN
+    INSERT INTO ElementChanges (ChangeVersion, AtomicNumber)
+    SELECT (SELECT COALESCE(MAX(ChangeVersion), 0) + 1 FROM ElementChanges), NEW.AtomicNumber;
+END;
+CREATE TRIGGER IF NOT EXISTS ElementsUpdated AFTER UPDATE ON Elements BEGIN
+    INSERT INTO ElementChanges (ChangeVersion, AtomicNumber)
+    SELECT (SELECT COALESCE(MAX(ChangeVersion), 0) + 1 FROM ElementChanges), NEW.AtomicNumber;
+    INSERT INTO ElementChanges (ChangeVersion, AtomicNumber)
+    SELECT (SELECT COALESCE(MAX(ChangeVersion), 0) + 1 FROM ElementChanges), OLD.AtomicNumber
+    WHERE OLD.AtomicNumber <> NEW.AtomicNumber;
+END;
+CREATE TRIGGER IF NOT EXISTS ElementsDeleted AFTER DELETE ON Elements BEGIN
+    INSERT INTO ElementChanges (ChangeVersion, AtomicNumber)
+    SELECT (SELECT COALESCE(MAX(ChangeVersion), 0) + 1 FROM ElementChanges), OLD.AtomicNumber;
+END;
+"""
+
+
+class SQLiteBackend(PooledBackend):
+    """Embedded backend loaded from dbQueries/schema.sql
+
+    Only the CREATE TABLE and INSERT batches are run; the SQL Server
+    specific parts of the script (CREATE DATABASE, USE, the indexes and the
+    change tracking trigger) are skipped and SQLITE_INDEXES and
+    SQLITE_CHANGE_TRACKING are applied instead. The
+    default ":memory:" database is a shared-cache in-memory database so
+    that every pooled connection sees the same data.
+    """
+
+    name = "sqlite"
+    _driver_error = sqlite3.Error
+    # Stay under SQLITE_MAX_VARIABLE_NUMBER on older builds
+    MAX_IN_PARAMETERS = 500
+    _memory_ids = itertools.count()
+
+    def __init__(self, schema_path: str = DEFAULT_SCHEMA_PATH, database: str = ":memory:",
+                 pool_size: int = 5, pool_timeout: float = 30.0):
+        """Create the database and load the schema into it"""
+        self.schema_path = schema_path
+        self.database = database
+        if database == ":memory:":
+            name = f"periodictable-{os.getpid()}-{next(self._memory_ids)}"
+            self._uri = f"file:{name}?mode=memory&cache=shared"
+        else:
+            self._uri = f"file:{database}"
+        try:
+            # Held open for the backend's lifetime so a memory database survives
+            self._anchor = self._connect()
+            if not self._has_elements_table():
+                self._load_schema()
+            self._anchor.executescript(SQLITE_INDEXES + SQLITE_CHANGE_TRACKING)
+        except (OSError, sqlite3.Error) as e:
+            raise BackendError(f"Failed to initialize SQLite database: {str(e)}") from e
+        self.pool = ConnectionPool(self._connect, size=pool_size, timeout=pool_timeout)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+
+    def _has_elements_table(self) -> bool:
+        return self._anchor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Elements'"
+        ).fetchone() is not None
+
+    def _load_schema(self):
+        for batch in _schema_batches(self.schema_path):
+            statement = _leading_statement(batch)
+            if statement.startswith(("CREATE TABLE", "INSERT")):
+                self._anchor.executescript(batch)
+        self._anchor.commit()
+
+    def _run(self, sql: str, params: Sequence, fetch: Callable, commit: bool = False):
+        # sqlite3 takes parameters as one sequence rather than varargs
+        return super()._run(sql, (params,), fetch, commit)
+
+    def fetch_all(self) -> List[Tuple]:
+        return self.query(f"SELECT {ELEMENT_COLUMNS} FROM Elements ORDER BY AtomicNumber")
+
+    def fetch_by_number(self, atomic_number: int) -> Optional[Tuple]:
+        return self._fetch_one(
+            f"SELECT {ELEMENT_COLUMNS} FROM Elements WHERE AtomicNumber = ?", atomic_number
+        )
+
+    def fetch_by_symbol(self, symbol: str) -> Optional[Tuple]:
+        # SQL Server compares with a case-insensitive collation
+        return self._fetch_one(
+            f"SELECT {ELEMENT_COLUMNS} FROM Elements WHERE Symbol = ? COLLATE NOCASE", symbol
+        )
+
+    def fetch_by_block(self, block: str) -> List[Tuple]:
+        return self.query(
+            f"SELECT {ELEMENT_COLUMNS} FROM Elements WHERE Block = ? COLLATE NOCASE "
+            "ORDER BY AtomicNumber",
+            block,
+        )
+
+    def fetch_by_period(self, period: int) -> List[Tuple]:
+        return self.query(
+            f"SELECT {ELEMENT_COLUMNS} FROM Elements WHERE Period = ? ORDER BY AtomicNumber",
+            period,
+        )
+
+    def fetch_by_group(self, group_number: int) -> List[Tuple]:
+        return self.query(
+            f"SELECT {ELEMENT_COLUMNS} FROM Elements WHERE GroupNumber = ? ORDER BY Period",
+            group_number,
+        )
+
+    def fetch_by_number_range(self, low: int, high: int) -> List[Tuple]:
+        return self.query(
+            f"SELECT {ELEMENT_COLUMNS} FROM Elements WHERE AtomicNumber BETWEEN ? AND ? "
+            "ORDER BY AtomicNumber",
+            low, high,
+        )
+
+    def _fetch_in(self, column: str, keys: List, collate: str = "") -> List[Tuple]:
+        rows = []
+        for start in range(0, len(keys), self.MAX_IN_PARAMETERS):
+            chunk = keys[start:start + self.MAX_IN_PARAMETERS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(self.query(
+                f"SELECT {ELEMENT_COLUMNS} FROM Elements "
+                f"WHERE {column}{collate} IN ({placeholders}) ORDER BY AtomicNumber",
+                *chunk,
+            ))
+        return rows
+
+    def fetch_by_numbers(self, atomic_numbers: Sequence[int]) -> List[Tuple]:
+        return self._fetch_in("AtomicNumber", list(set(atomic_numbers)))
+
+    def fetch_by_symbols(self, symbols: Sequence[str]) -> List[Tuple]:
+        keys = list({symbol.strip().lower() for symbol in symbols})
+        return self._fetch_in("Symbol", keys, collate=" COLLATE NOCASE")
+
+    def fetch_statistics(self) -> List[Tuple]:
+        # SQLite has neither GROUPING SETS nor STDEV, so union the groupings
+        # and derive the sample deviation from the sum of squares
+        aggregates = (
+            "COUNT(*), MIN(AtomicMass), MAX(AtomicMass), "
+            "AVG(AtomicMass), SUM(AtomicMass * AtomicMass)"
+        )
+        rows = self.query(
+            f"SELECT 'block', Block, {aggregates} FROM Elements GROUP BY Block "
+            f"UNION ALL SELECT 'period', Period, {aggregates} FROM Elements GROUP BY Period "
+            f"UNION ALL SELECT 'group', GroupNumber, {aggregates} FROM Elements GROUP BY GroupNumber "
+            f"UNION ALL SELECT 'all', NULL, {aggregates} FROM Elements"
+        )
+        return [
+            (dimension, key, count, minimum, maximum, mean,
+             _sample_stddev(count, mean, sum_of_squares))
+            for dimension, key, count, minimum, maximum, mean, sum_of_squares in rows
+        ]
+
+    def fetch_changes(self, since_version: int) -> List[Tuple]:
+        return self.query(CHANGES_QUERY, since_version)
+
+    def upsert_elements(self, rows: Sequence[Tuple]) -> int:
+        if not rows:
+            return 0
+        self._call(lambda cursor: cursor.executemany(SQLITE_UPSERT, rows), commit=True)
+        return len(rows)
+
+    def close(self):
+        super().close()
+        self._anchor.close()
+
+
+BACKENDS = {
+    PyodbcBackend.name: PyodbcBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+# Backends in their own modules, imported on first use: name -> (module, class)
+LAZY_BACKENDS = {
+    "snapshot": ("snapshot", "SnapshotBackend"),
+}
+
+
+def create_backend(name: Optional[str] = None, **kwargs) -> StorageBackend:
+    """Create a backend by name, defaulting to $PERIODIC_TABLE_BACKEND or SQL Server"""
+    name = (name or os.environ.get("PERIODIC_TABLE_BACKEND") or PyodbcBackend.name).lower()
+    if name in LAZY_BACKENDS:
+        module_name, class_name = LAZY_BACKENDS[name]
+        backend_cls = getattr(importlib.import_module(module_name), class_name)
+    else:
+        try:
+            backend_cls = BACKENDS[name]
+        except KeyError:
+            names = sorted(set(BACKENDS) | set(LAZY_BACKENDS))
+            raise BackendError(
+                f"Unknown backend '{name}', expected one of: {', '.join(names)}"
+            ) from None
+    if (issubclass(backend_cls, PooledBackend) and "pool_size" not in kwargs
+            and os.environ.get("PERIODIC_TABLE_POOL_SIZE")):
+        kwargs["pool_size"] = int(os.environ["PERIODIC_TABLE_POOL_SIZE"])
+    return backend_cls(**kwargs)
@@ -0,0 +1,63 @@
+from typing import List, NamedTuple, Optional
+
+from backends import MissingObjectError, StorageBackend
+from element import Element
+from element_index import ElementIndex
+
+
+class ChangeSet(NamedTuple):
+    """Elements changed or removed since the previous poll"""
+    changed: List[Element]
+    removed: List[int]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+NO_CHANGES = ChangeSet([], [])
+
+
+class ChangeTracker:
+    """Keeps an ElementIndex in step with the ElementChanges log
+
+    mark() records the log's current version just before a full load;
+    poll() then fetches only the elements changed after the last version
+    it saw and patches them into the index. On a database without the
+    log (see dbQueries/migrations/000_change_tracking.sql) the version
+    stays None and every change waits for the next full reload.
+    """
+
+    def __init__(self, index: ElementIndex):
+        self.index = index
+        self.version: Optional[int] = None
+
+    def mark(self, backend: StorageBackend):
+        """Remember the current version; call before loading every element"""
+        try:
+            self.version = backend.fetch_change_version()
+        except MissingObjectError:
+            self.version = None
+
+    def poll(self, backend: StorageBackend) -> ChangeSet:
+        """Apply elements changed since the last mark or poll to the index"""
+        if self.version is None or not self.index.loaded:
+            # The index will be loaded in full, which is as fresh as it gets
+            return NO_CHANGES
+        try:
+            rows = backend.fetch_changes(self.version)
+        except MissingObjectError:
+            # The log was dropped since mark(); stop polling until the next load
+            self.version = None
+            return NO_CHANGES
+        if not rows:
+            return NO_CHANGES
+
+        changed, removed = [], []
+        for row in rows:
+            if row[2] is None:
+                removed.append(row[1])
+            else:
+                changed.append(Element.from_row(row[1:]))
+        self.index.apply_changes(changed, removed)
+        self.version = max(self.version, rows[-1][0])
+        return ChangeSet(changed, removed)
@@ -1,71 +1,270 @@
-import pyodbc
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator, TextIO, Tuple
+import argparse
+import csv
+import io
+import json
 import os
+import sys
+from itertools import islice
+import electron_config
+import metrics
+from backends import BackendError, StorageBackend, create_backend
+from change_tracker import ChangeSet, ChangeTracker
+from element import FIELDS, Element
+from element_index import ElementIndex
+from element_stats import build_statistics
 
 class PeriodicTableSystem:
-    def __init__(self):
-        """Initialize database connection"""
-        # Update these connection details according to your SQL Server setup
-        self.conn_str = (
-            "Driver={SQL Server};"
-            "Server=localhost;"
-            "Database=PeriodicTableDB;"
-            "Trusted_Connection=yes;"
-        )
-        self.conn = pyodbc.connect(self.conn_str)
-        self.cursor = self.conn.cursor()
-
-    def get_element_by_number(self, atomic_number: int) -> Optional[Dict]:
+    def __init__(self, backend: Optional[StorageBackend] = None,
+                 use_index: Optional[bool] = None):
+        """Initialize database connection and warm the element index"""
+        # Defaults to SQL Server; set PERIODIC_TABLE_BACKEND=sqlite to run locally
+        self.backend = backend or create_backend()
+
+        # Elements rarely change, so serve lookups from memory unless the
+        # backend already does (use_index=None lets the backend decide)
+        if use_index is None:
+            use_index = not self.backend.serves_from_memory
+        self.use_index = use_index
+        self.index = ElementIndex(self._load_all_elements)
+        self.changes = ChangeTracker(self.index)
+        self._statistics: Optional[Dict] = None
+        # No-op unless metrics.install()/enable() ran first
+        metrics.instrument(self)
+        if use_index:
+            self.index.refresh()
+
+    def _load_all_elements(self) -> List[Element]:
+        """Fetch every element from the database"""
+        self.changes.mark(self.backend)
+        return Element.from_rows(self.backend.fetch_all())
+
+    def get_all_elements(self) -> List[Element]:
+        """Get all elements ordered by atomic number"""
+        if self.use_index:
+            return self.index.all()
+        return self._load_all_elements()
+
+    def get_element_by_number(self, atomic_number: int) -> Optional[Element]:
         """Get element details by atomic number using stored procedure"""
-        self.cursor.execute("EXEC GetElementByNumber ?", atomic_number)
-        return self._fetch_element_dict()
+        if self.use_index:
+            return self.index.by_number(atomic_number)
+        return Element.from_optional_row(self.backend.fetch_by_number(atomic_number))
 
-    def get_element_by_symbol(self, symbol: str) -> Optional[Dict]:
+    def get_element_by_symbol(self, symbol: str) -> Optional[Element]:
         """Get element details by symbol using stored procedure"""
-        self.cursor.execute("EXEC GetElementBySymbol ?", symbol)
-        return self._fetch_element_dict()
+        if self.use_index:
+            return self.index.by_symbol(symbol)
+        return Element.from_optional_row(self.backend.fetch_by_symbol(symbol))
+
+    def get_elements_by_numbers(self, atomic_numbers: List[int]) -> List[Optional[Element]]:
+        """Get many elements in one query; misses come back as None in request order"""
+        if self.use_index:
+            return self.index.by_numbers(atomic_numbers)
+        found = {
+            element.atomic_number: element
+            for element in Element.from_rows(self.backend.fetch_by_numbers(atomic_numbers))
+        }
+        return [found.get(number) for number in atomic_numbers]
+
+    def get_elements_by_symbols(self, symbols: List[str]) -> List[Optional[Element]]:
+        """Get many elements in one query; misses come back as None in request order"""
+        if self.use_index:
+            return self.index.by_symbols(symbols)
+        found = {
+            element.symbol.lower(): element
+            for element in Element.from_rows(self.backend.fetch_by_symbols(symbols))
+        }
+        return [found.get(symbol.strip().lower()) for symbol in symbols]
 
-    def get_elements_by_block(self, block: str) -> List[Dict]:
+    def get_elements_by_block(self, block: str) -> List[Element]:
         """Get all elements in a specific block using stored procedure"""
-        self.cursor.execute("EXEC GetElementsByBlock ?", block)
-        return self._fetch_all_elements()
+        if self.use_index:
+            return self.index.by_block(block)
+        return Element.from_rows(self.backend.fetch_by_block(block))
 
-    def get_elements_by_period(self, period: int) -> List[Dict]:
+    def get_elements_by_period(self, period: int) -> List[Element]:
         """Get all elements in a specific period using stored procedure"""
-        self.cursor.execute("EXEC GetElementsByPeriod ?", period)
-        return self._fetch_all_elements()
-
-    def _fetch_element_dict(self) -> Optional[Dict]:
-        """Convert a single row to dictionary"""
-        row = self.cursor.fetchone()
-        if not row:
-            return None
-        return self._row_to_dict(row)
-
-    def _fetch_all_elements(self) -> List[Dict]:
-        """Convert multiple rows to list of dictionaries"""
-        return [self._row_to_dict(row) for row in self.cursor.fetchall()]
-
-    def _row_to_dict(self, row) -> Dict:
-        """Convert a row to a dictionary"""
-        return {
-            "atomic_number": row[0],
-            "symbol": row[1],
-            "name": row[2],
-            "atomic_mass": float(row[3]),
-            "block": row[4],
-            "group_number": row[5],
-            "period": row[6],
-            "electron_configuration": row[7]
-        }
+        if self.use_index:
+            return self.index.by_period(period)
+        return Element.from_rows(self.backend.fetch_by_period(period))
+
+    def get_elements_by_group(self, group_number: int) -> List[Element]:
+        """Get all elements in a group ordered by period using stored procedure"""
+        if self.use_index:
+            return self.index.by_group(group_number)
+        return Element.from_rows(self.backend.fetch_by_group(group_number))
+
+    def get_elements_by_number_range(self, low: int, high: int) -> List[Element]:
+        """Get the elements with atomic numbers from low to high inclusive"""
+        if self.use_index:
+            return self.index.by_number_range(low, high)
+        return Element.from_rows(self.backend.fetch_by_number_range(low, high))
+
+    def search(self, query: str, limit: int = 10) -> List[Element]:
+        """Search names and symbols by prefix with typo tolerance, ranked best first"""
+        return self.index.search_index().search(query, limit)
+
+    def get_element_table(self):
+        """Return a columnar ElementTable for vectorized filters (requires NumPy)"""
+        return self.index.element_table()
+
+    def get_similar_elements(self, atomic_number: int, limit: int = 5,
+                             max_distance: Optional[float] = None) -> List[Tuple[Element, float]]:
+        """Get the elements most like one element with their distances, nearest first
+
+        With max_distance, every element within that distance is returned
+        instead of the nearest ``limit`` (requires NumPy).
+        """
+        return self.index.similar(atomic_number, limit, max_distance)
+
+    def get_similar_elements_many(self, atomic_numbers: List[int],
+                                  limit: int = 5) -> List[List[Tuple[Element, float]]]:
+        """get_similar_elements() for many elements in one vectorized pass"""
+        return self.index.similarity_index().nearest_many(atomic_numbers, limit)
+
+    def get_statistics(self) -> Dict:
+        """Get mass statistics per block, period and group from one cached query"""
+        stats = self._statistics
+        if stats is None:
+            stats = self._statistics = build_statistics(self.backend.fetch_statistics())
+        return stats
+
+    def poll_changes(self) -> ChangeSet:
+        """Patch elements changed since the last load or poll into the index"""
+        changes = self.changes.poll(self.backend)
+        if changes:
+            self._statistics = None
+        return changes
+
+    def refresh(self):
+        """Reload the element index after the Elements table changes"""
+        self._statistics = None
+        self.index.refresh()
 
     def close(self):
         """Close database connection"""
-        self.conn.close()
+        self.backend.close()
 
 def clear_screen():
     """Clear the console screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        # ANSI clear and home; no subprocess per redraw
+        print("\033[2J\033[H", end="", flush=True)
+
+# Batch query prefixes and how their keys are parsed
+FILTERS = {"block": str.lower, "period": int, "group": int}
+CSV_COLUMNS = ("query",) + tuple(FIELDS) + ("error",)
+
+def parse_query(text: str) -> Tuple[str, object]:
+    """Parse a batch query line into (kind, key); kind is 'invalid' if it cannot be parsed"""
+    kind, sep, value = text.partition(":")
+    if sep:
+        kind = kind.strip().lower()
+        if kind not in FILTERS:
+            return "invalid", f"Unknown filter '{kind}'"
+        try:
+            return kind, FILTERS[kind](value.strip())
+        except ValueError:
+            return "invalid", f"Invalid {kind}: {value.strip()!r}"
+    # isdecimal, not isdigit: int() rejects digits such as '²'
+    if text.isdecimal():
+        return "number", int(text)
+    return "symbol", text.lower()
+
+def iter_queries(lines: Iterable[str]) -> Iterator[str]:
+    """Yield non-blank, non-comment query lines"""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+class BatchWriter:
+    """Formats resolved batch queries, encoding each distinct answer once"""
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self._encoded: Dict[Tuple[str, object], str] = {}
+
+    def encode(self, query: str, parsed: Tuple[str, object], result) -> str:
+        """Return the output line(s) for one query"""
+        if self.fmt == "csv":
+            return self._csv(query, parsed, result)
+        # Everything but the echoed query is shared by repeats of the same key
+        body = self._encoded.get(parsed)
+        if body is None:
+            kind, key = parsed
+            if kind == "invalid":
+                payload = {"error": key}
+            elif kind in FILTERS:
+                payload = {"elements": [element.to_dict() for element in result]}
+            elif result is None:
+                payload = {"element": None, "error": "Element not found"}
+            else:
+                payload = {"element": result.to_dict()}
+            body = self._encoded[parsed] = json.dumps(payload, separators=(",", ":"))[1:]
+        return '{"query":' + json.dumps(query) + "," + body + "\n"
+
+    def _csv(self, query: str, parsed: Tuple[str, object], result) -> str:
+        body = self._encoded.get(parsed)
+        if body is None:
+            kind, key = parsed
+            if kind == "invalid":
+                rows = [[""] * len(FIELDS) + [key]]
+            elif kind in FILTERS:
+                # An empty filter still gets a row so every query is answered
+                rows = ([list(element.astuple()) + [""] for element in result]
+                        or [[""] * (len(FIELDS) + 1)])
+            elif result is None:
+                rows = [[""] * len(FIELDS) + ["Element not found"]]
+            else:
+                rows = [list(result.astuple()) + [""]]
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(rows)
+            body = self._encoded[parsed] = buffer.getvalue().splitlines(keepends=True)
+        if any(c in query for c in ',"\r\n'):
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="").writerow([query])
+            query = buffer.getvalue()
+        return "".join(query + "," + line for line in body)
+
+def run_batch(db: PeriodicTableSystem, lines: Iterable[str], out: TextIO,
+              fmt: str = "ndjson", batch_size: int = 1000) -> int:
+    """Resolve query lines in batches and write one result per query; returns the count"""
+    writer = BatchWriter(fmt)
+    if fmt == "csv":
+        out.write(",".join(CSV_COLUMNS) + "\n")
+    # Answers are reused for repeated keys across the whole run
+    answers: Dict[Tuple[str, object], object] = {}
+    queries = iter_queries(lines)
+    count = 0
+    while True:
+        batch = list(islice(queries, batch_size))
+        if not batch:
+            break
+        parsed = [parse_query(query) for query in batch]
+        numbers = list({key for kind, key in parsed
+                        if kind == "number" and ("number", key) not in answers})
+        symbols = list({key for kind, key in parsed
+                        if kind == "symbol" and ("symbol", key) not in answers})
+        # One round trip each for all new numbers and symbols in the batch
+        if numbers:
+            answers.update(zip((("number", n) for n in numbers),
+                               db.get_elements_by_numbers(numbers)))
+        if symbols:
+            answers.update(zip((("symbol", s) for s in symbols),
+                               db.get_elements_by_symbols(symbols)))
+        lookups = {"block": db.get_elements_by_block, "period": db.get_elements_by_period,
+                   "group": db.get_elements_by_group}
+        for item in parsed:
+            if item[0] in lookups and item not in answers:
+                answers[item] = lookups[item[0]](item[1])
+        out.write("".join(writer.encode(query, item, answers.get(item))
+                          for query, item in zip(batch, parsed)))
+        count += len(batch)
+    return count
 
 def display_menu():
     """Display the main menu"""
@@ -74,7 +273,8 @@ def display_menu():
     print("2. Search by Symbol")
     print("3. View elements by Block (s/p)")
     print("4. View elements by Period")
-    print("5. Exit")
+    print("5. Search by Name")
+    print("6. Exit")
     print("=======================================")
 
 def display_element(element: Dict):
@@ -92,16 +292,65 @@ def display_element(element: Dict):
     print(f"Group: {element['group_number']}")
     print(f"Period: {element['period']}")
     print(f"Electron Configuration: {element['electron_configuration']}")
+    derived = electron_config.describe(element)
+    if derived:
+        print(f"Full Configuration: {derived['full_configuration']}")
+        print(f"Valence Electrons: {derived['valence_electrons']}")
+        print(f"Unpaired Electrons: {derived['unpaired_electrons']}")
+        print(f"Electrons per Shell: {derived['electrons_per_shell']}")
     print("=====================")
 
-def main():
+def batch_main(args) -> int:
+    """Answer a stream of queries without the interactive menu"""
+    source = out = db = None
+    try:
+        source = open(args.batch, encoding="utf-8") if args.batch != "-" else sys.stdin
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        db = PeriodicTableSystem(use_index=False if args.no_index else None)
+        count = run_batch(db, source, out, args.format, args.batch_size)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head)
+        sys.stderr.close()
+        return 1
+    except OSError as e:
+        print(f"Batch failed: {str(e)}", file=sys.stderr)
+        return 1
+    except BackendError as e:
+        print(f"Database error: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if db is not None:
+            db.close()
+        if source not in (None, sys.stdin):
+            source.close()
+        if out not in (None, sys.stdout):
+            out.close()
+    if args.output:
+        print(f"Answered {count} queries", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Periodic Table Information System")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="answer queries from FILE (default: stdin) instead of the menu; "
+                             "one per line: 12, Na, block:s, period:3 or group:14")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--output", metavar="FILE", help="write results to FILE (default: stdout)")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="queries resolved per backend round trip")
+    parser.add_argument("--no-index", action="store_true",
+                        help="query the database instead of the in-memory index")
+    args = parser.parse_args(argv)
+    if args.batch is not None:
+        return batch_main(args)
+
     db = PeriodicTableSystem()
     
     while True:
         clear_screen()
         display_menu()
         
-        choice = input("\nEnter your choice (1-5): ")
+        choice = input("\nEnter your choice (1-6): ")
         
         if choice == '1':
             try:
@@ -137,14 +386,24 @@ def main():
                 print("\nPlease enter a valid number!")
 
         elif choice == '5':
+            query = input("\nEnter name or symbol (partial names are fine): ").strip()
+            elements = db.search(query)
+            if elements:
+                print(f"\n=== Matches for '{query}' ===")
+                for element in elements:
+                    print(f"{element['symbol']}: {element['name']}")
+            else:
+                print("\nNo matching elements found!")
+
+        elif choice == '6':
             print("\nThank you for using the Periodic Table Information System!")
             db.close()
             break
 
         else:
-            print("\nInvalid choice! Please enter a number between 1 and 5.")
+            print("\nInvalid choice! Please enter a number between 1 and 6.")
         
         input("\nPress Enter to continue...")
 
 if __name__ == "__main__":
-    main()1
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""Electron configurations: parsing, Aufbau generation and derived properties
+
+Configurations are parsed from the stored text ("[Ne] 3s1", "1s2 2s2 2p6",
+"[Xe] 4f14 5d10 6s2") or generated for any atomic number from the Madelung
+filling order plus the known ground-state exceptions. Both give a
+Configuration, which expands noble-gas shorthand, normalizes subshell order
+and derives valence electrons, unpaired electrons and shell occupancy.
+
+The generated configurations for elements 1-118 are computed once, and
+their derived properties are kept in tuples indexed by atomic number, so
+VALENCE_ELECTRONS[z] or SHELL_OCCUPANCY[z] is a plain index operation.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+MAX_ATOMIC_NUMBER = 118
+MAX_SHELL = 7
+
+ORBITAL_LETTERS = "spdf"
+SUBSHELL_CAPACITY = {"s": 2, "p": 6, "d": 10, "f": 14}
+
+# Madelung rule: fill by increasing n + l, then by increasing n
+FILLING_ORDER: Tuple[Tuple[int, str], ...] = tuple(sorted(
+    ((n, letter) for n in range(1, MAX_SHELL + 1)
+     for l, letter in enumerate(ORBITAL_LETTERS) if l < n),
+    key=lambda subshell: (subshell[0] + ORBITAL_LETTERS.index(subshell[1]), subshell[0]),
+))
+
+NOBLE_GASES = {"He": 2, "Ne": 10, "Ar": 18, "Kr": 36, "Xe": 54, "Rn": 86, "Og": 118}
+
+# Measured ground states that differ from the Madelung order
+EXCEPTIONS = {
+    24: "[Ar] 3d5 4s1",             # Cr
+    29: "[Ar] 3d10 4s1",            # Cu
+    41: "[Kr] 4d4 5s1",             # Nb
+    42: "[Kr] 4d5 5s1",             # Mo
+    44: "[Kr] 4d7 5s1",             # Ru
+    45: "[Kr] 4d8 5s1",             # Rh
+    46: "[Kr] 4d10",                # Pd
+    47: "[Kr] 4d10 5s1",            # Ag
+    57: "[Xe] 5d1 6s2",             # La
+    58: "[Xe] 4f1 5d1 6s2",         # Ce
+    64: "[Xe] 4f7 5d1 6s2",         # Gd
+    78: "[Xe] 4f14 5d9 6s1",        # Pt
+    79: "[Xe] 4f14 5d10 6s1",       # Au
+    89: "[Rn] 6d1 7s2",             # Ac
+    90: "[Rn] 6d2 7s2",             # Th
+    91: "[Rn] 5f2 6d1 7s2",         # Pa
+    92: "[Rn] 5f3 6d1 7s2",         # U
+    93: "[Rn] 5f4 6d1 7s2",         # Np
+    96: "[Rn] 5f7 6d1 7s2",         # Cm
+    103: "[Rn] 5f14 7s2 7p1",       # Lr
+}
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+_SUPERSCRIPT_RUN = re.compile("[⁰¹²³⁴⁵⁶⁷⁸⁹]+")
+_CONFIGURATION = re.compile(
+    r"\s*(?:\[(?P<core>[A-Z][a-z]?)\])?(?P<subshells>(?:\s*\d[spdf]\d{1,2})*)\s*")
+_SUBSHELL = re.compile(r"(\d)([spdf])(\d{1,2})")
+
+
+class ConfigurationError(ValueError):
+    """Raised for a configuration that cannot be parsed or is physically impossible"""
+
+
+class Configuration(NamedTuple):
+    """Ground-state occupancy as (shell, orbital letter, electrons), ordered by shell then l"""
+    subshells: Tuple[Tuple[int, str, int], ...]
+
+    @classmethod
+    def from_counts(cls, counts: Dict[Tuple[int, str], int]) -> "Configuration":
+        """Build a normalized configuration, dropping empty subshells"""
+        return cls(tuple(
+            (n, letter, counts[n, letter])
+            for n, letter in sorted(counts, key=lambda s: (s[0], ORBITAL_LETTERS.index(s[1])))
+            if counts[n, letter]
+        ))
+
+    def counts(self) -> Dict[Tuple[int, str], int]:
+        return {(n, letter): count for n, letter, count in self.subshells}
+
+    @property
+    def electrons(self) -> int:
+        return sum(count for _, _, count in self.subshells)
+
+    @property
+    def shell_occupancy(self) -> Tuple[int, ...]:
+        """Electrons in shells 1 to 7"""
+        shells = [0] * MAX_SHELL
+        for n, _, count in self.subshells:
+            shells[n - 1] += count
+        return tuple(shells)
+
+    @property
+    def outer_shell(self) -> int:
+        return max((n for n, _, _ in self.subshells), default=0)
+
+    @property
+    def period(self) -> int:
+        """The period this configuration implies: its outer shell, or the period after its
+        noble-gas core when no electron reaches a new shell (palladium, [Kr] 4d10, is in 5)
+        """
+        core = self.noble_gas_core
+        if core is None:
+            return self.outer_shell
+        return max(self.outer_shell, aufbau(NOBLE_GASES[core]).outer_shell + 1)
+
+    @property
+    def unpaired_electrons(self) -> int:
+        """Unpaired electrons by Hund's rule, one electron per orbital before pairing"""
+        unpaired = 0
+        for _, letter, count in self.subshells:
+            orbitals = SUBSHELL_CAPACITY[letter] // 2
+            unpaired += count if count <= orbitals else 2 * orbitals - count
+        return unpaired
+
+    @property
+    def noble_gas_core(self) -> Optional[str]:
+        """The largest noble gas whose configuration this one contains, excluding itself"""
+        counts = self.counts()
+        electrons = self.electrons
+        best = None
+        for symbol, atomic_number in NOBLE_GASES.items():
+            if atomic_number >= electrons:
+                break
+            if all(counts.get((n, letter), 0) == count
+                   for n, letter, count in aufbau(atomic_number).subshells):
+                best = symbol
+        return best
+
+    @property
+    def valence_electrons(self) -> int:
+        """Electrons outside the noble-gas core, not counting filled d or f subshells below
+        the outer p electrons (so the count follows the group: Fe 8, Zn 12, Ga 3, Ne 8)
+        """
+        core = self.noble_gas_core
+        core_counts = aufbau(NOBLE_GASES[core]).counts() if core else {}
+        outer_p = max((n for n, letter, _ in self.subshells if letter == "p"
+                       and (n, letter) not in core_counts), default=0)
+        valence = 0
+        for n, letter, count in self.subshells:
+            if (n, letter) in core_counts:
+                continue
+            full = count == SUBSHELL_CAPACITY[letter]
+            if full and (letter == "f" or (letter == "d" and n < outer_p)):
+                continue
+            valence += count
+        return valence
+
+    def to_string(self, shorthand: bool = True) -> str:
+        """Format as text, by default with the noble-gas core in brackets"""
+        core = self.noble_gas_core if shorthand else None
+        core_counts = aufbau(NOBLE_GASES[core]).counts() if core else {}
+        parts = [f"[{core}]"] if core else []
+        parts.extend(f"{n}{letter}{count}" for n, letter, count in self.subshells
+                     if (n, letter) not in core_counts)
+        return " ".join(parts)
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+
+@lru_cache(maxsize=None)
+def aufbau(atomic_number: int) -> Configuration:
+    """Ground-state configuration of a neutral atom, including the known exceptions"""
+    if not 1 <= atomic_number <= MAX_ATOMIC_NUMBER:
+        raise ConfigurationError(f"Atomic number {atomic_number} is out of range")
+    if atomic_number in EXCEPTIONS:
+        return parse_configuration(EXCEPTIONS[atomic_number])
+    counts = {}
+    remaining = atomic_number
+    for n, letter in FILLING_ORDER:
+        if remaining == 0:
+            break
+        counts[n, letter] = min(remaining, SUBSHELL_CAPACITY[letter])
+        remaining -= counts[n, letter]
+    return Configuration.from_counts(counts)
+
+
+@lru_cache(maxsize=1024)
+def parse_configuration(text: str) -> Configuration:
+    """Parse and expand a configuration such as '[Ne] 3s1' or '1s² 2s¹'"""
+    # A superscript count ends its subshell even without a space ('3d¹⁰4s²')
+    plain = _SUPERSCRIPT_RUN.sub(lambda m: m.group().translate(_SUPERSCRIPTS) + " ", text)
+    match = _CONFIGURATION.fullmatch(plain)
+    if not match or not (match.group("core") or match.group("subshells").strip()):
+        raise ConfigurationError(f"Malformed electron configuration '{text}'")
+    core = match.group("core")
+    if core is not None and core not in NOBLE_GASES:
+        raise ConfigurationError(f"Unknown noble gas core '[{core}]'")
+
+    counts = aufbau(NOBLE_GASES[core]).counts() if core else {}
+    for shell, letter, count in _SUBSHELL.findall(match.group("subshells")):
+        n, count = int(shell), int(count)
+        if ORBITAL_LETTERS.index(letter) >= n:
+            raise ConfigurationError(f"Shell {n} has no {letter} subshell")
+        if (n, letter) in counts:
+            raise ConfigurationError(f"Subshell {n}{letter} appears more than once")
+        if count > SUBSHELL_CAPACITY[letter]:
+            raise ConfigurationError(f"Subshell {n}{letter} cannot hold {count} electrons")
+        counts[n, letter] = count
+    return Configuration.from_counts(counts)
+
+
+def normalize(text: str) -> str:
+    """Rewrite a configuration in canonical shorthand ('1s2 2s2 2p6 3s1' -> '[Ne] 3s1')"""
+    return parse_configuration(text).to_string()
+
+
+# Precomputed for every element; index 0 is unused so the atomic number is the index
+CONFIGURATIONS: Tuple[Optional[Configuration], ...] = (None,) + tuple(
+    aufbau(z) for z in range(1, MAX_ATOMIC_NUMBER + 1))
+VALENCE_ELECTRONS: Tuple[int, ...] = (0,) + tuple(
+    c.valence_electrons for c in CONFIGURATIONS[1:])
+UNPAIRED_ELECTRONS: Tuple[int, ...] = (0,) + tuple(
+    c.unpaired_electrons for c in CONFIGURATIONS[1:])
+SHELL_OCCUPANCY: Tuple[Tuple[int, ...], ...] = ((0,) * MAX_SHELL,) + tuple(
+    c.shell_occupancy for c in CONFIGURATIONS[1:])
+SHORTHAND: Tuple[str, ...] = ("",) + tuple(c.to_string() for c in CONFIGURATIONS[1:])
+
+
+def configuration_of(element) -> Configuration:
+    """The configuration stored for an element, or the generated one if it cannot be parsed
+
+    Raises ConfigurationError when the stored text is unusable and the atomic
+    number is outside 1-118, so there is nothing to generate either.
+    """
+    try:
+        return parse_configuration(element["electron_configuration"])
+    except ConfigurationError:
+        # aufbau() checks the range; it is cached, so this is a lookup for 1-118
+        return aufbau(element["atomic_number"])
+
+
+def describe(element) -> Dict:
+    """Derived configuration properties for display, keyed like Element fields
+
+    Empty when the element has no usable configuration (see configuration_of).
+    """
+    try:
+        configuration = configuration_of(element)
+    except ConfigurationError:
+        return {}
+    return {
+        "full_configuration": configuration.to_string(shorthand=False),
+        "valence_electrons": configuration.valence_electrons,
+        "unpaired_electrons": configuration.unpaired_electrons,
+        "electrons_per_shell": "-".join(str(c) for c in configuration.shell_occupancy if c),
+    }
+
+
+def mismatches(elements) -> List[Tuple[int, str, str]]:
+    """(atomic number, stored, generated) for elements whose stored configuration differs
+
+    Elements outside 1-118 have no generated configuration and are skipped.
+    """
+    found = []
+    for element in elements:
+        atomic_number = element["atomic_number"]
+        if not 1 <= atomic_number <= MAX_ATOMIC_NUMBER:
+            continue
+        stored = element["electron_configuration"]
+        generated = CONFIGURATIONS[atomic_number]
+        try:
+            if parse_configuration(stored) == generated:
+                continue
+        except ConfigurationError:
+            pass
+        found.append((atomic_number, stored, generated.to_string()))
+    return found
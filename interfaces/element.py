@@ -0,0 +1,98 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FIELDS = (
+    "atomic_number",
+    "symbol",
+    "name",
+    "atomic_mass",
+    "block",
+    "group_number",
+    "period",
+    "electron_configuration",
+)
+
+
+class Element(Mapping):
+    """Immutable element record shared by every query that returns it
+
+    Records are interned per atomic number: building one from a row whose
+    values match the cached record returns the cached object. Attribute
+    access is the fast path; the Mapping interface keeps ``element['name']``
+    and ``element.get(...)`` working for code written against the old dicts.
+    """
+
+    __slots__ = FIELDS
+
+    _interned: Dict[int, "Element"] = {}
+
+    def __init__(self, atomic_number: int, symbol: str, name: str, atomic_mass: float,
+                 block: str, group_number: Optional[int], period: int,
+                 electron_configuration: str):
+        set_field = object.__setattr__
+        set_field(self, "atomic_number", atomic_number)
+        set_field(self, "symbol", symbol)
+        set_field(self, "name", name)
+        set_field(self, "atomic_mass", atomic_mass)
+        set_field(self, "block", block)
+        set_field(self, "group_number", group_number)
+        set_field(self, "period", period)
+        set_field(self, "electron_configuration", electron_configuration)
+
+    @classmethod
+    def from_row(cls, row) -> "Element":
+        """Build or reuse the record for a row in Elements column order"""
+        values = (row[0], row[1], row[2], float(row[3]), row[4], row[5], row[6], row[7])
+        cached = cls._interned.get(values[0])
+        if cached is not None and cached.astuple() == values:
+            return cached
+        element = cls(*values)
+        cls._interned[values[0]] = element
+        return element
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> List["Element"]:
+        """Build or reuse records for several rows"""
+        return [cls.from_row(row) for row in rows]
+
+    @classmethod
+    def from_optional_row(cls, row) -> Optional["Element"]:
+        """Build a record, passing through a missing row as None"""
+        if not row:
+            return None
+        return cls.from_row(row)
+
+    def astuple(self) -> Tuple:
+        """Return the field values in Elements column order"""
+        return (self.atomic_number, self.symbol, self.name, self.atomic_mass,
+                self.block, self.group_number, self.period, self.electron_configuration)
+
+    def to_dict(self) -> Dict:
+        """Return a plain, mutable dictionary copy"""
+        return dict(zip(FIELDS, self.astuple()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Element records are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Element records are immutable")
+
+    def __getitem__(self, key: str):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __hash__(self) -> int:
+        return hash(self.astuple())
+
+    def __reduce__(self):
+        return (self.__class__, self.astuple())
+
+    def __repr__(self) -> str:
+        return f"Element({self.atomic_number}, {self.symbol!r}, {self.name!r})"
@@ -0,0 +1,196 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from element import Element
+from search_index import SearchIndex
+
+
+class _IndexData:
+    """Immutable set of lookup maps built from one load of the Elements table"""
+    __slots__ = ("elements", "numbers", "by_number", "by_symbol", "by_block", "by_period",
+                 "by_group")
+
+    def __init__(self, elements: Iterable[Element]):
+        self.elements = tuple(sorted(elements, key=lambda e: e.atomic_number))
+        self.numbers = [element.atomic_number for element in self.elements]
+        self.by_number = {}
+        self.by_symbol = {}
+        by_block: Dict[str, List[Element]] = {}
+        by_period: Dict[int, List[Element]] = {}
+        by_group: Dict[int, List[Element]] = {}
+
+        for element in self.elements:
+            self.by_number[element.atomic_number] = element
+            self.by_symbol[element.symbol.lower()] = element
+            by_block.setdefault(element.block.lower(), []).append(element)
+            by_period.setdefault(element.period, []).append(element)
+            if element.group_number is not None:
+                by_group.setdefault(element.group_number, []).append(element)
+
+        self.by_block = {key: tuple(value) for key, value in by_block.items()}
+        self.by_period = {key: tuple(value) for key, value in by_period.items()}
+        self.by_group = {key: tuple(value) for key, value in by_group.items()}
+
+
+class ElementIndex:
+    """Warm, read-only in-memory index over the Elements table
+
+    The loader is called once to fetch every element; lookups are then served
+    from dictionaries without touching the database until refresh() or
+    invalidate() is called.
+    """
+
+    def __init__(self, loader: Callable[[], List[Element]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._data: Optional[_IndexData] = None
+        # Bumped whenever the contents may have changed, so dependent caches can tell
+        self.generation = 0
+        # Structures built from the contents, each with the generation it was built at
+        self._derived: Dict[str, Tuple[int, object]] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index currently holds data"""
+        return self._data is not None
+
+    def _swap(self, data: Optional[_IndexData]):
+        self._data = data
+        self.generation += 1
+
+    def refresh(self):
+        """Reload every element from the loader and swap in new maps"""
+        with self._lock:
+            self._swap(_IndexData(self._loader()))
+
+    def load(self, elements: Iterable[Element]):
+        """Seed the index with already-fetched elements instead of calling the loader"""
+        with self._lock:
+            self._swap(_IndexData(elements))
+
+    def apply_changes(self, changed: Iterable[Element], removed: Iterable[int] = ()):
+        """Swap in maps with some elements replaced or removed, without calling the loader"""
+        with self._lock:
+            if self._data is None:
+                # Nothing cached; the next lookup loads current data anyway
+                return
+            by_number = dict(self._data.by_number)
+            for atomic_number in removed:
+                by_number.pop(atomic_number, None)
+            for element in changed:
+                by_number[element.atomic_number] = element
+            self._swap(_IndexData(by_number.values()))
+
+    def invalidate(self):
+        """Drop the cached maps so the next lookup reloads them"""
+        with self._lock:
+            self._swap(None)
+
+    def _snapshot(self) -> _IndexData:
+        """Return the current maps, loading them on first use"""
+        data = self._data
+        if data is None:
+            with self._lock:
+                if self._data is None:
+                    self._swap(_IndexData(self._loader()))
+                data = self._data
+        return data
+
+    def _derive(self, name: str, build: Callable[[List[Element]], object]):
+        """Return build(elements) for the current contents, rebuilding when stale"""
+        elements = list(self._snapshot().elements)
+        generation = self.generation
+        cached = self._derived.get(name)
+        if cached is None or cached[0] != generation:
+            cached = self._derived[name] = (generation, build(elements))
+        return cached[1]
+
+    def is_derived(self, name: str) -> bool:
+        """Whether a derived structure is already built for the current contents"""
+        cached = self._derived.get(name)
+        return cached is not None and cached[0] == self.generation
+
+    def search_index(self) -> SearchIndex:
+        """Return a prefix/typo search index over the current elements"""
+        return self._derive("search", SearchIndex)
+
+    def element_table(self):
+        """Return a columnar ElementTable over the current elements (requires NumPy)"""
+        from element_table import ElementTable
+
+        return self._derive("table", ElementTable)
+
+    def similarity_index(self):
+        """Return a SimilarityIndex over the current elements (requires NumPy)"""
+        from similarity import SimilarityIndex
+
+        return self._derive("similarity", lambda elements: SimilarityIndex(self.element_table()))
+
+    def similar(self, atomic_number: int, limit: int = 5,
+                max_distance: Optional[float] = None) -> List[Tuple[Element, float]]:
+        """The elements most like one element with their distances, nearest first
+
+        With max_distance, every element within that distance is returned
+        instead of the nearest ``limit``.
+        """
+        index = self.similarity_index()
+        if max_distance is not None:
+            return index.within(atomic_number, max_distance)
+        return index.nearest(atomic_number, limit)
+
+    def by_number(self, atomic_number: int) -> Optional[Element]:
+        """Get an element by atomic number"""
+        return self._snapshot().by_number.get(atomic_number)
+
+    def by_symbol(self, symbol: str) -> Optional[Element]:
+        """Get an element by symbol, ignoring case"""
+        return self._snapshot().by_symbol.get(symbol.strip().lower())
+
+    def by_numbers(self, atomic_numbers: Iterable[int]) -> List[Optional[Element]]:
+        """Get elements in request order, with None for unknown numbers"""
+        get = self._snapshot().by_number.get
+        return [get(number) for number in atomic_numbers]
+
+    def by_symbols(self, symbols: Iterable[str]) -> List[Optional[Element]]:
+        """Get elements in request order, with None for unknown symbols"""
+        get = self._snapshot().by_symbol.get
+        return [get(symbol.strip().lower()) for symbol in symbols]
+
+    def by_block(self, block: str) -> List[Element]:
+        """Get all elements in a block ordered by atomic number"""
+        return list(self._snapshot().by_block.get(block.lower(), ()))
+
+    def by_period(self, period: int) -> List[Element]:
+        """Get all elements in a period ordered by atomic number"""
+        return list(self._snapshot().by_period.get(period, ()))
+
+    def by_group(self, group_number: int) -> List[Element]:
+        """Get all elements in a group ordered by atomic number"""
+        return list(self._snapshot().by_group.get(group_number, ()))
+
+    def by_number_range(self, low: int, high: int) -> List[Element]:
+        """Elements with atomic numbers in [low, high], in atomic-number order"""
+        data = self._snapshot()
+        start = bisect.bisect_left(data.numbers, low)
+        end = bisect.bisect_right(data.numbers, high)
+        return list(data.elements[start:end])
+
+    def all(self) -> List[Element]:
+        """Get every element ordered by atomic number"""
+        return list(self._snapshot().elements)
+
+    def blocks(self) -> List[str]:
+        """Get the block letters present in the table"""
+        return sorted(self._snapshot().by_block)
+
+    def periods(self) -> List[int]:
+        """Get the period numbers present in the table"""
+        return sorted(self._snapshot().by_period)
+
+    def groups(self) -> List[int]:
+        """Get the group numbers present in the table"""
+        return sorted(self._snapshot().by_group)
+
+    def __len__(self) -> int:
+        return len(self._snapshot().elements)
@@ -0,0 +1,50 @@
+from typing import Dict, Iterable, Tuple
+
+DIMENSIONS = {
+    "block": ("by_block", str),
+    "period": ("by_period", int),
+    "group": ("by_group", int),
+}
+
+
+def _mass_summary(count: int, minimum, maximum, mean, stddev) -> Dict:
+    return {
+        "count": count,
+        "min_atomic_mass": float(minimum) if minimum is not None else None,
+        "max_atomic_mass": float(maximum) if maximum is not None else None,
+        "avg_atomic_mass": float(mean) if mean is not None else None,
+        "stddev_atomic_mass": float(stddev) if stddev is not None else None,
+    }
+
+
+def build_statistics(rows: Iterable[Tuple]) -> Dict:
+    """Shape StorageBackend.fetch_statistics() rows into the statistics dictionary
+
+    Rows are (dimension, key, count, min, max, mean, stddev) where dimension
+    is 'block', 'period', 'group' or 'all'. The flat keys the GUI has always
+    returned (total_elements, <block>_block_count, avg_atomic_mass) are kept
+    alongside the per-dimension breakdowns.
+    """
+    stats = {
+        "total_elements": 0,
+        "s_block_count": 0,
+        "p_block_count": 0,
+        "avg_atomic_mass": 0.0,
+        "atomic_mass": _mass_summary(0, None, None, None, None),
+        "by_block": {},
+        "by_period": {},
+        "by_group": {},
+    }
+    for dimension, key, count, minimum, maximum, mean, stddev in rows:
+        summary = _mass_summary(count, minimum, maximum, mean, stddev)
+        if dimension == "all":
+            stats["total_elements"] = count
+            stats["avg_atomic_mass"] = summary["avg_atomic_mass"] or 0.0
+            stats["atomic_mass"] = summary
+            continue
+        name, convert = DIMENSIONS[dimension]
+        key = convert(key) if key is not None else None
+        stats[name][key] = summary
+        if dimension == "block":
+            stats[f"{key}_block_count"] = count
+    return stats
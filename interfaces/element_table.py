@@ -0,0 +1,140 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from element import Element
+from electron_config import SHELL_OCCUPANCY, UNPAIRED_ELECTRONS, VALENCE_ELECTRONS
+
+# Stored in group_number for elements without a group (NULL in the database)
+NO_GROUP = 0
+
+COLUMNS = ("atomic_number", "atomic_mass", "block", "group_number", "period",
+           "valence_electrons", "unpaired_electrons")
+
+# Derived configuration properties by atomic number, gathered per table
+_VALENCE = np.asarray(VALENCE_ELECTRONS, dtype=np.int16)
+_UNPAIRED = np.asarray(UNPAIRED_ELECTRONS, dtype=np.int16)
+_SHELLS = np.asarray(SHELL_OCCUPANCY, dtype=np.int16)
+
+
+class ElementTable:
+    """Columnar copy of the Elements table for vectorized filters and aggregates
+
+    Each numeric property is a NumPy array in atomic-number order, so a
+    filter is one array expression producing a boolean mask instead of a
+    Python loop over records. Masks combine with ``&``, ``|`` and ``~`` and
+    can be passed to select(), sort() and group_by().
+    """
+
+    def __init__(self, elements: Iterable[Element]):
+        self.elements = tuple(sorted(elements, key=lambda e: e.atomic_number))
+        self.atomic_number = np.fromiter(
+            (e.atomic_number for e in self.elements), dtype=np.int32, count=len(self.elements))
+        self.atomic_mass = np.fromiter(
+            (e.atomic_mass for e in self.elements), dtype=np.float64, count=len(self.elements))
+        self.block = np.array([e.block.lower() for e in self.elements], dtype="U1")
+        self.group_number = np.fromiter(
+            (e.group_number if e.group_number is not None else NO_GROUP for e in self.elements),
+            dtype=np.int16, count=len(self.elements))
+        self.period = np.fromiter(
+            (e.period for e in self.elements), dtype=np.int16, count=len(self.elements))
+        # From the generated ground-state configurations, not the stored text.
+        # Atomic numbers outside 1-118 read row 0, which is all zeros.
+        known = (self.atomic_number >= 1) & (self.atomic_number < len(_VALENCE))
+        rows = np.where(known, self.atomic_number, 0)
+        self.valence_electrons = _VALENCE[rows]
+        self.unpaired_electrons = _UNPAIRED[rows]
+        self.shell_occupancy = _SHELLS[rows]  # one row of 7 shells per element
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one of the column arrays by name"""
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown column '{name}', expected one of: {', '.join(COLUMNS)}")
+        return getattr(self, name)
+
+    def all(self) -> np.ndarray:
+        """Mask selecting every row"""
+        return np.ones(len(self.elements), dtype=bool)
+
+    def mass_between(self, low: float, high: float) -> np.ndarray:
+        """Mask of elements whose atomic mass is within [low, high]"""
+        return (self.atomic_mass >= low) & (self.atomic_mass <= high)
+
+    def number_between(self, low: int, high: int) -> np.ndarray:
+        """Mask of elements whose atomic number is within [low, high]"""
+        return (self.atomic_number >= low) & (self.atomic_number <= high)
+
+    def period_in(self, periods: Sequence[int]) -> np.ndarray:
+        """Mask of elements in any of the given periods"""
+        return np.isin(self.period, np.asarray(periods, dtype=np.int16))
+
+    def group_in(self, groups: Sequence[int]) -> np.ndarray:
+        """Mask of elements in any of the given groups"""
+        return np.isin(self.group_number, np.asarray(groups, dtype=np.int16))
+
+    def block_is(self, block: str) -> np.ndarray:
+        """Mask of elements in a block"""
+        return self.block == block.lower()
+
+    def valence_in(self, counts: Sequence[int]) -> np.ndarray:
+        """Mask of elements with any of the given valence electron counts"""
+        return np.isin(self.valence_electrons, np.asarray(counts, dtype=np.int16))
+
+    def paramagnetic(self) -> np.ndarray:
+        """Mask of elements with unpaired electrons in the ground state"""
+        return self.unpaired_electrons > 0
+
+    def count(self, mask: np.ndarray) -> int:
+        """Number of rows selected by a mask"""
+        return int(np.count_nonzero(mask))
+
+    def select(self, mask: np.ndarray) -> List[Element]:
+        """Elements selected by a mask, in atomic-number order"""
+        return [self.elements[i] for i in np.flatnonzero(mask)]
+
+    def sort(self, by: str, descending: bool = False,
+             mask: Optional[np.ndarray] = None) -> List[Element]:
+        """Elements ordered by a column, optionally restricted to a mask"""
+        rows = np.flatnonzero(mask) if mask is not None else np.arange(len(self.elements))
+        order = np.argsort(self.column(by)[rows], kind="stable")
+        if descending:
+            order = order[::-1]
+        return [self.elements[i] for i in rows[order]]
+
+    def group_by(self, key: str, value: str = "atomic_mass",
+                 mask: Optional[np.ndarray] = None) -> Dict:
+        """Count, min, max, mean and sample stddev of a column per distinct key"""
+        keys = self.column(key)
+        values = self.column(value).astype(np.float64)
+        if mask is not None:
+            keys, values = keys[mask], values[mask]
+        if len(keys) == 0:
+            return {}
+
+        unique, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=values)
+        squares = np.bincount(inverse, weights=values * values)
+        means = sums / counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variances = np.where(
+                counts > 1, (squares - counts * means * means) / (counts - 1), np.nan)
+        stddevs = np.sqrt(np.maximum(variances, 0.0))
+        minimums = np.full(len(unique), np.inf)
+        maximums = np.full(len(unique), -np.inf)
+        np.minimum.at(minimums, inverse, values)
+        np.maximum.at(maximums, inverse, values)
+
+        return {
+            unique[i].item(): {
+                "count": int(counts[i]),
+                "min": float(minimums[i]),
+                "max": float(maximums[i]),
+                "mean": float(means[i]),
+                "stddev": None if np.isnan(stddevs[i]) else float(stddevs[i]),
+            }
+            for i in range(len(unique))
+        }
@@ -0,0 +1,267 @@
+"""Chemical formula parser and bulk molar-mass calculator
+
+Usage:
+    python interfaces/formula.py [FILE] [--processes N]
+
+Reads one formula per line from FILE (or stdin) and writes
+"formula<TAB>molar mass" lines, or "formula<TAB>ERROR: message" for
+formulas that cannot be resolved.
+
+Supported syntax: element symbols with counts ("H2O"), nested groups in
+parentheses or brackets ("Ca3(PO4)2", "K4[Fe(CN)6]"), hydrates and adducts
+joined by ".", "*", "·" or "•" with optional leading multipliers
+("CuSO4·5H2O"), and ionic charges ("SO4^2-", "Fe^3+", "NH4+", "Fe+3",
+"[Fe(CN)6]4-"). Without "^", digits before a trailing sign are counts
+except directly after a closing "]". Charges are reported but do not
+change the molar mass.
+"""
+import argparse
+import re
+import sys
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+HYDRATE_SEPARATORS = re.compile(r"[.*·•]")
+_DIGITS = re.compile(r"\d+")
+# An element and its count, an opening bracket, a closing bracket and the
+# group's count, or any other single character (an error)
+_TOKEN = re.compile(r"([A-Z][a-z]?)(\d*)|([(\[{])|([)\]}])(\d*)|(.)")
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+
+
+class FormulaError(ValueError):
+    """Raised for formulas that cannot be parsed or resolved"""
+
+
+class ParsedFormula(NamedTuple):
+    """Element counts of a formula, sorted by symbol, plus its net charge"""
+    counts: Tuple[Tuple[str, int], ...]
+    charge: int
+
+
+class FormulaResult(NamedTuple):
+    """Outcome of one formula in a batch: a molar mass or an error message"""
+    formula: str
+    molar_mass: Optional[float]
+    error: Optional[str]
+
+
+def _split_charge(text: str) -> Tuple[str, int]:
+    """Separate a trailing charge annotation from a formula part"""
+    if "+" not in text and "-" not in text and "^" not in text:
+        return text, 0
+    if "^" in text:
+        body, _, charge = text.rpartition("^")
+        match = re.fullmatch(r"(\d*)([+-])|([+-])(\d*)", charge)
+        if not match:
+            raise FormulaError(f"Invalid charge '^{charge}'")
+        digits = match.group(1) if match.group(2) else match.group(4)
+        sign = match.group(2) or match.group(3)
+        magnitude = int(digits) if digits else 1
+        return body, magnitude if sign == "+" else -magnitude
+
+    match = re.search(r"([+-])(\d+)$", text)
+    if match:
+        magnitude = int(match.group(2))
+        return text[:match.start()], magnitude if match.group(1) == "+" else -magnitude
+
+    match = re.search(r"\](\d*)([+-])$", text)
+    if match:
+        magnitude = int(match.group(1)) if match.group(1) else 1
+        return text[:match.start() + 1], magnitude if match.group(2) == "+" else -magnitude
+
+    match = re.search(r"[+-]+$", text)
+    if match:
+        signs = match.group(0)
+        if len(set(signs)) > 1:
+            raise FormulaError(f"Mixed charge signs '{signs}'")
+        return text[:match.start()], len(signs) if signs[0] == "+" else -len(signs)
+
+    return text, 0
+
+
+def _parse_component(text: str, counts: Dict[str, int], multiplier: int):
+    """Add the element counts of one hydrate component into counts
+
+    Open groups are kept on an explicit stack rather than by recursion, so
+    nesting depth is limited only by memory. Each group collects its own
+    counts because its multiplier follows the closing bracket.
+    """
+    stack: List[Tuple[str, Dict[str, int]]] = []
+    local: Dict[str, int] = {}
+    # findall is much cheaper than finditer; positions are recovered only for errors
+    for token, (symbol, count, opener, closer, group_count, other) in enumerate(
+            _TOKEN.findall(text)):
+        if symbol:
+            local[symbol] = local.get(symbol, 0) + (int(count) if count else 1)
+        elif opener:
+            stack.append((_OPENERS[opener], local))
+            local = {}
+        elif closer:
+            if not stack or stack[-1][0] != closer:
+                raise FormulaError(
+                    f"Unbalanced '{closer}' at position {_token_position(text, token)}")
+            factor = int(group_count) if group_count else 1
+            _, outer = stack.pop()
+            for inner_symbol, inner_count in local.items():
+                outer[inner_symbol] = outer.get(inner_symbol, 0) + inner_count * factor
+            local = outer
+        else:
+            raise FormulaError(
+                f"Unexpected '{other}' at position {_token_position(text, token)}")
+    if stack:
+        raise FormulaError(f"Missing '{stack[-1][0]}'")
+    for symbol, count in local.items():
+        counts[symbol] = counts.get(symbol, 0) + count * multiplier
+
+
+def _token_position(text: str, token: int) -> int:
+    return next(islice(_TOKEN.finditer(text), token, None)).start()
+
+
+@lru_cache(maxsize=65536)
+def parse_formula(formula: str) -> ParsedFormula:
+    """Parse a formula into element counts and net charge"""
+    counts, charge = _parse_counts(formula)
+    return ParsedFormula(tuple(sorted(counts.items())), charge)
+
+
+def _parse_counts(formula: str) -> Tuple[Dict[str, int], int]:
+    """parse_formula() without sorting the counts, for callers that only sum them"""
+    text = "".join(formula.split())
+    if not text:
+        raise FormulaError("Empty formula")
+
+    counts: Dict[str, int] = {}
+    charge = 0
+    for part in HYDRATE_SEPARATORS.split(text):
+        if not part:
+            raise FormulaError("Empty component")
+        part, part_charge = _split_charge(part)
+        coefficient = _DIGITS.match(part)
+        multiplier = 1
+        if coefficient:
+            multiplier = int(coefficient.group(0))
+            part = part[coefficient.end():]
+        if not part:
+            raise FormulaError("Component has no elements")
+        _parse_component(part, counts, multiplier)
+        charge += part_charge * multiplier
+    return counts, charge
+
+
+class MolarMassCalculator:
+    """Resolves formulas against a precomputed symbol-to-mass table"""
+
+    def __init__(self, masses: Dict[str, float], cache_size: int = 65536):
+        self.masses = dict(masses)
+        self.cache_size = cache_size
+        self._cache: Dict[str, float] = {}
+
+    @classmethod
+    def from_elements(cls, elements: Iterable) -> "MolarMassCalculator":
+        """Build the mass table from Element records"""
+        return cls({element.symbol: element.atomic_mass for element in elements})
+
+    def molar_mass(self, formula: str) -> float:
+        """Molar mass of a formula in g/mol; raises FormulaError"""
+        mass = self._cache.get(formula)
+        if mass is not None:
+            return mass
+
+        masses = self.masses
+        mass = 0.0
+        for symbol, count in _parse_counts(formula)[0].items():
+            try:
+                mass += masses[symbol] * count
+            except KeyError:
+                raise FormulaError(f"Unknown element '{symbol}'") from None
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[formula] = mass
+        return mass
+
+    def calculate(self, formula: str) -> FormulaResult:
+        """Molar mass of one formula, reporting failures instead of raising"""
+        try:
+            return FormulaResult(formula, self.molar_mass(formula), None)
+        except FormulaError as e:
+            return FormulaResult(formula, None, str(e))
+
+    def calculate_many(self, formulas: Iterable[str], processes: int = 1,
+                       chunk_size: int = 10000) -> Iterator[FormulaResult]:
+        """Stream results for formulas in input order, optionally across a process pool"""
+        if processes <= 1:
+            for formula in formulas:
+                yield self.calculate(formula)
+            return
+
+        import multiprocessing
+
+        with multiprocessing.Pool(processes, initializer=_init_worker,
+                                  initargs=(self.masses,)) as pool:
+            for chunk in pool.imap(_calculate_chunk, _chunks(formulas, chunk_size)):
+                yield from chunk
+
+
+_worker_calculator: Optional[MolarMassCalculator] = None
+
+
+def _init_worker(masses: Dict[str, float]):
+    global _worker_calculator
+    _worker_calculator = MolarMassCalculator(masses)
+
+
+def _calculate_chunk(formulas: List[str]) -> List[FormulaResult]:
+    calculate = _worker_calculator.calculate
+    return [calculate(formula) for formula in formulas]
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_formulas(lines: Iterable[str]) -> Iterator[str]:
+    """Yield formulas from text lines, skipping blanks and '#' comments"""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute molar masses for a stream of formulas")
+    parser.add_argument("file", nargs="?", help="one formula per line (default: stdin)")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    from console import PeriodicTableSystem
+
+    system = PeriodicTableSystem()
+    calculator = MolarMassCalculator.from_elements(system.get_all_elements())
+    system.close()
+
+    source = open(args.file, encoding="utf-8") if args.file else sys.stdin
+    write = sys.stdout.write
+    try:
+        for result in calculator.calculate_many(iter_formulas(source), args.processes,
+                                                args.chunk_size):
+            if result.error is None:
+                write(f"{result.formula}\t{result.molar_mass:.4f}\n")
+            else:
+                write(f"{result.formula}\tERROR: {result.error}\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,25 @@
+import time
+_STARTED = time.perf_counter()
+
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pyodbc
-from typing import Optional, Dict, List
-from ttkthemes import ThemedTk
+from tkinter import messagebox
+from typing import Callable, Optional, Dict, List, Tuple
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import colorsys
-import json
-from datetime import datetime
+import electron_config
+import metrics
+from async_query import TkQueryRunner
+from backends import BackendError, StorageBackend, create_backend
+from change_tracker import NO_CHANGES, ChangeSet, ChangeTracker
+from element import Element
+from element_index import ElementIndex
+from element_stats import build_statistics
+from history import HistoryStore
+from startup_cache import load_snapshot, save_snapshot
+from widgets import ElementGrid, VirtualList
+
+# How often the GUI asks the database for elements changed by someone else
+CHANGE_POLL_INTERVAL_MS = 5000
 
 class PeriodicTableGUI:
     def __init__(self):
@@ -25,19 +37,71 @@ class PeriodicTableGUI:
         self.colors = {
             's': "#FF6B6B",  
             'p': "#4ECDC4",  
+            'd': "#FECA57",
+            'f': "#A29BFE",
             'background': "#2F3542",
             'text': "#FFFFFF",
             'highlight': "#A3CB38"
         }
         
-        # Initialize database
-        self.db = DatabaseManager()
+        # Database calls run on worker threads so the window never blocks
+        self.queries = TkQueryRunner(self.root, on_busy=self.set_busy)
+        
+        # Paint from the previous run's snapshot and connect in the background
+        self.db = DatabaseManager(connect=False)
+        self.db.error_handler = lambda title, message: self.queries.call_soon(
+            messagebox.showerror, title, message)
+        self.cached_elements = load_snapshot()
+        if self.cached_elements:
+            self.db.index.load(self.cached_elements)
+        
+        # Bounded search history, saved in the background across restarts
+        self.history = HistoryStore()
         
         # Create main interface
         self.create_interface()
         
-        # Initialize search history
-        self.search_history = []
+        self.first_frame_ms: Optional[float] = None
+        self.root.bind("<Map>", self.on_first_map, add="+")
+        self.queries.submit(self.db.connect, key="connect", on_success=self.on_connected)
+
+    def on_first_map(self, event):
+        """Record time-to-first-frame once the main window is painted"""
+        if event.widget is not self.root or self.first_frame_ms is not None:
+            return
+        self.first_frame_ms = (time.perf_counter() - _STARTED) * 1000
+        print(f"Time to first frame: {self.first_frame_ms:.0f} ms "
+              f"({'cached snapshot' if self.cached_elements else 'no snapshot'})")
+
+    def on_connected(self, connected: bool):
+        """Revalidate the cached snapshot against the database"""
+        if not connected:
+            return
+        elements = self.db.index.all() if self.db.index.loaded else []
+        if elements and elements != self.cached_elements:
+            if "Periodic Table" in self.built_tabs:
+                self.element_grid.set_elements(elements)
+            self.cached_elements = elements
+            # Snapshot writes touch the disk, so keep them off the Tk thread
+            self.queries.submit(save_snapshot, elements)
+        self.root.after(CHANGE_POLL_INTERVAL_MS, self.poll_changes)
+
+    def poll_changes(self):
+        """Fetch elements changed since the last poll and schedule the next one"""
+        self.root.after(CHANGE_POLL_INTERVAL_MS, self.poll_changes)
+        self.queries.submit(self.db.poll_changes, key="changes", on_success=self.apply_changes)
+
+    def apply_changes(self, changes: ChangeSet):
+        """Redraw only the grid cells whose elements changed"""
+        if not changes:
+            return
+        if "Periodic Table" in self.built_tabs:
+            for atomic_number in changes.removed:
+                self.element_grid.remove_element(atomic_number)
+            for element in changes.changed:
+                self.element_grid.update_element(element)
+        self.cached_elements = self.db.index.all()
+        self.queries.submit(save_snapshot, self.cached_elements)
 
     def create_interface(self):
         """Create the main interface with modern styling"""
@@ -51,10 +115,21 @@ class PeriodicTableGUI:
             text="Modern Periodic Table",
             font=("Helvetica", 28, "bold")
         )
-        title.pack(pady=20)
+        title.pack(pady=(20, 0))
+        
+        # Pending-query indicator
+        self.status_label = ctk.CTkLabel(
+            self.main_container,
+            text="",
+            font=("Helvetica", 12)
+        )
+        self.status_label.pack(pady=(0, 10))
         
         # Create tabview
-        self.tabview = ctk.CTkTabview(self.main_container)
+        self.tabview = ctk.CTkTabview(
+            self.main_container,
+            command=lambda: self.ensure_tab(self.tabview.get())
+        )
         self.tabview.pack(fill="both", expand=True)
         
         # Add tabs
@@ -63,11 +138,21 @@ class PeriodicTableGUI:
         self.info_tab = self.tabview.add("Element Info")
         self.history_tab = self.tabview.add("History")
         
-        # Set up each tab
-        self.setup_search_tab()
-        self.setup_table_tab()
-        self.setup_info_tab()
-        self.setup_history_tab()
+        # Tabs are built the first time they are shown
+        self.tab_builders = {
+            "Search": self.setup_search_tab,
+            "Periodic Table": self.setup_table_tab,
+            "Element Info": self.setup_info_tab,
+            "History": self.setup_history_tab
+        }
+        self.built_tabs = set()
+        self.ensure_tab(self.tabview.get())
+
+    def ensure_tab(self, name: str):
+        """Build a tab's widgets if it has not been shown before"""
+        if name not in self.built_tabs:
+            self.built_tabs.add(name)
+            self.tab_builders[name]()
 
     def setup_search_tab(self):
         """Set up the search interface"""
@@ -153,34 +238,71 @@ class PeriodicTableGUI:
             fg_color=self.colors['p'],
             font=("Helvetica", 12)
         ).pack(side="left", padx=10)
+        
+        # Search-as-you-type over names and symbols
+        name_frame = ctk.CTkFrame(search_frame)
+        name_frame.pack(fill="x", pady=10)
+        
+        ctk.CTkLabel(
+            name_frame,
+            text="Name or Symbol:",
+            font=("Helvetica", 14)
+        ).pack(side="left", padx=10)
+        
+        self.name_query_var = tk.StringVar()
+        ctk.CTkEntry(
+            name_frame,
+            textvariable=self.name_query_var,
+            width=240
+        ).pack(side="left", padx=10)
+        
+        self.name_results = VirtualList(
+            search_frame,
+            format_row=lambda e: f"{e.symbol} - {e.name}    Atomic Number: {e.atomic_number}",
+            row_height=32,
+            on_select=self.display_element,
+            bg=self.colors['background'],
+            fg=self.colors['text']
+        )
+        self.name_results.pack(fill="both", expand=True, pady=10)
+        self.name_query_var.trace_add("write", lambda *_: self.search_as_you_type())
+
+    def search_as_you_type(self):
+        """Refresh the live name/symbol matches on every keystroke"""
+        # Off the Tk thread: until the index has loaded, searching waits for
+        # the connection. Each keystroke supersedes the previous request.
+        self.queries.submit(
+            self.db.search,
+            self.name_query_var.get(),
+            key="name-search",
+            on_success=self.name_results.set_items
+        )
 
     def setup_table_tab(self):
         """Set up the periodic table visualization"""
         table_frame = ctk.CTkFrame(self.table_tab)
         table_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # Grid for periodic table
-        self.element_buttons = {}
-        elements = self.db.get_all_elements()
-        
-        for element in elements:
-            # Element button with custom styling
-            btn = ctk.CTkButton(
-                table_frame,
-                text=f"{element['symbol']}\n{element['atomic_number']}",
-                command=lambda e=element: self.display_element(e),
-                width=80,
-                height=80,
-                fg_color=self.colors[element['block']],
-                font=("Helvetica", 14, "bold")
-            )
-            
-            # Position button based on period and group
-            row = element['period'] - 1
-            col = element['group_number'] - 1 if element['group_number'] else 0
-            
-            btn.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
-            self.element_buttons[element['atomic_number']] = btn
+        # One canvas for the whole grid rather than a button per element
+        self.element_grid = ElementGrid(
+            table_frame,
+            colors=self.colors,
+            on_select=self.display_element
+        )
+        x_scroll = ctk.CTkScrollbar(
+            table_frame,
+            orientation="horizontal",
+            command=self.element_grid.xview
+        )
+        self.element_grid.configure(xscrollcommand=x_scroll.set)
+        x_scroll.pack(side="bottom", fill="x")
+        self.element_grid.pack(fill="both", expand=True)
+        
+        self.queries.submit(
+            self.db.get_all_elements,
+            key="table",
+            on_success=self.element_grid.set_elements
+        )
 
     def setup_info_tab(self):
         """Set up the element information display"""
@@ -190,18 +312,41 @@ class PeriodicTableGUI:
         # Labels for element details
         self.detail_labels = {}
         self.create_detail_labels()
+        
+        # Nearest neighbours of the displayed element; click one to show it
+        similar_frame = ctk.CTkFrame(self.info_frame)
+        similar_frame.pack(fill="both", expand=True, pady=10)
+        ctk.CTkLabel(
+            similar_frame,
+            text="Similar Elements",
+            font=("Helvetica", 16, "bold")
+        ).pack(anchor="w", padx=10, pady=5)
+        self.similar_list = VirtualList(
+            similar_frame,
+            format_row=lambda item: (f"{item[0].symbol} - {item[0].name}    "
+                                     f"Distance: {item[1]:.2f}"),
+            on_select=lambda item: self.display_element(item[0]),
+            bg=self.colors['background'],
+            fg=self.colors['text'],
+            font=("Helvetica", 12),
+            height=5 * 28
+        )
+        self.similar_list.pack(fill="both", expand=True, padx=20, pady=(0, 10))
 
     def setup_history_tab(self):
         """Set up the search history display"""
         history_frame = ctk.CTkFrame(self.history_tab)
         history_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # Create history list
-        self.history_list = ctk.CTkTextbox(
+        # Only the visible rows are drawn, newest first
+        self.history_list = VirtualList(
             history_frame,
+            bg=self.colors['background'],
+            fg=self.colors['text'],
             font=("Helvetica", 12)
         )
         self.history_list.pack(fill="both", expand=True)
+        self.history_list.set_items(self.history)
         
         # Add clear history button
         ctk.CTkButton(
@@ -217,7 +362,9 @@ class PeriodicTableGUI:
         details = [
             ("Basic Information", ["Name", "Symbol", "Atomic Number"]),
             ("Physical Properties", ["Atomic Mass", "Block"]),
-            ("Structure", ["Group", "Period", "Electron Configuration"])
+            ("Structure", ["Group", "Period", "Electron Configuration"]),
+            ("Electron Structure", ["Full Configuration", "Valence Electrons",
+                                    "Unpaired Electrons", "Electrons per Shell"])
         ]
         
         for section, fields in details:
@@ -256,52 +403,85 @@ class PeriodicTableGUI:
             return
         
         # Update labels
+        self.ensure_tab("Element Info")
+        details = dict(element, **electron_config.describe(element))
         for key, label in self.detail_labels.items():
-            value = element.get(key.lower().replace(" ", "_"), "")
+            value = details.get(key.lower().replace(" ", "_"), "")
             label.configure(text=str(value))
         
         # Switch to info tab
         self.tabview.set("Element Info")
         
+        # Similarity needs NumPy; without it the panel just stays empty
+        self.similar_list.set_items([])
+        self.queries.submit(
+            self.db.get_similar_elements, element['atomic_number'],
+            key="similar",
+            on_success=self.similar_list.set_items,
+            on_error=lambda error: None
+        )
+        
         # Add to history
         self.add_to_history(f"Viewed {element['symbol']}")
 
     def add_to_history(self, action: str):
         """Add action to history with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.history_list.insert("1.0", f"{timestamp}: {action}\n")
+        self.history.add(action)
+        if "History" in self.built_tabs:
+            self.history_list.redraw()
         
     def clear_history(self):
         """Clear search history"""
-        self.history_list.delete("1.0", tk.END)
+        self.history.clear()
+        self.history_list.set_items(self.history)
+
+    def set_busy(self, busy: bool):
+        """Show or clear the pending-query indicator"""
+        self.status_label.configure(text="Querying database..." if busy else "")
 
     def search_by_number(self):
         """Search element by atomic number"""
         try:
             number = int(self.atomic_number_var.get())
-            element = self.db.get_element_by_number(number)
-            self.display_element(element)
-            self.add_to_history(f"Searched atomic number: {number}")
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid atomic number!")
+            return
+        # A newer search supersedes this one if it is still running
+        self.queries.submit(
+            self.db.get_element_by_number, number,
+            key="search",
+            on_success=lambda element: self.show_search_result(
+                element, f"Searched atomic number: {number}")
+        )
 
     def search_by_symbol(self):
         """Search element by symbol"""
         symbol = self.symbol_var.get().strip()
         if symbol:
-            element = self.db.get_element_by_symbol(symbol)
-            self.display_element(element)
-            self.add_to_history(f"Searched symbol: {symbol}")
+            self.queries.submit(
+                self.db.get_element_by_symbol, symbol,
+                key="search",
+                on_success=lambda element: self.show_search_result(
+                    element, f"Searched symbol: {symbol}")
+            )
         else:
             messagebox.showerror("Error", "Please enter an element symbol!")
 
+    def show_search_result(self, element: Optional[Element], action: str):
+        """Display a finished search and record it"""
+        self.display_element(element)
+        self.add_to_history(action)
+
     def show_block_elements(self, block: str):
         """Display elements in specified block"""
-        elements = self.db.get_elements_by_block(block)
-        self.show_elements_list(f"Elements in {block.upper()}-Block", elements)
-        self.add_to_history(f"Viewed {block}-block elements")
+        def show(elements: List[Element]):
+            self.show_elements_list(f"Elements in {block.upper()}-Block", elements)
+            self.add_to_history(f"Viewed {block}-block elements")
 
-    def show_elements_list(self, title: str, elements: List[Dict]):
+        self.queries.submit(
+            self.db.get_elements_by_block, block, key="block-list", on_success=show)
+
+    def show_elements_list(self, title: str, elements: List[Element]):
         """Show list of elements in a modern popup window"""
         popup = ctk.CTkToplevel(self.root)
         popup.title(title)
@@ -311,161 +491,272 @@ class PeriodicTableGUI:
         popup.lift()  # Lifts the window to the top
         popup.focus_force()  # Forces focus on the popup window
         
-        # Create scrollable frame
-        frame = ctk.CTkScrollableFrame(popup)
-        frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Add elements
-        for element in elements:
-            element_frame = ctk.CTkFrame(frame)
-            element_frame.pack(fill="x", pady=5)
-            
-            ctk.CTkLabel(
-                element_frame,
-                text=f"{element['symbol']} - {element['name']}",
-                font=("Helvetica", 14, "bold")
-            ).pack(pady=5)
-            
-            ctk.CTkLabel(
-                element_frame,
-                text=f"Atomic Number: {element['atomic_number']}",
-                font=("Helvetica", 12)
-            ).pack()
+        # Only the rows in view are drawn, however long the list
+        element_list = VirtualList(
+            popup,
+            format_row=lambda e: f"{e.symbol} - {e.name}    Atomic Number: {e.atomic_number}",
+            row_height=36,
+            on_select=self.display_element,
+            bg=self.colors['background'],
+            fg=self.colors['text'],
+            font=("Helvetica", 14)
+        )
+        element_list.pack(fill="both", expand=True, padx=20, pady=20)
+        element_list.set_items(elements)
 
     def run(self):
         """Start the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.queries.shutdown()
+            self.history.close()
 
 class DatabaseManager:
-    def __init__(self):
-        """Initialize database connection"""
+    def __init__(self, backend: Optional[StorageBackend] = None, use_index: bool = True,
+                 connect: bool = True, connect_timeout: float = 30.0):
+        """Initialize database connection and warm the element index
+
+        With connect=False nothing touches the database until connect() is
+        called; queries issued before then wait for it on their own thread.
+        """
+        # Replaced by the GUI with a handler that is safe off the Tk thread
+        self.error_handler: Callable[[str, str], None] = messagebox.showerror
+        self.backend = backend
+        self.connect_timeout = connect_timeout
+        self._connected = threading.Event()
+
+        # Elements rarely change, so serve lookups from memory
+        self.use_index = use_index
+        self.index = ElementIndex(self._load_all_elements)
+        self.changes = ChangeTracker(self.index)
+        self._statistics: Optional[Dict] = None
+        # No-op unless metrics.install()/enable() ran first
+        metrics.instrument(self)
+
+        if connect:
+            try:
+                self._open_backend()
+            except BackendError as e:
+                messagebox.showerror("Database Error", 
+                                   f"Failed to connect to database: {str(e)}")
+                raise
+            if use_index:
+                self.refresh()
+
+    def _open_backend(self):
         try:
-            self.conn_str = (
-                "Driver={SQL Server};"
-                "Server=localhost;"
-                "Database=PeriodicTableDB;"
-                "Trusted_Connection=yes;"
-            )
-            self.conn = pyodbc.connect(self.conn_str)
-            self.cursor = self.conn.cursor()
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+            if self.backend is None:
+                # Defaults to SQL Server; set PERIODIC_TABLE_BACKEND=sqlite to run locally
+                self.backend = metrics.instrument_backend(create_backend())
+        finally:
+            self._connected.set()
+
+    def connect(self) -> bool:
+        """Open the backend and reload the index from it; returns False on failure"""
+        try:
+            self._open_backend()
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to connect to database: {str(e)}")
-            raise
+            return False
+        if self.use_index:
+            self.refresh()
+        return True
 
-    def get_all_elements(self) -> List[Dict]:
+    def _require_backend(self) -> StorageBackend:
+        """Return the backend, waiting for a background connect() if one is running"""
+        if not self._connected.wait(self.connect_timeout) or self.backend is None:
+            raise BackendError("Not connected to the database")
+        return self.backend
+
+    def _load_all_elements(self) -> List[Element]:
+        """Fetch every element from the database"""
+        backend = self._require_backend()
+        self.changes.mark(backend)
+        return Element.from_rows(backend.fetch_all())
+
+    def refresh(self):
+        """Reload the element index after the Elements table changes"""
+        self._statistics = None
+        try:
+            self.index.refresh()
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to load elements: {str(e)}")
+
+    def poll_changes(self) -> ChangeSet:
+        """Patch elements changed since the last load or poll into the index"""
+        try:
+            changes = self.changes.poll(self._require_backend())
+        except BackendError:
+            # Polls repeat every few seconds; the next one catches up silently
+            return NO_CHANGES
+        if changes:
+            self._statistics = None
+        return changes
+
+    def get_all_elements(self) -> List[Element]:
         """Get all elements from the database"""
         try:
-            self.cursor.execute("""
-                SELECT * FROM Elements 
-                ORDER BY AtomicNumber
-            """)
-            return self._fetch_all_elements()
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+            if self.use_index:
+                return self.index.all()
+            return self._load_all_elements()
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to fetch elements: {str(e)}")
             return []
 
-    def get_element_by_number(self, atomic_number: int) -> Optional[Dict]:
+    def get_element_by_number(self, atomic_number: int) -> Optional[Element]:
         """Get element details by atomic number"""
         try:
-            self.cursor.execute("EXEC GetElementByNumber ?", atomic_number)
-            return self._fetch_element_dict()
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+            if self.use_index:
+                return self.index.by_number(atomic_number)
+            return Element.from_optional_row(self._require_backend().fetch_by_number(atomic_number))
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to fetch element: {str(e)}")
             return None
 
-    def get_element_by_symbol(self, symbol: str) -> Optional[Dict]:
+    def get_element_by_symbol(self, symbol: str) -> Optional[Element]:
         """Get element details by symbol"""
         try:
-            self.cursor.execute("EXEC GetElementBySymbol ?", symbol)
-            return self._fetch_element_dict()
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+            if self.use_index:
+                return self.index.by_symbol(symbol)
+            return Element.from_optional_row(self._require_backend().fetch_by_symbol(symbol))
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to fetch element: {str(e)}")
             return None
 
-    def get_elements_by_block(self, block: str) -> List[Dict]:
+    def get_elements_by_numbers(self, atomic_numbers: List[int]) -> List[Optional[Element]]:
+        """Get many elements in one query; misses come back as None in request order"""
+        try:
+            if self.use_index:
+                return self.index.by_numbers(atomic_numbers)
+            found = {
+                element.atomic_number: element
+                for element in Element.from_rows(self._require_backend().fetch_by_numbers(atomic_numbers))
+            }
+            return [found.get(number) for number in atomic_numbers]
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to fetch elements: {str(e)}")
+            return [None] * len(atomic_numbers)
+
+    def get_elements_by_symbols(self, symbols: List[str]) -> List[Optional[Element]]:
+        """Get many elements in one query; misses come back as None in request order"""
+        try:
+            if self.use_index:
+                return self.index.by_symbols(symbols)
+            found = {
+                element.symbol.lower(): element
+                for element in Element.from_rows(self._require_backend().fetch_by_symbols(symbols))
+            }
+            return [found.get(symbol.strip().lower()) for symbol in symbols]
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to fetch elements: {str(e)}")
+            return [None] * len(symbols)
+
+    def get_elements_by_block(self, block: str) -> List[Element]:
         """Get all elements in a specific block"""
         try:
-            self.cursor.execute("EXEC GetElementsByBlock ?", block)
-            return self._fetch_all_elements()
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+            if self.use_index:
+                return self.index.by_block(block)
+            return Element.from_rows(self._require_backend().fetch_by_block(block))
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to fetch elements: {str(e)}")
             return []
 
-    def get_elements_by_period(self, period: int) -> List[Dict]:
+    def get_elements_by_period(self, period: int) -> List[Element]:
         """Get all elements in a specific period"""
         try:
-            self.cursor.execute("EXEC GetElementsByPeriod ?", period)
-            return self._fetch_all_elements()
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+            if self.use_index:
+                return self.index.by_period(period)
+            return Element.from_rows(self._require_backend().fetch_by_period(period))
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to fetch elements: {str(e)}")
             return []
 
+    def get_elements_by_group(self, group_number: int) -> List[Element]:
+        """Get all elements in a group ordered by period"""
+        try:
+            if self.use_index:
+                return self.index.by_group(group_number)
+            return Element.from_rows(self._require_backend().fetch_by_group(group_number))
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to fetch elements: {str(e)}")
+            return []
+
+    def get_elements_by_number_range(self, low: int, high: int) -> List[Element]:
+        """Get the elements with atomic numbers from low to high inclusive"""
+        try:
+            if self.use_index:
+                return self.index.by_number_range(low, high)
+            return Element.from_rows(self._require_backend().fetch_by_number_range(low, high))
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to fetch elements: {str(e)}")
+            return []
+
+    def search(self, query: str, limit: int = 10) -> List[Element]:
+        """Search names and symbols by prefix with typo tolerance, ranked best first"""
+        try:
+            return self.index.search_index().search(query, limit)
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to search elements: {str(e)}")
+            return []
+
+    def get_element_table(self):
+        """Return a columnar ElementTable for vectorized filters (requires NumPy)"""
+        return self.index.element_table()
+
+    def get_similar_elements(self, atomic_number: int, limit: int = 5,
+                             max_distance: Optional[float] = None) -> List[Tuple[Element, float]]:
+        """Get the elements most like one element with their distances, nearest first"""
+        try:
+            return self.index.similar(atomic_number, limit, max_distance)
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to load elements: {str(e)}")
+            return []
+
+    def get_similar_elements_many(self, atomic_numbers: List[int],
+                                  limit: int = 5) -> List[List[Tuple[Element, float]]]:
+        """get_similar_elements() for many elements in one vectorized pass"""
+        try:
+            return self.index.similarity_index().nearest_many(atomic_numbers, limit)
+        except BackendError as e:
+            self.error_handler("Database Error", 
+                               f"Failed to load elements: {str(e)}")
+            return [[] for _ in atomic_numbers]
+
     def get_statistics(self) -> Dict:
-        """Get statistical information about the elements"""
+        """Get mass statistics per block, period and group from one cached query"""
+        stats = self._statistics
+        if stats is not None:
+            return stats
         try:
-            stats = {}
-            
-            # Get total count
-            self.cursor.execute("SELECT COUNT(*) FROM Elements")
-            stats['total_elements'] = self.cursor.fetchone()[0]
-            
-            # Get block counts
-            self.cursor.execute("SELECT COUNT(*) FROM Elements WHERE Block = 's'")
-            stats['s_block_count'] = self.cursor.fetchone()[0]
-            
-            self.cursor.execute("SELECT COUNT(*) FROM Elements WHERE Block = 'p'")
-            stats['p_block_count'] = self.cursor.fetchone()[0]
-            
-            # Get average atomic mass
-            self.cursor.execute("SELECT AVG(AtomicMass) FROM Elements")
-            stats['avg_atomic_mass'] = float(self.cursor.fetchone()[0])
-            
+            stats = self._statistics = build_statistics(self._require_backend().fetch_statistics())
             return stats
-        except pyodbc.Error as e:
-            messagebox.showerror("Database Error", 
+        except BackendError as e:
+            self.error_handler("Database Error", 
                                f"Failed to fetch statistics: {str(e)}")
-            return {
-                'total_elements': 0,
-                's_block_count': 0,
-                'p_block_count': 0,
-                'avg_atomic_mass': 0.0
-            }
+            return build_statistics([])
 
-    def _fetch_element_dict(self) -> Optional[Dict]:
-        """Convert a single row to dictionary"""
-        row = self.cursor.fetchone()
-        if not row:
-            return None
-        return self._row_to_dict(row)
-
-    def _fetch_all_elements(self) -> List[Dict]:
-        """Convert multiple rows to list of dictionaries"""
-        return [self._row_to_dict(row) for row in self.cursor.fetchall()]
-
-    def _row_to_dict(self, row) -> Dict:
-        """Convert a row to a dictionary"""
-        return {
-            "atomic_number": row[0],
-            "symbol": row[1],
-            "name": row[2],
-            "atomic_mass": float(row[3]),
-            "block": row[4],
-            "group_number": row[5],
-            "period": row[6],
-            "electron_configuration": row[7]
-        }
+    def close(self):
+        """Close database connection"""
+        if getattr(self, 'backend', None) is not None:
+            self.backend.close()
 
     def __del__(self):
-        """Close database connection"""
         try:
-            if hasattr(self, 'conn'):
-                self.conn.close()
+            self.close()
         except:
             pass
 
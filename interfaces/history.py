@@ -0,0 +1,254 @@
+"""Bounded search history persisted in the background
+
+The store keeps the newest ``capacity`` entries in a ring buffer and is a
+read-only Sequence, newest first, so a VirtualList can show it without a
+copy. Adding an entry only touches memory; a writer thread appends pending
+entries to the history file in batches and trims it to the capacity.
+
+Set PERIODIC_TABLE_HISTORY to choose the file (a .db or .sqlite path uses
+SQLite, anything else newline-delimited JSON) and PERIODIC_TABLE_HISTORY_SIZE
+for the number of entries kept (default 1000).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional
+
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "periodic-table", "history.ndjson"
+)
+DEFAULT_CAPACITY = 1000
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+
+class HistoryEntry(NamedTuple):
+    timestamp: float
+    action: str
+
+    def __str__(self) -> str:
+        stamp = datetime.fromtimestamp(self.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{stamp}: {self.action}"
+
+
+class HistorySink:
+    """Where a HistoryStore persists its entries; only the writer thread calls append/clear"""
+
+    def load(self, limit: int) -> List[HistoryEntry]:
+        """Return up to limit of the newest entries, oldest first"""
+        raise NotImplementedError
+
+    def append(self, entries: List[HistoryEntry], keep: int):
+        """Append entries, keeping at least the newest ``keep`` in storage"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileHistorySink(HistorySink):
+    """One JSON array per line, appended to; rewritten once it holds twice the capacity"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lines: Optional[int] = None
+
+    def load(self, limit: int) -> List[HistoryEntry]:
+        entries = deque(maxlen=limit)
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        timestamp, action = json.loads(line)
+                        entries.append(HistoryEntry(float(timestamp), str(action)))
+                    except (ValueError, TypeError):
+                        continue  # torn write from a crash; skip it
+        except OSError:
+            pass
+        self._lines = lines
+        return list(entries)
+
+    def append(self, entries: List[HistoryEntry], keep: int):
+        if self._lines is None:
+            self.load(keep)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(list(entry), ensure_ascii=False) + "\n" for entry in entries)
+        self._lines += len(entries)
+        if self._lines > 2 * keep:
+            self._compact(keep)
+
+    def _compact(self, keep: int):
+        entries = self.load(keep)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(list(entry), ensure_ascii=False) + "\n" for entry in entries)
+        os.replace(temp_path, self.path)
+        self._lines = len(entries)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._lines = 0
+
+
+class SQLiteHistorySink(HistorySink):
+    """History rows in a SQLite table, trimmed to the capacity after each batch"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Loaded on the Tk thread, written on the writer thread; never concurrently
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS SearchHistory ("
+            "Id INTEGER PRIMARY KEY AUTOINCREMENT, Timestamp REAL NOT NULL, Action TEXT NOT NULL)")
+        self.conn.commit()
+
+    def load(self, limit: int) -> List[HistoryEntry]:
+        rows = self.conn.execute(
+            "SELECT Timestamp, Action FROM SearchHistory ORDER BY Id DESC LIMIT ?",
+            (limit,)).fetchall()
+        return [HistoryEntry(*row) for row in reversed(rows)]
+
+    def append(self, entries: List[HistoryEntry], keep: int):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO SearchHistory (Timestamp, Action) VALUES (?, ?)", entries)
+            self.conn.execute(
+                "DELETE FROM SearchHistory WHERE Id <= (SELECT MAX(Id) FROM SearchHistory) - ?",
+                (keep,))
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM SearchHistory")
+
+    def close(self):
+        self.conn.close()
+
+
+def open_sink(path: Optional[str] = None) -> HistorySink:
+    """Sink for a path (default $PERIODIC_TABLE_HISTORY), chosen by its extension"""
+    path = path or os.environ.get("PERIODIC_TABLE_HISTORY") or DEFAULT_HISTORY_PATH
+    if path.lower().endswith(SQLITE_EXTENSIONS):
+        return SQLiteHistorySink(path)
+    return FileHistorySink(path)
+
+
+class HistoryStore(Sequence):
+    """Ring buffer of the newest history entries, indexed newest first
+
+    Entries are loaded from the sink once; afterwards add() and clear() only
+    change memory and queue work for the writer thread, which flushes every
+    ``flush_interval`` seconds or as soon as ``batch_size`` entries are
+    pending. close() flushes whatever is left.
+    """
+
+    def __init__(self, sink: Optional[HistorySink] = None, capacity: Optional[int] = None,
+                 flush_interval: float = 2.0, batch_size: int = 50):
+        if capacity is None:
+            capacity = int(os.environ.get("PERIODIC_TABLE_HISTORY_SIZE", DEFAULT_CAPACITY))
+        self.capacity = capacity
+        self.sink = sink if sink is not None else open_sink()
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._entries = deque(self.sink.load(capacity), maxlen=capacity)
+        self._pending: List[HistoryEntry] = []
+        # clear() calls requested, and how many of them the sink has applied
+        self._clear_requests = 0
+        self._clears_applied = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._entries)))]
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("history index out of range")
+        return self._entries[-1 - index]
+
+    def add(self, action: str, timestamp: Optional[float] = None) -> HistoryEntry:
+        """Record an action; the oldest entry is dropped once the store is full"""
+        entry = HistoryEntry(time.time() if timestamp is None else timestamp, action)
+        with self._lock:
+            self._entries.append(entry)
+            self._pending.append(entry)
+            # Never queue more than the file will keep
+            if len(self._pending) > self.capacity:
+                del self._pending[:-self.capacity]
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+        return entry
+
+    def extend(self, actions: Iterable[str]):
+        for action in actions:
+            self.add(action)
+
+    def clear(self):
+        """Forget every entry, in memory now and on disk at the next flush"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._clear_requests += 1
+        self._wake.set()
+
+    def flush(self):
+        """Write pending entries now, on the calling thread"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            requested = self._clear_requests
+        # The sink is only used under this lock, so flushes never interleave
+        with self._flush_lock:
+            try:
+                if self._clears_applied < requested:
+                    self.sink.clear()
+                    # Only once it succeeded, so a failed clear is retried next flush
+                    self._clears_applied = requested
+                if pending:
+                    self.sink.append(pending, self.capacity)
+            except Exception:
+                # Put the batch back for the next attempt, unless it was cleared since
+                with self._lock:
+                    if self._clear_requests == requested:
+                        self._pending[:0] = pending
+                        del self._pending[:-self.capacity]
+                raise
+
+    def close(self):
+        """Stop the writer thread and persist everything still pending"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        self.sink.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except (OSError, sqlite3.Error):
+                # History is best effort; keep the kiosk running and retry later
+                pass
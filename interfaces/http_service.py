@@ -0,0 +1,316 @@
+"""HTTP/JSON query service in front of PeriodicTableSystem
+
+Usage:
+    python interfaces/http_service.py [--host 127.0.0.1] [--port 8080] [--workers N]
+                                      [--poll-interval SECONDS] [--metrics]
+
+Endpoints (GET or HEAD):
+    /elements                     all elements
+    /elements/number/<n>          one element by atomic number
+    /elements/symbol/<symbol>     one element by symbol
+    /elements/block/<block>       elements in a block
+    /elements/period/<period>     elements in a period
+    /elements/group/<group>       elements in a group
+    /statistics                   mass statistics per block, period and group
+    /metrics                      Prometheus text metrics (with --metrics)
+    /metrics.json                 the same metrics as JSON
+
+Responses carry an ETag; a request whose If-None-Match matches gets an empty
+304. With the element index, non-empty responses are kept in a bounded LRU
+cache until the index changes; the index follows database edits by polling
+the ElementChanges log. With --workers N the service forks N processes
+sharing the port via SO_REUSEPORT, each with its own connection pool.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+import metrics
+from backends import BackendError
+from console import PeriodicTableSystem
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_CACHED_RESPONSES = 1024
+
+
+def _text_key(text: str) -> str:
+    # Symbols and blocks are matched case-insensitively
+    return text.strip().lower()
+
+
+class Response:
+    """Encoded JSON (or plain text) response with its entity tag"""
+    __slots__ = ("status", "body", "etag", "content_type")
+
+    def __init__(self, status: int, payload, content_type: str = "application/json"):
+        self.status = status
+        self.content_type = content_type
+        if isinstance(payload, str) and content_type != "application/json":
+            self.body = payload.encode("utf-8")
+        else:
+            self.body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=8).hexdigest() + '"'
+
+
+class QueryService:
+    """Routes requests to PeriodicTableSystem and caches encoded responses
+
+    The cache is keyed by the canonical form of each path, holds at most
+    ``max_cached`` responses (least recently used go first) and only keeps
+    non-empty 200s, so made-up keys cannot grow it. Only the element index
+    tells the cache when data changes, so without one (--no-index, or a
+    backend that serves from memory) nothing is cached. resolve() runs on
+    executor threads, hence the lock.
+    """
+
+    def __init__(self, system: PeriodicTableSystem, max_cached: int = MAX_CACHED_RESPONSES):
+        self.system = system
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[str, Response]" = OrderedDict()
+        self._cache_generation = system.index.generation
+        self._lock = threading.Lock()
+        self.routes: Dict[str, Tuple[Callable[[str], object], Callable[[object], object]]] = {
+            "number": (int, system.get_element_by_number),
+            "symbol": (_text_key, system.get_element_by_symbol),
+            "block": (_text_key, system.get_elements_by_block),
+            "period": (int, system.get_elements_by_period),
+            "group": (int, system.get_elements_by_group),
+        }
+
+    def cache_key(self, path: str) -> Optional[str]:
+        """Canonical form of a data path ('/elements/number/007' -> '/elements/number/7'),
+        or None for paths that are never cached"""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["elements"] or parts == ["statistics"]:
+            return "/" + parts[0]
+        if len(parts) == 3 and parts[0] == "elements" and parts[1] in self.routes:
+            try:
+                return f"/elements/{parts[1]}/{self.routes[parts[1]][0](parts[2])}"
+            except ValueError:
+                return None
+        return None
+
+    def cached(self, path: str) -> Optional[Response]:
+        """Return the cached response for a path if the data has not changed since"""
+        if not self.system.use_index:
+            return None
+        key = self.cache_key(path)
+        if key is None:
+            return None
+        with self._lock:
+            generation = self.system.index.generation
+            if generation != self._cache_generation:
+                self._cache.clear()
+                self._cache_generation = generation
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+            return response
+
+    def resolve(self, path: str) -> Response:
+        """Build (and cache) the response for a path; may block on the database"""
+        if path == "/metrics":
+            return Response(200, metrics.registry.to_prometheus(),
+                            "text/plain; version=0.0.4; charset=utf-8")
+        if path == "/metrics.json":
+            return Response(200, metrics.registry.to_dict())
+        generation = self.system.index.generation
+        try:
+            response = self._build(path)
+        except BackendError as e:
+            return Response(500, {"error": f"Database error: {str(e)}"})
+        key = self.cache_key(path) if self.system.use_index else None
+        # Empty lists come from keys that match nothing; never worth keeping
+        if key is not None and response.status == 200 and response.body != b"[]":
+            with self._lock:
+                if generation == self._cache_generation == self.system.index.generation:
+                    self._cache[key] = response
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_cached:
+                        self._cache.popitem(last=False)
+        return response
+
+    def _build(self, path: str) -> Response:
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["elements"]:
+            return Response(200, [e.to_dict() for e in self.system.get_all_elements()])
+        if parts == ["statistics"]:
+            return Response(200, self.system.get_statistics())
+        if len(parts) == 3 and parts[0] == "elements" and parts[1] in self.routes:
+            convert, lookup = self.routes[parts[1]]
+            try:
+                key = convert(parts[2])
+            except ValueError:
+                return Response(400, {"error": f"Invalid {parts[1]}: {parts[2]!r}"})
+            result = lookup(key)
+            if result is None:
+                return Response(404, {"error": "Element not found"})
+            if isinstance(result, list):
+                return Response(200, [e.to_dict() for e in result])
+            return Response(200, result.to_dict())
+        return Response(404, {"error": f"No such endpoint: {path}"})
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """Read one request head; returns (method, path, version, headers) or None at EOF"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError("Request head too large")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method, target.split("?", 1)[0], version, headers
+
+
+def _encode(response: Response, keep_alive: bool, not_modified: bool, head_only: bool) -> bytes:
+    status = 304 if not_modified else response.status
+    body = b"" if not_modified or head_only else response.body
+    length = 0 if not_modified else len(response.body)
+    return (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: {response.content_type}\r\n"
+        f"Content-Length: {length}\r\n"
+        f"ETag: {response.etag}\r\n"
+        f"Cache-Control: no-cache\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def handle_connection(service: QueryService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+    """Serve requests on one keep-alive connection"""
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except ValueError:
+                writer.write(_encode(Response(400, {"error": "Bad request"}), False, False, False))
+                break
+            if request is None:
+                break
+            method, path, version, headers = request
+            keep_alive = (headers.get("connection", "").lower() != "close"
+                          and version == "HTTP/1.1")
+
+            if method not in ("GET", "HEAD"):
+                response = Response(405, {"error": "Only GET and HEAD are supported"})
+            else:
+                response = service.cached(path)
+                if response is None:
+                    # A miss may reach the database (a direct query, or the
+                    # statistics after a change), so keep it off the loop
+                    response = await loop.run_in_executor(None, service.resolve, path)
+
+            not_modified = (response.status == 200
+                            and headers.get("if-none-match") == response.etag)
+            writer.write(_encode(response, keep_alive, not_modified, method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def poll_changes(system: PeriodicTableSystem, interval: float):
+    """Patch database edits into the index every interval seconds"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await loop.run_in_executor(None, system.poll_changes)
+        except BackendError:
+            # Transient; the next poll picks up everything since the last version
+            pass
+
+
+async def serve(host: str, port: int, reuse_port: bool = False,
+                use_index: Optional[bool] = None, poll_interval: float = 5.0,
+                collect_metrics: bool = False):
+    """Run one service process until cancelled"""
+    if collect_metrics:
+        metrics.enable()
+    system = PeriodicTableSystem(use_index=use_index)
+    service = QueryService(system)
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w),
+        host, port, reuse_port=reuse_port, limit=MAX_HEADER_BYTES,
+    )
+    poller = None
+    if system.use_index and poll_interval > 0:
+        poller = asyncio.create_task(poll_changes(system, poll_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if poller is not None:
+            poller.cancel()
+        system.close()
+
+
+def _run_worker(host: str, port: int, reuse_port: bool, use_index: Optional[bool],
+                poll_interval: float, collect_metrics: bool):
+    try:
+        asyncio.run(serve(host, port, reuse_port, use_index, poll_interval, collect_metrics))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Periodic table HTTP/JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes sharing the port (requires SO_REUSEPORT)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="query the database on every cache miss")
+    parser.add_argument("--poll-interval", type=float, default=5.0,
+                        help="seconds between checks for changed elements (0 disables)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time data layer calls and serve them on /metrics")
+    args = parser.parse_args(argv)
+
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    use_index = False if args.no_index else None
+    if args.workers == 1:
+        _run_worker(args.host, args.port, False, use_index, args.poll_interval, args.metrics)
+        return
+
+    workers = [
+        multiprocessing.Process(
+            target=_run_worker,
+            args=(args.host, args.port, True, use_index, args.poll_interval, args.metrics),
+            daemon=True,
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Streaming bulk import of elements from CSV or JSON files
+
+Usage:
+    python interfaces/importer.py FILE [FILE ...] [--chunk-size 1000] [--dry-run]
+                                  [--sqlite PATH]
+
+CSV files need a header row; JSON files hold an array of objects and
+.ndjson/.jsonl files one object per line. Columns may use either the
+database names (AtomicNumber, GroupNumber, ...) or the Element field names
+(atomic_number, group_number, ...). Rows are validated as they stream in
+and written in chunks with one batched upsert per chunk; invalid rows are
+reported with their source position and skipped. Only Elements rows
+(atomic numbers 1-118) are imported; isotope and property datasets are not.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from backends import BackendError, StorageBackend, create_backend
+from electron_config import ConfigurationError, parse_configuration
+from element import FIELDS
+
+# Database column name -> Element field name
+COLUMN_FIELDS = {
+    "AtomicNumber": "atomic_number",
+    "Symbol": "symbol",
+    "Name": "name",
+    "AtomicMass": "atomic_mass",
+    "Block": "block",
+    "GroupNumber": "group_number",
+    "Period": "period",
+    "ElectronConfiguration": "electron_configuration",
+}
+
+# Groups each block may occupy; helium is the s-block element in group 18
+BLOCK_GROUPS = {
+    "s": set(range(1, 3)) | {18},
+    "p": set(range(13, 19)),
+    "d": set(range(3, 13)),
+    "f": {None, 3},
+}
+BLOCK_FIRST_PERIOD = {"s": 1, "p": 2, "d": 4, "f": 6}
+
+# Elements.Symbol and the SymbolList type are NVARCHAR(2)
+SYMBOL_PATTERN = re.compile(r"[A-Z][a-z]?")
+
+
+class ValidationError(ValueError):
+    """Raised for a source record that cannot be imported"""
+
+
+class MalformedRecord(NamedTuple):
+    """Stands in for a source line that could not be decoded; validate() rejects it"""
+    reason: str
+
+
+class ImportReport(NamedTuple):
+    """Outcome of an import run"""
+    read: int
+    written: int
+    errors: List[Tuple[str, str]]
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.seconds if self.seconds else float("inf")
+
+
+def _optional_int(value) -> Optional[int]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return int(value)
+
+
+class ElementValidator:
+    """Converts source records to Elements rows, checking them as they stream
+
+    Symbols and atomic numbers must be unique across everything validated
+    by one instance, so a single validator is used per import run. Pass the
+    (AtomicNumber, Symbol) pairs already stored so that a symbol taken by
+    another element is rejected here rather than failing its whole chunk.
+    """
+
+    def __init__(self, existing: Iterable[Tuple[int, str]] = ()):
+        self._symbols: Dict[str, int] = {}
+        self._numbers: Set[int] = set()
+        self._stored: Dict[str, int] = {symbol.lower(): number for number, symbol in existing}
+
+    def validate(self, record: Dict) -> Tuple:
+        """Return the row for a record or raise ValidationError"""
+        if isinstance(record, MalformedRecord):
+            raise ValidationError(record.reason)
+        if not isinstance(record, dict):
+            raise ValidationError(f"Expected an object, got {type(record).__name__}")
+        values = {COLUMN_FIELDS.get(key, key): value for key, value in record.items()}
+        missing = [f for f in FIELDS if f != "group_number" and values.get(f) in (None, "")]
+        if missing:
+            raise ValidationError(f"Missing {', '.join(missing)}")
+
+        try:
+            atomic_number = int(values["atomic_number"])
+            atomic_mass = float(values["atomic_mass"])
+            group_number = _optional_int(values.get("group_number"))
+            period = int(values["period"])
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid number: {str(e)}") from None
+        symbol = str(values["symbol"]).strip()
+        name = str(values["name"]).strip()
+        block = str(values["block"]).strip().lower()
+        configuration = " ".join(str(values["electron_configuration"]).split())
+
+        if not 1 <= atomic_number <= 118:
+            raise ValidationError(f"Atomic number {atomic_number} is out of range")
+        if not SYMBOL_PATTERN.fullmatch(symbol):
+            raise ValidationError(f"Invalid symbol '{symbol}'")
+        if not name or len(name) > 50:
+            raise ValidationError("Name must be 1 to 50 characters")
+        if atomic_mass <= 0:
+            raise ValidationError(f"Atomic mass {atomic_mass} must be positive")
+        if block not in BLOCK_GROUPS:
+            raise ValidationError(f"Unknown block '{block}'")
+        if not 1 <= period <= 7 or period < BLOCK_FIRST_PERIOD[block]:
+            raise ValidationError(f"Period {period} is not valid for the {block}-block")
+        if group_number not in BLOCK_GROUPS[block]:
+            raise ValidationError(f"Group {group_number} is not valid for the {block}-block")
+        try:
+            parsed = parse_configuration(configuration)
+        except ConfigurationError as e:
+            raise ValidationError(str(e)) from None
+        if parsed.period != period:
+            raise ValidationError(
+                f"Electron configuration '{configuration}' does not match period {period}")
+        electrons = parsed.electrons
+        if electrons != atomic_number:
+            raise ValidationError(
+                f"Electron configuration '{configuration}' has {electrons} electrons, "
+                f"expected {atomic_number}")
+
+        if atomic_number in self._numbers:
+            raise ValidationError(f"Element {atomic_number} appears more than once")
+        owner = self._symbols.get(symbol.lower())
+        stored = self._stored.get(symbol.lower())
+        # A stored owner re-imported earlier in this run has already been given its new symbol
+        if owner is None and stored not in (None, atomic_number) and stored not in self._numbers:
+            owner = stored
+        if owner is not None:
+            raise ValidationError(f"Symbol '{symbol}' is already used by element {owner}")
+        self._symbols[symbol.lower()] = atomic_number
+        self._numbers.add(atomic_number)
+
+        return (atomic_number, symbol, name, atomic_mass, block, group_number, period,
+                configuration)
+
+
+def read_records(path: str) -> Iterator[Tuple[str, Dict]]:
+    """Yield (position, record) pairs from a CSV, JSON or NDJSON file"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            # Line 1 is the header
+            for line, record in enumerate(csv.DictReader(f), 2):
+                yield f"{path}:{line}", record
+        elif extension in (".ndjson", ".jsonl"):
+            for line, text in enumerate(f, 1):
+                if text.strip():
+                    try:
+                        record = json.loads(text)
+                    except ValueError as e:
+                        record = MalformedRecord(f"Invalid JSON: {str(e)}")
+                    yield f"{path}:{line}", record
+        elif extension == ".json":
+            # The standard library has no incremental JSON parser; use NDJSON
+            # for sources too large to hold in memory
+            for item, record in enumerate(json.load(f)):
+                yield f"{path}[{item}]", record
+        else:
+            raise ValueError(f"Unsupported file type '{extension}', expected .csv, .json or .ndjson")
+
+
+def import_elements(backend: StorageBackend, records: Iterable[Tuple[str, Dict]],
+                    chunk_size: int = 1000, dry_run: bool = False) -> ImportReport:
+    """Validate and upsert records chunk by chunk; raises BackendError if a write fails"""
+    validator = ElementValidator(backend.query("SELECT AtomicNumber, Symbol FROM Elements"))
+    errors: List[Tuple[str, str]] = []
+    read = written = 0
+    start = time.perf_counter()
+
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        rows = []
+        for position, record in chunk:
+            try:
+                rows.append(validator.validate(record))
+            except ValidationError as e:
+                errors.append((position, str(e)))
+        read += len(chunk)
+        if rows and not dry_run:
+            written += backend.upsert_elements(rows)
+
+    return ImportReport(read, written, errors, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import elements from CSV or JSON")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="validate without writing")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="import into a SQLite database file instead of the default backend")
+    args = parser.parse_args(argv)
+
+    def records():
+        for path in args.files:
+            yield from read_records(path)
+
+    try:
+        backend = create_backend("sqlite", database=args.sqlite) if args.sqlite else create_backend()
+        try:
+            report = import_elements(backend, records(), args.chunk_size, args.dry_run)
+        finally:
+            backend.close()
+    except (BackendError, OSError, ValueError) as e:
+        print(f"Import failed: {str(e)}", file=sys.stderr)
+        return 1
+
+    for position, message in report.errors:
+        print(f"{position}: {message}", file=sys.stderr)
+    print(f"Read {report.read} rows, wrote {report.written}, rejected {len(report.errors)} "
+          f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Latency bucket upper bounds in seconds, from in-memory lookups to slow queries
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05,
+                   0.1, 0.5, 1.0, 5.0)
+
+slow_query_logger = logging.getLogger("periodic_table.slow_query")
+
+
+def _count_one(result) -> int:
+    return 0 if result is None else 1
+
+
+def _count_found(result) -> int:
+    return sum(1 for item in result if item is not None)
+
+
+def _count_changes(result) -> int:
+    return len(result.changed) + len(result.removed)
+
+
+# Query methods of PeriodicTableSystem and DatabaseManager: name -> (cache, row counter)
+SYSTEM_OPERATIONS: Dict[str, Tuple[Optional[str], Optional[Callable]]] = {
+    "get_all_elements": ("index", len),
+    "get_element_by_number": ("index", _count_one),
+    "get_element_by_symbol": ("index", _count_one),
+    "get_elements_by_numbers": ("index", _count_found),
+    "get_elements_by_symbols": ("index", _count_found),
+    "get_elements_by_block": ("index", len),
+    "get_elements_by_period": ("index", len),
+    "get_elements_by_group": ("index", len),
+    "get_elements_by_number_range": ("index", len),
+    "search": ("search_index", len),
+    "get_similar_elements": ("similarity", len),
+    "get_similar_elements_many": ("similarity", len),
+    "get_statistics": ("statistics", None),
+    "poll_changes": (None, _count_changes),
+    "refresh": (None, None),
+}
+
+# StorageBackend methods: name -> row counter. query() is left out because
+# the other methods call it internally.
+BACKEND_OPERATIONS: Dict[str, Optional[Callable]] = {
+    "fetch_all": len,
+    "fetch_by_number": _count_one,
+    "fetch_by_symbol": _count_one,
+    "fetch_by_block": len,
+    "fetch_by_period": len,
+    "fetch_by_group": len,
+    "fetch_by_number_range": len,
+    "fetch_by_numbers": len,
+    "fetch_by_symbols": len,
+    "fetch_statistics": len,
+    "fetch_change_version": None,
+    "fetch_changes": len,
+    "upsert_elements": int,
+}
+
+# Whether a call will be answered from a cache, judged just before it runs
+CACHE_PROBES: Dict[str, Callable] = {
+    "index": lambda system: system.use_index and system.index.loaded,
+    "statistics": lambda system: system._statistics is not None,
+    "search_index": lambda system: system.index.is_derived("search"),
+    "similarity": lambda system: system.index.is_derived("similarity"),
+}
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *labelvalues: str):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def prometheus_lines(self):
+        for labels, value in sorted(self.samples().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def to_dict(self) -> Dict:
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "samples": [{"labels": dict(zip(self.labelnames, labels)), "value": value}
+                        for labels, value in sorted(self.samples().items())],
+        }
+
+
+class Histogram:
+    """Bucketed distribution of observed values per label combination"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][slot] += 1
+            state[1] += value
+
+    def samples(self) -> Dict[Tuple[str, ...], Tuple[list, int, float]]:
+        """Cumulative bucket counts, total count and sum per label combination"""
+        with self._lock:
+            snapshot = {labels: (list(counts), total) for labels, (counts, total)
+                        in self._values.items()}
+        result = {}
+        for labels, (counts, total) in snapshot.items():
+            cumulative, running = [], 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            result[labels] = (cumulative, running, total)
+        return result
+
+    def prometheus_lines(self):
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, (cumulative, count, total) in sorted(self.samples().items()):
+            for bound, running in zip(bounds, cumulative):
+                label_text = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{label_text} {running}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {count}"
+
+    def to_dict(self) -> Dict:
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "type": self.kind,
+            "help": self.help,
+            "samples": [
+                {"labels": dict(zip(self.labelnames, labels)), "count": count, "sum": total,
+                 "buckets": dict(zip(bounds, cumulative))}
+                for labels, (cumulative, count, total) in sorted(self.samples().items())
+            ],
+        }
+
+
+class MetricsRegistry:
+    """In-process collection of named metrics with Prometheus text and JSON dumps"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric_cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_cls(name, *args, **kwargs)
+            elif not isinstance(metric, metric_cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter with this name, creating it on first use"""
+        return self._register(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Return the histogram with this name, creating it on first use"""
+        return self._register(Histogram, name, help, labelnames, buckets)
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.to_dict() for name, metric in metrics}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+class Instrumentation:
+    """Receives timing events from instrumented objects; the base class ignores them
+
+    Subclass and pass an instance to install() to route events elsewhere.
+    """
+
+    def operation(self, layer: str, name: str, seconds: float, rows: Optional[int],
+                  cache_hit: Optional[bool], error: Optional[BaseException], args: tuple):
+        """One call of a system ('system') or backend ('backend') method"""
+
+    def connection_wait(self, seconds: float, error: Optional[BaseException]):
+        """One checkout from a connection pool"""
+
+
+class MetricsInstrumentation(Instrumentation):
+    """Records events into a MetricsRegistry and logs slow backend queries"""
+
+    def __init__(self, registry: MetricsRegistry, slow_query_seconds: Optional[float] = None):
+        self.registry = registry
+        self.slow_query_seconds = slow_query_seconds
+        self.latency = registry.histogram(
+            "periodic_table_operation_seconds", "Latency of data layer calls",
+            ("layer", "operation"))
+        self.rows = registry.counter(
+            "periodic_table_operation_rows_total", "Rows or elements returned",
+            ("layer", "operation"))
+        self.errors = registry.counter(
+            "periodic_table_operation_errors_total", "Calls that raised",
+            ("layer", "operation", "error"))
+        self.cache = registry.counter(
+            "periodic_table_cache_requests_total", "Lookups answered from (hit) or past (miss) a cache",
+            ("cache", "result"))
+        self.waits = registry.histogram(
+            "periodic_table_connection_wait_seconds", "Time spent checking out a pooled connection")
+        self.wait_errors = registry.counter(
+            "periodic_table_connection_wait_errors_total", "Failed connection checkouts",
+            ("error",))
+
+    def operation(self, layer, name, seconds, rows, cache_hit, error, args):
+        self.latency.observe(seconds, layer, name)
+        if error is not None:
+            self.errors.inc(1, layer, name, type(error).__name__)
+        elif rows:
+            self.rows.inc(rows, layer, name)
+        if cache_hit is not None:
+            self.cache.inc(1, SYSTEM_OPERATIONS[name][0], "hit" if cache_hit else "miss")
+        if (self.slow_query_seconds is not None and layer == "backend"
+                and seconds >= self.slow_query_seconds):
+            arguments = ", ".join(repr(arg) for arg in args)
+            if len(arguments) > 200:
+                arguments = arguments[:197] + "..."
+            slow_query_logger.warning("%.1f ms %s(%s)%s", seconds * 1000, name, arguments,
+                                      f" failed: {error}" if error is not None else "")
+
+    def connection_wait(self, seconds, error):
+        self.waits.observe(seconds)
+        if error is not None:
+            self.wait_errors.inc(1, type(error).__name__)
+
+
+registry = MetricsRegistry()
+_active: Optional[Instrumentation] = None
+
+
+def install(instrumentation: Optional[Instrumentation]):
+    """Use instrumentation for objects created from now on; None turns it off"""
+    global _active
+    _active = instrumentation
+
+
+def enable(slow_query_ms: Optional[float] = None, slow_query_log: Optional[str] = None):
+    """Record into the module registry, optionally logging backend calls slower than slow_query_ms"""
+    if slow_query_ms is not None and not slow_query_logger.handlers:
+        handler = (logging.FileHandler(slow_query_log, encoding="utf-8") if slow_query_log
+                   else logging.StreamHandler())
+        handler.setFormatter(logging.Formatter("%(asctime)s slow query: %(message)s"))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.propagate = False
+    install(MetricsInstrumentation(
+        registry, slow_query_ms / 1000 if slow_query_ms is not None else None))
+
+
+def _timed(method: Callable, layer: str, name: str, count_rows: Optional[Callable],
+           probe: Optional[Callable], instrumentation: Instrumentation) -> Callable:
+    report = instrumentation.operation
+    clock = time.perf_counter
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        cache_hit = probe() if probe is not None else None
+        start = clock()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException as e:
+            report(layer, name, clock() - start, None, cache_hit, e, args)
+            raise
+        rows = count_rows(result) if count_rows is not None and result is not None else None
+        report(layer, name, clock() - start, rows, cache_hit, None, args)
+        return result
+    return wrapper
+
+
+def instrument_backend(backend):
+    """Wrap a backend's fetch methods and pool checkouts if instrumentation is installed"""
+    instrumentation = _active
+    if instrumentation is None or backend is None or getattr(backend, "_instrumented", False):
+        return backend
+    for name, count_rows in BACKEND_OPERATIONS.items():
+        if hasattr(backend, name):
+            setattr(backend, name,
+                    _timed(getattr(backend, name), "backend", name, count_rows, None,
+                           instrumentation))
+
+    pool = getattr(backend, "pool", None)
+    if pool is not None:
+        acquire = pool.acquire
+        clock = time.perf_counter
+
+        def timed_acquire():
+            start = clock()
+            try:
+                conn = acquire()
+            except BaseException as e:
+                instrumentation.connection_wait(clock() - start, e)
+                raise
+            instrumentation.connection_wait(clock() - start, None)
+            return conn
+        pool.acquire = timed_acquire
+
+    backend._instrumented = True
+    return backend
+
+
+def instrument(system):
+    """Wrap the query methods of a PeriodicTableSystem or DatabaseManager
+
+    Does nothing unless instrumentation is installed when the object is
+    created, so the disabled path costs nothing per call.
+    """
+    instrumentation = _active
+    if instrumentation is None:
+        return system
+    for name, (cache, count_rows) in SYSTEM_OPERATIONS.items():
+        if not hasattr(system, name):
+            continue
+        probe = functools.partial(CACHE_PROBES[cache], system) if cache else None
+        setattr(system, name,
+                _timed(getattr(system, name), "system", name, count_rows, probe,
+                       instrumentation))
+    instrument_backend(getattr(system, "backend", None))
+    return system
+
+
+if os.environ.get("PERIODIC_TABLE_METRICS"):
+    slow_ms = os.environ.get("PERIODIC_TABLE_SLOW_QUERY_MS")
+    enable(float(slow_ms) if slow_ms else None, os.environ.get("PERIODIC_TABLE_SLOW_QUERY_LOG"))
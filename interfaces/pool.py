@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the pool timeout"""
+
+
+class PoolClosed(Exception):
+    """Raised when acquiring from a pool that has been closed"""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections
+
+    Connections are created on demand up to ``size``. Idle connections that
+    have not been used for ``health_check_interval`` seconds are checked with
+    ``health_check`` before being handed out and replaced if the check fails.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 5, timeout: float = 30.0,
+                 health_check: Optional[Callable[[Any], None]] = None,
+                 health_check_interval: float = 30.0):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._health_check = health_check
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, last_used) pairs, most recent on the right
+        self._created = 0
+        self._closed = False
+
+    @property
+    def in_use(self) -> int:
+        """Number of connections currently checked out"""
+        with self._cond:
+            return self._created - len(self._idle)
+
+    def acquire(self):
+        """Check out a healthy connection, blocking until one is available"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolClosed("Connection pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    # Reserve the slot, then connect outside the lock
+                    self._created += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"Timed out after {self.timeout:.1f}s waiting for a connection"
+                    )
+                self._cond.wait(remaining)
+
+        if conn is not None and self._is_stale(last_used):
+            if self._healthy(conn):
+                return conn
+            self._close_quietly(conn)
+            conn = None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except BaseException:
+                self._forget()
+                raise
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        """Return a connection; broken connections are closed and replaced later"""
+        if broken or self._closed:
+            self._close_quietly(conn)
+            self._forget()
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and back in"""
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn)
+            raise
+        self.release(conn)
+
+    def close(self):
+        """Close idle connections and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._created -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def _is_stale(self, last_used: float) -> bool:
+        return (self._health_check is not None
+                and time.monotonic() - last_used >= self.health_check_interval)
+
+    def _healthy(self, conn) -> bool:
+        try:
+            self._health_check(conn)
+            return True
+        except Exception:
+            return False
+
+    def _forget(self):
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
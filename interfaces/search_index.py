@@ -0,0 +1,130 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from element import Element
+
+# Rank of each kind of match; lower sorts first, fuzzy matches add their distance
+EXACT_SYMBOL, EXACT_NAME, SYMBOL_PREFIX, NAME_PREFIX, FUZZY = range(5)
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Levenshtein distance between a and b, or None once it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        best = i
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1,
+                       previous[j - 1] + (char_a != char_b))
+            current.append(cost)
+            best = min(best, cost)
+        if best > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+class SearchIndex:
+    """Prefix and typo-tolerant search over element names and symbols
+
+    Built once from the element list: a trie whose nodes hold the ranked
+    matches for every prefix, and a trigram index that narrows fuzzy
+    candidates before computing edit distances. Queries never touch the
+    database.
+    """
+
+    def __init__(self, elements: Iterable[Element]):
+        self.elements = list(elements)
+        self._symbols: Dict[str, Element] = {}
+        self._names: Dict[str, Element] = {}
+        self._trie: Dict = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+
+        for element in self.elements:
+            symbol, name = element.symbol.lower(), element.name.lower()
+            self._symbols[symbol] = element
+            self._names[name] = element
+            self._insert(symbol, SYMBOL_PREFIX, element)
+            self._insert(name, NAME_PREFIX, element)
+            for term in (symbol, name):
+                for gram in _trigrams(term):
+                    self._trigrams.setdefault(gram, set()).add(term)
+
+        self._finalize(self._trie)
+
+    def _insert(self, term: str, rank: int, element: Element):
+        node = self._trie
+        for char in term:
+            node = node.setdefault(char, {})
+            node.setdefault(None, {})
+            # Keep the best way each element matches this prefix
+            best = node[None].get(element.atomic_number)
+            if best is None or rank < best[0]:
+                node[None][element.atomic_number] = (rank, element)
+
+    def _finalize(self, node: Dict):
+        # Replace each node's match map with a list already in ranked order
+        for char, child in node.items():
+            if char is not None:
+                self._finalize(child)
+        if None in node:
+            node[None] = sorted(node[None].values(), key=lambda m: (m[0], m[1].atomic_number))
+
+    def _prefix_matches(self, prefix: str) -> List[Tuple[int, Element]]:
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get(None, [])
+
+    def _fuzzy_matches(self, query: str) -> List[Tuple[int, Element]]:
+        max_distance = 1 if len(query) <= 4 else 2
+        candidates = set()
+        for gram in _trigrams(query):
+            candidates.update(self._trigrams.get(gram, ()))
+        matches = []
+        for term in candidates:
+            # Also compare against the start of longer names so "magnez" finds Magnesium
+            distances = [bounded_edit_distance(query, term, max_distance)]
+            if len(term) > len(query):
+                distances.append(bounded_edit_distance(query, term[:len(query)], max_distance))
+            distances = [d for d in distances if d is not None]
+            if distances:
+                distance = min(distances)
+                element = self._symbols.get(term) or self._names[term]
+                matches.append((FUZZY + distance, element))
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Element]:
+        """Return up to limit elements ranked by how well they match query"""
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        ranked: Dict[int, Tuple[int, Element]] = {}
+
+        def consider(rank: int, element: Element):
+            best = ranked.get(element.atomic_number)
+            if best is None or rank < best[0]:
+                ranked[element.atomic_number] = (rank, element)
+
+        if query in self._symbols:
+            consider(EXACT_SYMBOL, self._symbols[query])
+        if query in self._names:
+            consider(EXACT_NAME, self._names[query])
+        prefix_matches = self._prefix_matches(query)
+        for rank, element in prefix_matches[:limit]:
+            consider(rank, element)
+        if len(ranked) < limit and len(query) >= 3:
+            for rank, element in self._fuzzy_matches(query):
+                consider(rank, element)
+
+        ordered = sorted(ranked.values(), key=lambda m: (m[0], m[1].atomic_number))
+        return [element for _, element in ordered[:limit]]
@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from element import Element
+from element_table import ElementTable
+
+# Relative importance of each property in the distance; every feature is
+# standardized first, so a weight of 1 means "one standard deviation"
+FEATURE_WEIGHTS = {
+    "atomic_mass": 1.0,
+    "group_number": 1.5,
+    "period": 1.0,
+    "block": 1.0,
+    "valence_electrons": 1.0,
+    "unpaired_electrons": 0.5,
+}
+
+BLOCKS = ("s", "p", "d", "f")
+# Lanthanides and actinides have no group; place them with group 3
+F_BLOCK_GROUP = 3
+
+
+class SimilarityIndex:
+    """Nearest-neighbour queries over standardized element properties
+
+    Each element becomes a weighted feature vector (mass, group, period,
+    one-hot block, valence and unpaired electrons) and every pairwise
+    Euclidean distance is computed once, so a query is a row lookup plus a
+    partial sort. For the ~118 elements the full matrix is 110 KB, smaller
+    and faster to query than a KD-tree.
+    """
+
+    def __init__(self, table: ElementTable, weights: Optional[Dict[str, float]] = None):
+        self.table = table
+        self.elements = table.elements
+        weights = dict(FEATURE_WEIGHTS, **(weights or {}))
+        self.row_of = {element.atomic_number: row for row, element in enumerate(self.elements)}
+        self.features = self._features(table, weights)
+
+        squares = np.einsum("ij,ij->i", self.features, self.features)
+        gram = self.features @ self.features.T
+        # |a - b|^2 = |a|^2 + |b|^2 - 2ab; clip the rounding error below zero
+        self.distances = np.sqrt(np.maximum(squares[:, None] + squares[None, :] - 2 * gram, 0.0))
+
+    @staticmethod
+    def _features(table: ElementTable, weights: Dict[str, float]) -> np.ndarray:
+        if len(table) == 0:
+            return np.zeros((0, len(FEATURE_WEIGHTS) - 1 + len(BLOCKS)))
+        group = np.where(table.group_number == 0, F_BLOCK_GROUP, table.group_number)
+        numeric = {
+            "atomic_mass": table.atomic_mass,
+            "group_number": group,
+            "period": table.period,
+            "valence_electrons": table.valence_electrons,
+            "unpaired_electrons": table.unpaired_electrons,
+        }
+        columns = []
+        for name, values in numeric.items():
+            values = values.astype(np.float64)
+            spread = values.std()
+            columns.append((values - values.mean()) / (spread if spread else 1.0)
+                           * weights[name])
+        # One-hot blocks scaled so two different blocks are `block` weight apart
+        for block in BLOCKS:
+            columns.append((table.block == block) * (weights["block"] / np.sqrt(2)))
+        return np.column_stack(columns)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def _rows(self, atomic_numbers: Sequence[int]) -> np.ndarray:
+        return np.fromiter((self.row_of.get(n, -1) for n in atomic_numbers), dtype=np.intp,
+                           count=len(atomic_numbers))
+
+    def distance(self, first: int, second: int) -> Optional[float]:
+        """Distance between two elements by atomic number, None if either is unknown"""
+        if first not in self.row_of or second not in self.row_of:
+            return None
+        return float(self.distances[self.row_of[first], self.row_of[second]])
+
+    def nearest(self, atomic_number: int, k: int = 5) -> List[Tuple[Element, float]]:
+        """The k elements closest to one element, nearest first, excluding itself"""
+        return self.nearest_many([atomic_number], k)[0]
+
+    def nearest_many(self, atomic_numbers: Sequence[int],
+                     k: int = 5) -> List[List[Tuple[Element, float]]]:
+        """nearest() for many targets at once; unknown targets get an empty list"""
+        rows = self._rows(atomic_numbers)
+        k = max(0, min(k, len(self.elements) - 1))
+        valid = rows >= 0
+        results: List[List[Tuple[Element, float]]] = [[] for _ in atomic_numbers]
+        if k == 0 or not valid.any():
+            return results
+
+        block = self.distances[rows[valid]].copy()
+        # Exclude each target from its own neighbours
+        block[np.arange(len(block)), rows[valid]] = np.inf
+        candidates = np.argpartition(block, k - 1, axis=1)[:, :k]
+        candidate_distances = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1, kind="stable")
+        neighbours = np.take_along_axis(candidates, order, axis=1)
+        distances = np.take_along_axis(candidate_distances, order, axis=1)
+
+        for slot, target in enumerate(np.flatnonzero(valid)):
+            results[target] = [(self.elements[row], float(distance))
+                               for row, distance in zip(neighbours[slot], distances[slot])]
+        return results
+
+    def within(self, atomic_number: int, radius: float) -> List[Tuple[Element, float]]:
+        """Elements within a distance of one element, nearest first, excluding itself"""
+        row = self.row_of.get(atomic_number)
+        if row is None:
+            return []
+        distances = self.distances[row]
+        matches = np.flatnonzero(distances <= radius)
+        matches = matches[matches != row]
+        matches = matches[np.argsort(distances[matches], kind="stable")]
+        return [(self.elements[i], float(distances[i])) for i in matches]
@@ -0,0 +1,276 @@
+"""Binary element snapshots for running without a database
+
+Usage:
+    python interfaces/snapshot.py export OUT.ptsnap    write Elements from the configured backend
+    python interfaces/snapshot.py info FILE.ptsnap     print the header of a snapshot
+
+Serve a snapshot with PERIODIC_TABLE_BACKEND=snapshot and
+PERIODIC_TABLE_SNAPSHOT=FILE. Opening one only maps the file and reads its
+fixed-size header, so start-up time does not depend on the file size, and
+processes mapping the same file share its pages through the OS page cache.
+PeriodicTableSystem skips its element index for a snapshot unless asked for
+one, so every lookup decodes just the records it returns.
+
+Layout (little-endian):
+    header        HEADER
+    records       RECORD * record_count, in atomic-number order
+    number index  uint32 * (max atomic number + 1): record slot + 1, 0 if absent
+    symbol index  SYMBOL_ENTRY * record_count, sorted by lower-case symbol
+    strings       UTF-8 symbols, names and electron configurations
+"""
+import argparse
+import mmap
+import os
+import statistics
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backends import BackendError, StorageBackend
+
+MAGIC = b"PTSNAP\0\0"
+FORMAT_VERSION = 1
+
+# magic, version, flags, record count, record size, then offset/size pairs
+# for records, number index (entries), symbol index (entries) and strings
+HEADER = struct.Struct("<8sHHII" + "QQ" * 4)
+# atomic number, mass, group (-1 for none), period, block, padding, then
+# offset/length pairs for symbol, name and electron configuration
+RECORD = struct.Struct("<idii1s3xIHIHIH")
+SYMBOL_ENTRY = struct.Struct("<4sI")
+NUMBER_ENTRY = struct.Struct("<I")
+
+NO_GROUP = -1
+_BLOCK_OFFSET = 20  # byte offset of the block inside RECORD
+
+
+def _symbol_key(symbol: str) -> bytes:
+    key = symbol.strip().lower().encode("utf-8")
+    if len(key) > SYMBOL_ENTRY.size - NUMBER_ENTRY.size:
+        raise ValueError(f"Symbol '{symbol}' is too long for the snapshot format")
+    return key.ljust(4, b"\0")
+
+
+def write_snapshot(rows: Iterable[Sequence], path: str):
+    """Write rows in Elements column order to a snapshot file, replacing it atomically"""
+    rows = sorted((tuple(row) for row in rows), key=lambda row: row[0])
+    strings = bytearray()
+    string_offsets: Dict[bytes, int] = {}
+
+    def intern(text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8")
+        if data not in string_offsets:
+            string_offsets[data] = len(strings)
+            strings.extend(data)
+        return string_offsets[data], len(data)
+
+    records = bytearray()
+    for (number, symbol, name, mass, block, group, period, configuration) in rows:
+        records += RECORD.pack(
+            number, float(mass), NO_GROUP if group is None else group, period,
+            block.encode("ascii"), *intern(symbol), *intern(name), *intern(configuration))
+
+    max_number = rows[-1][0] if rows else 0
+    slots = [0] * (max_number + 1)
+    for slot, row in enumerate(rows):
+        slots[row[0]] = slot + 1
+    numbers = b"".join(NUMBER_ENTRY.pack(value) for value in slots)
+    symbols = b"".join(
+        SYMBOL_ENTRY.pack(key, slot)
+        for key, slot in sorted((_symbol_key(row[1]), slot) for slot, row in enumerate(rows)))
+
+    records_offset = HEADER.size
+    numbers_offset = records_offset + len(records)
+    symbols_offset = numbers_offset + len(numbers)
+    strings_offset = symbols_offset + len(symbols)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(rows), RECORD.size,
+        records_offset, len(rows), numbers_offset, len(slots),
+        symbols_offset, len(rows), strings_offset, len(strings))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        for part in (header, records, numbers, symbols, strings):
+            f.write(part)
+    os.replace(temp_path, path)
+
+
+class SnapshotBackend(StorageBackend):
+    """Read-only backend serving a memory-mapped snapshot file"""
+
+    name = "snapshot"
+    serves_from_memory = True
+
+    def __init__(self, path: Optional[str] = None):
+        """Map the snapshot and validate its header; nothing else is read"""
+        self.path = path or os.environ.get("PERIODIC_TABLE_SNAPSHOT")
+        if not self.path:
+            raise BackendError("No snapshot file given; set PERIODIC_TABLE_SNAPSHOT")
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise BackendError(f"Failed to open snapshot: {str(e)}") from e
+
+        try:
+            (magic, version, _flags, self.count, record_size,
+             self._records, _, self._numbers, self._number_slots,
+             self._symbols, _, self._strings, _) = HEADER.unpack_from(self._map)
+        except struct.error as e:
+            self._map.close()
+            raise BackendError(f"Truncated snapshot header in {self.path}") from e
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD.size:
+            self._map.close()
+            raise BackendError(f"{self.path} is not a version {FORMAT_VERSION} snapshot")
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def _row(self, slot: int) -> Tuple:
+        (number, mass, group, period, block, symbol_offset, symbol_length, name_offset,
+         name_length, config_offset, config_length) = RECORD.unpack_from(
+            self._map, self._records + slot * RECORD.size)
+        return (number, self._string(symbol_offset, symbol_length),
+                self._string(name_offset, name_length), mass, block.decode("ascii"),
+                None if group == NO_GROUP else group, period,
+                self._string(config_offset, config_length))
+
+    def _slot_for_number(self, atomic_number: int) -> Optional[int]:
+        if not 0 <= atomic_number < self._number_slots:
+            return None
+        (value,) = NUMBER_ENTRY.unpack_from(
+            self._map, self._numbers + atomic_number * NUMBER_ENTRY.size)
+        return value - 1 if value else None
+
+    def _slot_for_symbol(self, symbol: str) -> Optional[int]:
+        try:
+            key = _symbol_key(symbol)
+        except ValueError:
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, slot = SYMBOL_ENTRY.unpack_from(
+                self._map, self._symbols + middle * SYMBOL_ENTRY.size)
+            if entry_key == key:
+                return slot
+            if entry_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _rows_where(self, predicate) -> List[Tuple]:
+        return [row for row in map(self._row, range(self.count)) if predicate(row)]
+
+    def fetch_all(self) -> List[Tuple]:
+        return [self._row(slot) for slot in range(self.count)]
+
+    def fetch_by_number(self, atomic_number: int) -> Optional[Tuple]:
+        slot = self._slot_for_number(atomic_number)
+        return None if slot is None else self._row(slot)
+
+    def fetch_by_symbol(self, symbol: str) -> Optional[Tuple]:
+        slot = self._slot_for_symbol(symbol)
+        return None if slot is None else self._row(slot)
+
+    def fetch_by_block(self, block: str) -> List[Tuple]:
+        # Compare the block byte in place and decode only the matches
+        key = block.strip().lower().encode("ascii", "replace")[:1]
+        base = self._records + _BLOCK_OFFSET
+        return [self._row(slot) for slot in range(self.count)
+                if self._map[base + slot * RECORD.size:base + slot * RECORD.size + 1].lower()
+                == key]
+
+    def fetch_by_period(self, period: int) -> List[Tuple]:
+        return self._rows_where(lambda row: row[6] == period)
+
+    def fetch_by_group(self, group_number: int) -> List[Tuple]:
+        return sorted(self._rows_where(lambda row: row[5] == group_number),
+                      key=lambda row: row[6])
+
+    def fetch_by_number_range(self, low: int, high: int) -> List[Tuple]:
+        slots = (self._slot_for_number(n) for n in range(max(low, 0), high + 1))
+        return [self._row(slot) for slot in slots if slot is not None]
+
+    def fetch_by_numbers(self, atomic_numbers: Sequence[int]) -> List[Tuple]:
+        slots = {self._slot_for_number(number) for number in atomic_numbers}
+        return [self._row(slot) for slot in sorted(slot for slot in slots if slot is not None)]
+
+    def fetch_by_symbols(self, symbols: Sequence[str]) -> List[Tuple]:
+        slots = {self._slot_for_symbol(symbol) for symbol in symbols}
+        return [self._row(slot) for slot in sorted(slot for slot in slots if slot is not None)]
+
+    def fetch_statistics(self) -> List[Tuple]:
+        groupings: Dict[Tuple[str, object], List[float]] = {}
+        for row in self.fetch_all():
+            for key in (("block", row[4]), ("period", row[6]), ("group", row[5]),
+                        ("all", None)):
+                groupings.setdefault(key, []).append(row[3])
+        return [
+            (dimension, key, len(masses), min(masses), max(masses), statistics.fmean(masses),
+             statistics.stdev(masses) if len(masses) > 1 else None)
+            for (dimension, key), masses in sorted(
+                groupings.items(),
+                key=lambda item: (item[0][0], item[0][1] is None, item[0][1] or 0))
+        ]
+
+    def fetch_change_version(self) -> int:
+        # A snapshot never changes after it is written
+        return 0
+
+    def fetch_changes(self, since_version: int) -> List[Tuple]:
+        return []
+
+    def upsert_elements(self, rows: Sequence[Tuple]) -> int:
+        raise BackendError("Snapshots are read-only; export a new one instead")
+
+    def query(self, sql: str, *params) -> List[Tuple]:
+        raise BackendError("Snapshots do not support SQL queries")
+
+    def close(self):
+        self._map.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or inspect binary element snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write the Elements table to a snapshot")
+    export.add_argument("path")
+    export.add_argument("--backend", help="source backend (default: $PERIODIC_TABLE_BACKEND)")
+    info = commands.add_parser("info", help="describe a snapshot file")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from backends import create_backend
+
+        try:
+            backend = create_backend(args.backend)
+            try:
+                rows = backend.fetch_all()
+            finally:
+                backend.close()
+        except BackendError as e:
+            print(f"Export failed: {str(e)}", file=sys.stderr)
+            return 1
+        write_snapshot(rows, args.path)
+        print(f"Wrote {len(rows)} elements to {args.path} ({os.path.getsize(args.path):,} bytes)")
+        return 0
+
+    try:
+        snapshot = SnapshotBackend(args.path)
+    except BackendError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    print(f"{args.path}: format version {FORMAT_VERSION}, {snapshot.count} elements, "
+          f"{RECORD.size}-byte records, {len(snapshot._map):,} bytes")
+    snapshot.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import os
+from typing import List, Optional, Sequence
+
+from element import Element
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "periodic-table", "elements.json"
+)
+
+CACHE_VERSION = 1
+
+
+def cache_path() -> str:
+    """Location of the snapshot, overridable with $PERIODIC_TABLE_CACHE"""
+    return os.environ.get("PERIODIC_TABLE_CACHE") or DEFAULT_CACHE_PATH
+
+
+def load_snapshot(path: Optional[str] = None) -> Optional[List[Element]]:
+    """Read the elements saved by a previous run, or None if there is no usable cache"""
+    import json
+
+    try:
+        with open(path or cache_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CACHE_VERSION:
+            return None
+        return Element.from_rows(data["elements"])
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def save_snapshot(elements: Sequence[Element], path: Optional[str] = None):
+    """Write the elements for the next start-up, replacing the old file atomically"""
+    import json
+
+    path = path or cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": CACHE_VERSION, "elements": [e.astuple() for e in elements]},
+            f,
+            separators=(",", ":"),
+        )
+    os.replace(temp_path, path)
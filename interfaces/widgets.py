@@ -0,0 +1,187 @@
+import collections.abc
+import math
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from element import Element
+
+
+class ElementGrid(tk.Canvas):
+    """Periodic table drawn as canvas items instead of one button per element
+
+    Each element is a rectangle and a text item sharing the tag
+    ``n<atomic number>``, so the whole table costs two canvas items per
+    element and a single widget.
+    """
+
+    def __init__(self, master, colors: Dict[str, str], on_select: Callable[[Element], None],
+                 cell_size: int = 80, padding: int = 2, **kwargs):
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("bg", colors.get("background", "#2F3542"))
+        super().__init__(master, **kwargs)
+        self.colors = colors
+        self.on_select = on_select
+        self.cell_size = cell_size
+        self.padding = padding
+        self.elements: Dict[int, Element] = {}
+        self.cells: Dict[int, Tuple[int, int]] = {}
+        self.tag_bind("cell", "<Button-1>", self._on_click)
+        self.tag_bind("cell", "<Enter>", lambda _: self.configure(cursor="hand2"))
+        self.tag_bind("cell", "<Leave>", lambda _: self.configure(cursor=""))
+
+    def set_elements(self, elements: Sequence[Element]):
+        """Replace every cell with the given elements"""
+        self.delete("cell")
+        self.elements.clear()
+        self.cells.clear()
+        for element in elements:
+            self._draw_cell(element)
+        self._fit()
+
+    def update_element(self, element: Element):
+        """Draw or redraw the cell for one element"""
+        self.remove_element(element.atomic_number)
+        self._draw_cell(element)
+        self._fit()
+
+    def remove_element(self, atomic_number: int):
+        """Delete the cell for an element if it is drawn"""
+        if self.cells.pop(atomic_number, None) is not None:
+            self.delete(f"n{atomic_number}")
+            del self.elements[atomic_number]
+
+    def _draw_cell(self, element: Element):
+        x0, y0 = self._origin(element)
+        x1, y1 = x0 + self.cell_size, y0 + self.cell_size
+        tags = ("cell", f"n{element.atomic_number}")
+        rect = self.create_rectangle(
+            x0, y0, x1, y1, tags=tags, outline="",
+            fill=self.colors.get(element.block, self.colors.get("highlight", "#A3CB38")),
+        )
+        text = self.create_text(
+            (x0 + x1) / 2, (y0 + y1) / 2, tags=tags,
+            text=f"{element.symbol}\n{element.atomic_number}",
+            fill=self.colors.get("text", "#FFFFFF"),
+            font=("Helvetica", 14, "bold"), justify="center",
+        )
+        self.elements[element.atomic_number] = element
+        self.cells[element.atomic_number] = (rect, text)
+
+    def _fit(self):
+        self.configure(scrollregion=self.bbox("all") or (0, 0, 0, 0))
+
+    def _origin(self, element: Element) -> Tuple[int, int]:
+        # Same placement the button grid used: period by row, group by column
+        row = element.period - 1
+        col = element.group_number - 1 if element.group_number else 0
+        step = self.cell_size + 2 * self.padding
+        return col * step + self.padding, row * step + self.padding
+
+    def _on_click(self, _event):
+        for tag in self.gettags("current"):
+            if tag.startswith("n") and tag[1:].isdigit():
+                self.on_select(self.elements[int(tag[1:])])
+                return
+
+
+class VirtualList(tk.Frame):
+    """Scrollable list that only draws the rows currently in view
+
+    A small pool of canvas items is reused as the list scrolls, so the cost
+    of showing a list does not grow with the number of items.
+    """
+
+    def __init__(self, master, format_row: Callable[[object], str] = str,
+                 row_height: int = 28, on_select: Optional[Callable[[object], None]] = None,
+                 bg: str = "#2B2B2B", fg: str = "#FFFFFF", stripe: str = "#333333",
+                 font=("Helvetica", 12), **kwargs):
+        super().__init__(master, bg=bg, **kwargs)
+        self.format_row = format_row
+        self.row_height = row_height
+        self.on_select = on_select
+        self.fg, self.bg, self.stripe, self.font = fg, bg, stripe, font
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.items: Sequence = []
+        self._offset = 0
+        self._pool: List[Tuple[int, int]] = []
+
+        self.canvas.bind("<Configure>", lambda _: self.redraw())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda _: self.scroll_by(-3 * self.row_height))
+        self.canvas.bind("<Button-5>", lambda _: self.scroll_by(3 * self.row_height))
+        self.canvas.bind("<Button-1>", self._on_click)
+
+    def set_items(self, items: Sequence):
+        """Show a new sequence of items, keeping the scroll position if possible
+
+        Any Sequence is shown in place without copying, so a live view such
+        as a HistoryStore only needs set_items() again after it changes.
+        """
+        self.items = items if isinstance(items, collections.abc.Sequence) else list(items)
+        self._offset = min(self._offset, self._max_offset())
+        self.redraw()
+
+    def scroll_by(self, pixels: int):
+        """Scroll the view by a number of pixels"""
+        self._offset = max(0, min(self._offset + pixels, self._max_offset()))
+        self.redraw()
+
+    def redraw(self):
+        """Reposition the pooled rows over the items currently in view"""
+        height = max(self.canvas.winfo_height(), 1)
+        width = max(self.canvas.winfo_width(), 1)
+        visible = math.ceil(height / self.row_height) + 1
+        while len(self._pool) < visible:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, outline="")
+            text = self.canvas.create_text(0, 0, anchor="w", fill=self.fg, font=self.font)
+            self._pool.append((rect, text))
+
+        first = self._offset // self.row_height
+        for slot, (rect, text) in enumerate(self._pool):
+            index = first + slot
+            if slot >= visible or index >= len(self.items):
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+                continue
+            y0 = index * self.row_height - self._offset
+            self.canvas.coords(rect, 0, y0, width, y0 + self.row_height)
+            self.canvas.itemconfigure(
+                rect, state="normal", fill=self.stripe if index % 2 else self.bg)
+            self.canvas.coords(text, 10, y0 + self.row_height / 2)
+            self.canvas.itemconfigure(
+                text, state="normal", text=self.format_row(self.items[index]))
+
+        total = len(self.items) * self.row_height
+        if total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    def _max_offset(self) -> int:
+        height = max(self.canvas.winfo_height(), 1)
+        return max(0, len(self.items) * self.row_height - height)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._offset = 0
+            self.scroll_by(int(float(amount) * len(self.items) * self.row_height))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * max(self.canvas.winfo_height() - self.row_height, 1))
+        else:
+            self.scroll_by(int(amount) * self.row_height)
+
+    def _on_wheel(self, event):
+        direction = -1 if event.delta > 0 else 1
+        self.scroll_by(direction * 3 * self.row_height)
+
+    def _on_click(self, event):
+        if self.on_select is None:
+            return
+        index = (event.y + self._offset) // self.row_height
+        if 0 <= index < len(self.items):
+            self.on_select(self.items[index])